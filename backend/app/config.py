@@ -23,6 +23,69 @@ class Settings(BaseSettings):
     # Frontend
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+    # ML Result Cache (recommendations / resume analysis)
+    RESULT_CACHE_SIZE: int = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+    RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+    # Optional: redis://host:6379/0 -> all uvicorn workers share cache hits. Empty = in-process only.
+    RESULT_CACHE_REDIS_URL: str = os.getenv("RESULT_CACHE_REDIS_URL", "")
+
+    # ML Scoring Pool (CPU-bound sklearn work runs off the request threadpool)
+    # 0 workers = run in a thread instead (dev / low-RAM machines).
+    ML_POOL_WORKERS: int = int(os.getenv("ML_POOL_WORKERS", "2"))
+    ML_POOL_MAX_PENDING: int = int(os.getenv("ML_POOL_MAX_PENDING", "32"))  # Beyond this, requests get 503
+    ML_TASK_TIMEOUT_SECONDS: float = float(os.getenv("ML_TASK_TIMEOUT_SECONDS", "15"))
+
+    # Job Vectorizer: "tfidf" (fitted vocabulary, max 500 terms) or "hashing" (fixed-size float32
+    # feature hashing, no fit - for very large job corpora). Scores stay on the same 0-100 scale.
+    JOB_VECTORIZER_MODE: str = os.getenv("JOB_VECTORIZER_MODE", "tfidf")
+    HASHING_N_FEATURES: int = int(os.getenv("HASHING_N_FEATURES", str(2 ** 18)))
+
+    # Face Cache: full id-diff against face_embeddings at least this often (catches writes made outside the API)
+    FACE_CACHE_RECONCILE_SECONDS: int = int(os.getenv("FACE_CACHE_RECONCILE_SECONDS", "300"))
+    # Shared Face Store: directory for ONE memory-mapped embedding matrix used by all uvicorn workers
+    # (e.g. /dev/shm/campusdice-faces). Empty = every worker keeps its own in-process cache. POSIX only.
+    FACE_SHARED_STORE_DIR: str = os.getenv("FACE_SHARED_STORE_DIR", "")
+    # Face ANN (IVF) index for 1:N login: used once the cache holds this many rows (0 = always brute force).
+    # NLIST 0 = sqrt(rows) coarse lists; more NPROBE lists scanned per search = better recall, more latency.
+    FACE_ANN_MIN_ROWS: int = int(os.getenv("FACE_ANN_MIN_ROWS", "0"))
+    FACE_ANN_NLIST: int = int(os.getenv("FACE_ANN_NLIST", "0"))
+    FACE_ANN_NPROBE: int = int(os.getenv("FACE_ANN_NPROBE", "8"))
+    # Bulk Face Enrollment: crops per Facenet forward pass, max photos per request, and max bytes per photo
+    # (uncompressed - checked against the zip header before a member is ever decompressed)
+    FACE_BULK_BATCH_SIZE: int = int(os.getenv("FACE_BULK_BATCH_SIZE", "32"))
+    FACE_BULK_MAX_IMAGES: int = int(os.getenv("FACE_BULK_MAX_IMAGES", "500"))
+    FACE_BULK_MAX_IMAGE_BYTES: int = int(os.getenv("FACE_BULK_MAX_IMAGE_BYTES", str(10 * 1024 * 1024)))
+
+    # Vision Inference Executor: DeepFace / YOLO / Haar calls run in per-model thread lanes, off the event loop.
+    # 1 thread per lane by default (model objects aren't guaranteed thread-safe); beyond MAX_PENDING -> 503.
+    VISION_LANE_WORKERS: int = int(os.getenv("VISION_LANE_WORKERS", "1"))
+    VISION_LANE_MAX_PENDING: int = int(os.getenv("VISION_LANE_MAX_PENDING", "8"))
+    VISION_TASK_TIMEOUT_SECONDS: float = float(os.getenv("VISION_TASK_TIMEOUT_SECONDS", "30"))
+    # Binary websocket frames wider than 2x/4x/8x this are JPEG-decoded at 1/2, 1/4, 1/8 scale (0 = always full size)
+    VISION_STREAM_MAX_WIDTH: int = int(os.getenv("VISION_STREAM_MAX_WIDTH", "640"))
+    # Websocket pacing: max frames analyzed per second per connection (newest frame wins, older ones dropped)
+    VISION_STREAM_TARGET_FPS: float = float(os.getenv("VISION_STREAM_TARGET_FPS", "10"))
+    VISION_PROCTOR_TARGET_FPS: float = float(os.getenv("VISION_PROCTOR_TARGET_FPS", "2"))
+    # Shared per-frame face detection runs on a copy downscaled to this width (0 = full resolution)
+    VISION_ANALYSIS_WIDTH: int = int(os.getenv("VISION_ANALYSIS_WIDTH", "320"))
+    # Motion gate (stream + proctor): frame reuses the last analysis if < CHANGE_RATIO of its thumbnail pixels
+    # changed by > PIXEL_DELTA gray levels; a full re-analysis is forced every REFRESH_SECONDS. Ratio 0 = off.
+    VISION_MOTION_CHANGE_RATIO: float = float(os.getenv("VISION_MOTION_CHANGE_RATIO", "0.02"))
+    VISION_MOTION_PIXEL_DELTA: int = int(os.getenv("VISION_MOTION_PIXEL_DELTA", "25"))
+    VISION_MOTION_REFRESH_SECONDS: float = float(os.getenv("VISION_MOTION_REFRESH_SECONDS", "5"))
+    # YOLO micro-batching across sessions: frames collected for up to MAX_WAIT_MS (or BATCH_SIZE frames)
+    # go through one forward pass. BATCH_SIZE 1 = no batching; beyond MAX_PENDING queued frames -> 503.
+    OBJECT_BATCH_SIZE: int = int(os.getenv("OBJECT_BATCH_SIZE", "8"))
+    OBJECT_BATCH_MAX_WAIT_MS: float = float(os.getenv("OBJECT_BATCH_MAX_WAIT_MS", "5"))
+    OBJECT_BATCH_MAX_PENDING: int = int(os.getenv("OBJECT_BATCH_MAX_PENDING", "64"))
+
+    # Startup Warm-up: models loaded in the background after the port binds (comma list; empty = all lazy).
+    # Options: face, emotion, object, pose, job_index. Drop emotion/object on low-RAM machines.
+    # (The legacy face embedding migration always runs in the same background warm-up, listed as face_migration.)
+    WARMUP_MODELS: str = os.getenv("WARMUP_MODELS", "face,emotion,object,pose,job_index")
+    # Past this, /health reports "degraded" instead of "warming" for models still loading
+    WARMUP_BUDGET_SECONDS: float = float(os.getenv("WARMUP_BUDGET_SECONDS", "120"))
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # To prevent validation errors for extra env vars
@@ -0,0 +1,157 @@
+import threading
+import time
+
+from app.config import settings
+
+# 🔥 Model Warm-up
+# Pehle startup sirf Facenet build karta tha (synchronously, port bind hone se pehle) aur Emotion / YOLO / Haar
+# first request pe load hote the -> first analyze-frame or proctor frame took many seconds.
+# Now the chosen models (WARMUP_MODELS) load in background threads right after startup: the port binds
+# immediately, /health says "warming" until they're ready, and each model reports its own status + load time.
+# Models in the same group load one after another (DeepFace's TF models share one graph runtime);
+# different groups load in parallel.
+# The legacy JSON -> binary face embedding migration runs here too (first in the face group, on every start):
+# on a big table it used to keep the port unbound until every row was rewritten.
+
+
+def _migrate_face_embeddings():
+    from app.database import engine
+    from app.vision.embedding_codec import migrate_json_embeddings
+    migrate_json_embeddings(engine) # No-op once migrated; reads meanwhile fall back to the JSON column
+
+
+def _load_face():
+    from app.database import SessionLocal
+    from app.vision.face_service import FaceService
+    db = SessionLocal()
+    try:
+        fs = FaceService()
+        fs.build(db=db) # Facenet + embedding cache (and the ANN index if enabled)
+        if not fs.built:
+            raise RuntimeError("Facenet model could not be built")
+    finally:
+        db.close()
+
+
+def _load_emotion():
+    from deepface import DeepFace
+    from app.routes.opencv_routes import get_emotion_service
+    get_emotion_service()
+    try:
+        DeepFace.build_model(task="facial_attribute", model_name="Emotion") # DeepFace >= 0.0.90
+    except TypeError:
+        DeepFace.build_model("Emotion")
+
+
+def _load_object():
+    import numpy as np
+    from app.routes.opencv_routes import get_object_service
+    from app.vision.object_batcher import OBJECT_BATCHER
+    get_object_service()
+    # One dummy pass: the first predict() also fuses layers / sets up the predictor.
+    # Through the batcher, so it never runs YOLO concurrently with an early proctor frame.
+    OBJECT_BATCHER.submit(np.zeros((640, 640, 3), dtype=np.uint8)).result()
+
+
+def _load_pose():
+    from app.routes.opencv_routes import get_pose_service
+    if get_pose_service().face_cascade.empty():
+        raise RuntimeError("Haar cascade file could not be loaded")
+
+
+def _load_job_index():
+    from app.database import SessionLocal
+    from app.ml.job_recommender import get_job_index
+    from app.ml.job_skills import backfill_job_skills
+    db = SessionLocal()
+    try:
+        # Normalize skills of jobs that predate the job_skills table
+        backfill_job_skills(db)
+        # Fit the job TF-IDF index once so recommendations only transform the resume
+        get_job_index(db)
+    finally:
+        db.close()
+
+
+# name -> (group, loader)
+ALWAYS = ["face_migration"] # Data migrations: run whatever WARMUP_MODELS says
+
+LOADERS = {
+    "face_migration": ("deepface", _migrate_face_embeddings), # Before "face": the cache then loads binary rows
+    "face": ("deepface", _load_face),
+    "emotion": ("deepface", _load_emotion),
+    "object": ("yolo", _load_object),
+    "pose": ("opencv", _load_pose),
+    "job_index": ("sklearn", _load_job_index),
+}
+
+
+class ModelWarmup:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.models = {} # name -> {"status", "load_seconds", "error"}
+        self.started_at = None
+        self.budget = settings.WARMUP_BUDGET_SECONDS
+
+    def start(self, names=None):
+        """Starts loading in daemon threads and returns at once (never blocks startup)."""
+        if names is None:
+            names = [n.strip() for n in settings.WARMUP_MODELS.split(",") if n.strip()]
+        unknown = [n for n in names if n not in LOADERS]
+        if unknown:
+            print(f"Warm-up Warning: unknown models skipped: {unknown}")
+        names = ALWAYS + [n for n in names if n in LOADERS and n not in ALWAYS]
+
+        groups = {}
+        with self._lock:
+            self.started_at = time.monotonic()
+            for name in names:
+                self.models[name] = {"status": "pending", "load_seconds": None, "error": None}
+                groups.setdefault(LOADERS[name][0], []).append(name)
+        for group, members in groups.items():
+            threading.Thread(target=self._load_group, args=(members,), name=f"warmup-{group}", daemon=True).start()
+        if names:
+            print(f"Warm-up started in background: {', '.join(names)} (budget {self.budget:.0f}s)")
+
+    def _load_group(self, names):
+        for name in names:
+            with self._lock:
+                self.models[name]["status"] = "loading"
+            started = time.monotonic()
+            try:
+                LOADERS[name][1]()
+                status, error = "ready", None
+            except Exception as e:
+                status, error = "failed", str(e)
+                print(f"Warm-up Warning: {name} failed: {e}")
+            elapsed = round(time.monotonic() - started, 2)
+            with self._lock:
+                self.models[name].update(status=status, load_seconds=elapsed, error=error)
+            if status == "ready":
+                print(f"Warm-up: {name} ready in {elapsed}s")
+
+    def status(self) -> dict:
+        """
+        Overall state: "ready" (all loaded), "warming" (still loading, within the budget),
+        "degraded" (a model failed, or is still loading past WARMUP_BUDGET_SECONDS - it keeps loading
+        in the background and the first request that needs it waits for / loads it as before).
+        """
+        with self._lock:
+            models = {name: dict(state) for name, state in self.models.items()}
+            started_at = self.started_at
+        elapsed = time.monotonic() - started_at if started_at is not None else 0.0
+        for state in models.values():
+            if state["status"] in ("pending", "loading") and elapsed > self.budget:
+                state["status"] = "over_budget"
+
+        statuses = {state["status"] for state in models.values()}
+        if statuses <= {"ready"}:
+            overall = "ready"
+        elif statuses & {"failed", "over_budget"}:
+            overall = "degraded"
+        else:
+            overall = "warming"
+        return {"status": overall, "elapsed_seconds": round(elapsed, 2), "budget_seconds": self.budget, "models": models}
+
+
+WARMUP = ModelWarmup()
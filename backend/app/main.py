@@ -26,16 +26,24 @@ def read_root():
 async def startup_event():
     print("Server initializing with AI Warm-up...")
     try:
-        from .vision.face_service import FaceService
-        from .database import SessionLocal
-        db = SessionLocal()
-        # Warm up Face model so first request is instant
-        fs = FaceService()
-        fs.build(db=db)
-        db.close()
-        print("AI Warm-up Complete.")
+        # Legacy face embedding migration, Facenet + face cache, Emotion, YOLO, Haar and the job index run in
+        # background threads, so the port binds right away; /health reports "warming" until they're ready.
+        from .core.warmup import WARMUP
+        WARMUP.start()
     except Exception as e:
-        print(f"Startup Warning: {e}")
+        print(f"Warm-up Warning: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    try:
+        from .ml.executor import ML_EXECUTOR
+        ML_EXECUTOR.shutdown()
+        from .vision.inference_executor import INFERENCE_EXECUTOR
+        INFERENCE_EXECUTOR.shutdown()
+        from .vision.object_batcher import OBJECT_BATCHER
+        OBJECT_BATCHER.shutdown()
+    except Exception as e:
+        print(f"Shutdown Warning: {e}")
 
 # Simple Logger to track connection health
 @app.middleware("http")
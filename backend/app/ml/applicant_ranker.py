@@ -0,0 +1,186 @@
+import json
+import threading
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
+
+from app.models import Resume, ResumeFeatures
+from app.ml.job_recommender import HASH_SPACE, get_job_index, project_rows, select_page
+from app.ml.resume_features import _now, resume_feature_values, stale_parts, upsert_resume_features
+
+# 🏅 Applicant Ranker (Teacher side)
+# recommend_jobs answers "which jobs fit this student?". This answers the reverse:
+# "which students fit this job?" - every stored resume vector is stacked into one CSR matrix,
+# so ranking tens of thousands of candidates is a single sparse mat-vec + partial sort.
+# The hashed term counts stay in memory next to it, so a job vocabulary refit is one vectorized re-projection.
+
+
+class ResumeMatrix:
+    _instance = None
+
+    # Re-uploads leave dead rows behind; compact once they exceed this fraction of the matrix.
+    COMPACT_RATIO = 0.25
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResumeMatrix, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.version = None # JobIndex.version the rows were weighted with
+            cls._instance.raw = None # CSR (n_rows x HASH_SPACE), stored hashed term counts (vocabulary-independent)
+            cls._instance.matrix = None # CSR (n_rows x n_terms), raw projected + TF-IDF weighted, rows L2-normalized
+            cls._instance.student_ids = np.empty(0, dtype=np.int64)
+            cls._instance.alive = np.empty(0, dtype=bool)
+            cls._instance.row_of = {} # {student_id: row}
+            cls._instance.synced_at = None
+        return cls._instance
+
+    def sync(self, db):
+        """
+        Brings the matrix up to date with resume_features. The first call loads every resume once;
+        after that only rows written since the last sync are (re)appended. A job vocabulary refit
+        just re-projects the in-memory hashed rows (no DB reads, no re-tokenizing).
+        """
+        job_index = get_job_index(db)
+        with self._lock:
+            started = _now()
+            if self.raw is None:
+                rows = (
+                    db.query(Resume, ResumeFeatures)
+                    .outerjoin(ResumeFeatures, ResumeFeatures.resume_id == Resume.id)
+                    .filter(Resume.extracted_text != None)
+                    .all()
+                )
+                self.raw = csr_matrix((0, HASH_SPACE), dtype=np.float32)
+            else:
+                rows = (
+                    db.query(Resume, ResumeFeatures)
+                    .join(ResumeFeatures, ResumeFeatures.resume_id == Resume.id)
+                    .filter(ResumeFeatures.updated_at >= self.synced_at)
+                    .all()
+                )
+            if rows:
+                self._add(*self._hashed_rows(db, rows))
+            self._project(job_index)
+            self._compact()
+            self.synced_at = started
+
+    def _hashed_rows(self, db, rows):
+        """
+        (student_ids, CSR of hashed term counts) for (Resume, ResumeFeatures) rows. Missing / legacy
+        features are computed here and written back in ONE upsert + commit for the whole batch.
+        """
+        vectors, student_ids, backfill = [], [], []
+        for resume, features in rows:
+            if stale_parts(features)[0]:
+                values = resume_feature_values(resume)
+                backfill.append(values)
+                vectors.append(values["term_vector_json"])
+            else:
+                vectors.append(features.term_vector_json)
+            student_ids.append(resume.student_id)
+        if backfill:
+            # Everything needed was read above: the commit expiring these ORM objects costs no extra queries.
+            upsert_resume_features(db, backfill)
+            db.commit()
+            print(f"Resume Matrix: backfilled features for {len(backfill)} resumes.")
+
+        indptr, hashes, counts = [0], [], []
+        for vector_json in vectors:
+            vector = json.loads(vector_json)
+            hashes.extend(vector["hashes"])
+            counts.extend(vector["counts"])
+            indptr.append(len(hashes))
+        raw = csr_matrix(
+            (np.asarray(counts, dtype=np.float32), np.asarray(hashes, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(student_ids), HASH_SPACE),
+        )
+        return student_ids, raw
+
+    def _add(self, student_ids, raw):
+        """Appends hashed rows; a re-upload replaces the student's row (old one killed, new one appended)."""
+        if not student_ids:
+            return
+        for sid in student_ids:
+            old = self.row_of.get(sid)
+            if old is not None:
+                self.alive[old] = False
+        start = self.raw.shape[0]
+        self.raw = vstack([self.raw, raw], format="csr")
+        self.student_ids = np.concatenate([self.student_ids, np.asarray(student_ids, dtype=np.int64)])
+        self.alive = np.concatenate([self.alive, np.ones(len(student_ids), dtype=bool)])
+        for offset, sid in enumerate(student_ids):
+            self.row_of[sid] = start + offset
+
+    def _project(self, job_index):
+        """
+        Brings `matrix` in line with `raw`: only the rows added since the last projection, or - after a
+        vocabulary refit - every row at once (token hashes -> columns, TF-IDF weighting, L2 norm; no per-candidate loop).
+        """
+        projection = job_index.projection()
+        idf, version = projection[2], projection[3]
+        full = self.matrix is None or self.version != version
+        done = 0 if full else self.matrix.shape[0]
+        if not full and done == self.raw.shape[0]:
+            return
+        self.version = version
+        counts = project_rows(self.raw[done:], projection)
+        if counts is None:
+            self.matrix = None # Empty job index: nothing to score against
+            return
+        counts.data *= idf[counts.indices].astype(np.float32)
+        normalize(counts, norm="l2", copy=False)
+        self.matrix = counts if full else vstack([self.matrix, counts], format="csr")
+        if full:
+            print(f"Resume Matrix Ready: {int(self.alive.sum())} resumes vectorized for ranking.")
+
+    def _compact(self):
+        dead = int((~self.alive).sum())
+        if dead > self.COMPACT_RATIO * len(self.alive):
+            self.raw = self.raw[self.alive]
+            if self.matrix is not None:
+                self.matrix = self.matrix[self.alive]
+            self.student_ids = self.student_ids[self.alive]
+            self.alive = np.ones(len(self.student_ids), dtype=bool)
+            self.row_of = {int(sid): row for row, sid in enumerate(self.student_ids)}
+
+    def rank(self, job_vector, student_ids=None, limit: int = 20, offset: int = 0, min_score: float = 0.0):
+        """
+        Scores every resume (or only `student_ids`) against one job vector.
+
+        Returns:
+            tuple: (total candidates scoring >= min_score, [(student_id, score_0_100), ...] for the page).
+        """
+        with self._lock:
+            matrix, ids, alive = self.matrix, self.student_ids, self.alive
+
+        if matrix is None or job_vector is None or matrix.shape[0] == 0:
+            return 0, []
+
+        # 1️⃣ One sparse mat-vec over all candidates.
+        scores = (matrix @ job_vector.T).toarray().ravel() * 100
+
+        # 2️⃣ Candidate rows (live rows, optionally restricted to the job's applicants).
+        mask = alive.copy()
+        if student_ids is not None:
+            mask &= np.isin(ids, np.asarray(list(student_ids), dtype=np.int64))
+        candidates = np.flatnonzero(mask)
+
+        # 3️⃣ Partial selection: only the top (offset + limit) rows get fully sorted; ties by student id.
+        total, page = select_page(scores[candidates], ids[candidates], limit=limit, offset=offset, min_score=min_score)
+        rows = candidates[page]
+        return total, [(int(ids[row]), round(float(scores[row]), 2)) for row in rows]
+
+
+def rank_students_for_job(db, job, student_ids=None, limit: int = 20, offset: int = 0, min_score: float = 0.0):
+    """Convenience wrapper: sync the resume matrix, vectorize the job and rank."""
+    job_index = get_job_index(db)
+    resume_matrix = ResumeMatrix()
+    resume_matrix.sync(db)
+    job_vector, version = job_index.job_vector({
+        "id": job.id, "title": job.title, "description": job.description, "skills_required": job.skills_required,
+    })
+    if version != resume_matrix.version:
+        # Vocabulary refit raced with this request; rebuild against the new one.
+        resume_matrix.sync(db)
+    return resume_matrix.rank(job_vector, student_ids=student_ids, limit=limit, offset=offset, min_score=min_score)
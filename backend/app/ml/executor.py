@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+# 🏭 ML Executor
+# sklearn scoring is CPU-bound. Run inside sync routes, it holds the shared FastAPI threadpool, so a burst
+# of dashboard loads starves auth/job-listing requests. Here it runs in a dedicated process pool instead:
+# routes `await run_ml(...)`, the event loop stays free, and ML load spreads across cores.
+
+
+class MLExecutor:
+    busy_detail = "ML engine busy, please retry in a moment."
+    timeout_detail = "ML scoring timed out, please retry."
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # Bounded queue: a slot is held from submit until the task really finishes
+        # (not just until the caller times out), so the bound reflects actual pool load.
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._stats_lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    if self.workers > 0:
+                        # 'spawn': children start clean (no forked DB connections / model handles).
+                        self._pool = ProcessPoolExecutor(
+                            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                        )
+                        print(f"ML Executor: process pool started ({self.workers} workers).")
+                    else:
+                        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ml")
+                        print("ML Executor: ML_POOL_WORKERS=0, running ML in a thread pool.")
+        return self._pool
+
+    def _on_done(self, future):
+        self._slots.release()
+        with self._stats_lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def run(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in the pool and awaits the result.
+        Raises 503 when the queue is full and 504 when the call exceeds its timeout.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise HTTPException(status_code=503, detail=self.busy_detail)
+        with self._stats_lock:
+            self.pending += 1
+        try:
+            future = self._get_pool().submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            with self._stats_lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._on_done)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel() # Only drops it if it hasn't started; a running task finishes in the background
+            with self._stats_lock:
+                self.timeouts += 1
+            raise HTTPException(status_code=504, detail=self.timeout_detail)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "mode": "process" if self.workers > 0 else "thread",
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "timeout_seconds": self.timeout,
+            }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+ML_EXECUTOR = MLExecutor(
+    workers=settings.ML_POOL_WORKERS,
+    max_pending=settings.ML_POOL_MAX_PENDING,
+    timeout=settings.ML_TASK_TIMEOUT_SECONDS,
+)
+
+
+async def run_ml(fn, *args, timeout: float = None, **kwargs):
+    """Shortcut for ML_EXECUTOR.run (routes await this)."""
+    return await ML_EXECUTOR.run(fn, *args, timeout=timeout, **kwargs)
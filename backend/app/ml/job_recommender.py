@@ -1,17 +1,53 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+import hashlib
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+from ..config import settings
 
 # 🤖 Job Recommender Logic
 # Purpose: Analyzes resume text against a list of jobs to calculate a match score (Cosine Similarity).
 # Why TF-IDF? Provides a lightweight and highly efficient alternative to heavy transformers like BERT/Transformers, ensuring smooth operation on 4GB RAM systems.
 
+
+def job_document(job: dict) -> str:
+    """Combine Job Title, Description, and Skills into a singular document for comparison."""
+    return f"{job.get('title', '')} {job.get('description', '')} {job.get('skills_required', '')}"
+
+
+def hashing_enabled() -> bool:
+    return settings.JOB_VECTORIZER_MODE.lower() == "hashing"
+
+
+def make_hashing_vectorizer():
+    """
+    Stateless vectorizer for very large job corpora: every term is hashed into a fixed number of
+    float32 columns, so memory stays bounded by HASHING_N_FEATURES and nothing has to be fitted.
+    Raw counts (norm=None, no sign flipping) keep term counts additive like the TF-IDF mode.
+    """
+    return HashingVectorizer(
+        stop_words="english",
+        n_features=settings.HASHING_N_FEATURES,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+
 def recommend_jobs(resume_text: str, jobs: list, top_n: int = 3):
     """
     Calculates mathematical similarity between a student's resume and available job descriptions.
-    
+    Fits a throwaway vectorizer on the given corpus; routes should prefer the shared JobIndex.
+
     Args:
         top_n (int): The number of top-ranked recommendations to return (Default: 3).
-    
+
     Returns:
         list: Scored jobs sorted by match percentage.
     """
@@ -20,20 +56,20 @@ def recommend_jobs(resume_text: str, jobs: list, top_n: int = 3):
     if not resume_text or not jobs:
         return []
 
-    # 1️⃣ Data Preparation: 
-    # Combine Job Title, Description, and Skills into a singular document for comparison.
+    # 1️⃣ Data Preparation:
     # The first element in the corpus is always the user's resume (index 0).
-    documents = [resume_text] + [
-        f"{job.get('title', '')} {job.get('description', '')} {job.get('skills_required', '')}"
-        for job in jobs
-    ]
+    documents = [resume_text] + [job_document(job) for job in jobs]
 
     # 2️⃣ Vectorization (TF-IDF):
     # Transforms text into a numerical matrix representing term significance.
     # stop_words="english": Filters out common filler words (e.g., 'the', 'is') for better accuracy.
     # max_features=500: Limits vocabulary to the most significant terms to optimize memory usage.
-    vectorizer = TfidfVectorizer(stop_words="english", max_features=500)
-    tfidf_matrix = vectorizer.fit_transform(documents)
+    # JOB_VECTORIZER_MODE=hashing: hashed term counts instead (no vocabulary, no fit, no term cap).
+    if hashing_enabled():
+        tfidf_matrix = make_hashing_vectorizer().transform(documents)
+    else:
+        vectorizer = TfidfVectorizer(stop_words="english", max_features=500)
+        tfidf_matrix = vectorizer.fit_transform(documents)
 
     # 3️⃣ Cosine Similarity Calculation:
     # Compares the resume vector against the entire job corpus.
@@ -52,10 +88,428 @@ def recommend_jobs(resume_text: str, jobs: list, top_n: int = 3):
 
     # Sort candidates by descending match percentage.
     scored_jobs.sort(key=lambda x: x["score"], reverse=True)
-    
+
     # Return Top N recommendations
     return scored_jobs[:top_n]
 
-# 💡 Optimization Note: 
+
+# 🔢 Vocabulary-Independent Term Counts
+# Stored resume features keep token counts keyed by a 32-bit murmur hash of the token, not by a column of
+# the fitted vocabulary: every process / refit sees the same stored row (TERM_HASH_VERSION is a constant),
+# and JobIndex.project_* maps them onto the current vocabulary (or hashed column space) in one vectorized
+# lookup. Same tokenizer as the index (lowercase, default token pattern, English stop words).
+
+TERM_HASH_VERSION = "mm3-32-en-1" # Bump if the tokenizer or the hash function changes
+HASH_SPACE = 2 ** 32
+
+_term_analyzer = None
+
+
+def term_analyzer():
+    global _term_analyzer
+    if _term_analyzer is None:
+        _term_analyzer = TfidfVectorizer(stop_words="english").build_analyzer()
+    return _term_analyzer
+
+
+def token_hash(token: str) -> int:
+    """Unsigned 32-bit murmur hash (sklearn's FeatureHasher hash, so hashing-mode columns derive from it too)."""
+    return murmurhash3_32(token, positive=True)
+
+
+def hashed_term_counts(text: str):
+    """
+    Tokenizes text once into vocabulary-independent counts.
+
+    Returns:
+        tuple: ({token_hash: count}, {"token_count", "unique_tokens"}).
+    """
+    tokens = term_analyzer()(text) if text else []
+    counts = Counter(token_hash(t) for t in tokens)
+    return dict(counts), {"token_count": len(tokens), "unique_tokens": len(set(tokens))}
+
+
+def project_hashes(hashes, projection):
+    """
+    Maps token hashes onto index columns (see JobIndex.projection).
+
+    Returns:
+        tuple: (columns of the kept hashes, boolean mask of kept hashes). TF-IDF mode keeps only hashes
+        of vocabulary terms; hashing mode keeps all (column = |signed hash| % n_features, like HashingVectorizer).
+    """
+    term_hashes, term_columns, idf, _ = projection
+    hashes = np.asarray(hashes, dtype=np.int64)
+    if term_hashes is None:
+        signed = np.where(hashes >= 2 ** 31, hashes - HASH_SPACE, hashes)
+        return np.abs(signed) % idf.shape[0], np.ones(hashes.size, dtype=bool)
+    if term_hashes.size == 0:
+        return np.empty(0, dtype=np.int64), np.zeros(hashes.size, dtype=bool)
+    pos = np.minimum(np.searchsorted(term_hashes, hashes), term_hashes.size - 1)
+    keep = term_hashes[pos] == hashes
+    return term_columns[pos[keep]], keep
+
+
+def project_rows(raw, projection):
+    """
+    Hashed count rows (CSR over HASH_SPACE columns) -> raw count rows over the index's columns, vectorized.
+    Returns None if the index has nothing to score against.
+    """
+    idf = projection[2]
+    if idf is None:
+        return None
+    raw = raw.tocsr()
+    columns, keep = project_hashes(raw.indices, projection)
+    rows = np.repeat(np.arange(raw.shape[0]), np.diff(raw.indptr))[keep]
+    # COO -> CSR sums duplicates (hashing-mode collisions add up, like HashingVectorizer)
+    return csr_matrix((raw.data[keep], (rows, columns)), shape=(raw.shape[0], idf.shape[0]), dtype=np.float32)
+
+
+# 📇 Job Corpus Index
+# The job table changes rarely (teacher create/toggle/delete) but is read on every dashboard load.
+# So the vectorizer is fitted once over the active jobs and patched in place on writes;
+# a recommendation then only transforms the resume and does one sparse mat-vec.
+# JOB_VECTORIZER_MODE=hashing swaps the fitted TF-IDF vocabulary for a HashingVectorizer: fixed
+# float32 column space, no refits, and a version that never changes (stored resume vectors stay valid).
+
+class JobIndex:
+    _instance = None
+
+    # New jobs are transformed with the existing vocabulary/IDF weights. After this many
+    # incremental changes the whole corpus is refitted so the IDF statistics don't drift.
+    REFIT_EVERY = 50
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(JobIndex, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.built = False
+            cls._instance.documents = {} # {job_id: (title, document)}
+            cls._instance.hashing = hashing_enabled()
+            cls._instance.vectorizer = None
+            cls._instance.analyzer = None
+            cls._instance.idf = None # Per-column weights (all ones in hashing mode)
+            cls._instance.term_hashes = None # Sorted token_hash of each vocabulary term (None in hashing mode)
+            cls._instance.term_columns = None # Vocabulary column of each entry in term_hashes
+            cls._instance.version = "" # Fingerprint of vocabulary + IDF; changes only on a full refit
+            cls._instance.matrix = None # CSR (n_jobs x n_terms), rows L2-normalized
+            cls._instance.job_ids = []
+            cls._instance.titles = []
+            cls._instance.row_of = {}
+            cls._instance.pending_changes = 0
+            cls._instance.corpus_version = None # DB 'jobs' CorpusVersion this index reflects
+        return cls._instance
+
+    def build(self, db):
+        """Fit the index over every active job in the DB."""
+        from ..models import Job
+        from .result_cache import get_corpus_version
+        corpus_version = get_corpus_version(db) # Read first: a bump during the query triggers a later sync
+        jobs = db.query(Job).filter(Job.is_active == True).all()
+        self.fit([
+            {"id": j.id, "title": j.title, "description": j.description, "skills_required": j.skills_required}
+            for j in jobs
+        ])
+        self.corpus_version = corpus_version
+
+    def sync(self, db, corpus_version: int):
+        """
+        Catch up with job changes made by other workers: diff the active job ids against
+        the index and apply only the difference (same path as this worker's own writes).
+        """
+        from ..models import Job
+        active_ids = {jid for (jid,) in db.query(Job.id).filter(Job.is_active == True).all()}
+        indexed_ids = set(self.documents)
+        for job_id in indexed_ids - active_ids:
+            self.remove_job(job_id)
+        missing = active_ids - indexed_ids
+        if missing:
+            for j in db.query(Job).filter(Job.id.in_(missing)).all():
+                self.upsert_job({"id": j.id, "title": j.title, "description": j.description, "skills_required": j.skills_required})
+        self.corpus_version = corpus_version
+
+    def fit(self, jobs: list):
+        """Replace the corpus with the given job dicts and refit from scratch."""
+        with self._lock:
+            self.documents = {job["id"]: (job.get("title"), job_document(job)) for job in jobs}
+            self._refit()
+            self.built = True
+        print(f"Job Index Ready: {len(self.job_ids)} active jobs vectorized.")
+
+    def _refit(self):
+        ids = list(self.documents.keys())
+        self.job_ids = ids
+        self.titles = [self.documents[jid][0] for jid in ids]
+        self.row_of = {jid: row for row, jid in enumerate(ids)}
+        self.pending_changes = 0
+        if self.hashing:
+            self._refit_hashing(ids)
+            return
+        self.vectorizer = None
+        self.analyzer = None
+        self.idf = None
+        self.term_hashes = None
+        self.term_columns = None
+        self.version = ""
+        self.matrix = None
+        if not ids:
+            return
+        vectorizer = TfidfVectorizer(stop_words="english", max_features=500)
+        try:
+            self.matrix = vectorizer.fit_transform([self.documents[jid][1] for jid in ids]).tocsr()
+            self.vectorizer = vectorizer
+            self.analyzer = vectorizer.build_analyzer()
+            self.idf = vectorizer.idf_
+            terms = list(vectorizer.vocabulary_.items())
+            hashes = np.fromiter((token_hash(t) for t, _ in terms), dtype=np.int64, count=len(terms))
+            order = np.argsort(hashes)
+            self.term_hashes = hashes[order]
+            self.term_columns = np.fromiter((c for _, c in terms), dtype=np.int64, count=len(terms))[order]
+            fingerprint = hashlib.sha1("|".join(sorted(vectorizer.vocabulary_)).encode())
+            fingerprint.update(vectorizer.idf_.tobytes())
+            self.version = fingerprint.hexdigest()[:12]
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words in every job) - nothing to score against.
+            pass
+
+    def _refit_hashing(self, ids):
+        # Nothing to learn: hash every document into the fixed column space and L2-normalize the rows.
+        if self.vectorizer is None:
+            self.vectorizer = make_hashing_vectorizer()
+            self.analyzer = self.vectorizer.build_analyzer()
+            self.idf = np.ones(self.vectorizer.n_features, dtype=np.float32)
+            self.version = f"hash-{self.vectorizer.n_features}"
+        if ids:
+            self.matrix = self._hash_rows([self.documents[jid][1] for jid in ids])
+        else:
+            self.matrix = csr_matrix((0, self.vectorizer.n_features), dtype=np.float32)
+
+    def _hash_rows(self, documents):
+        rows = self.vectorizer.transform(documents).tocsr()
+        normalize(rows, norm="l2", copy=False)
+        return rows
+
+    def upsert_job(self, job: dict):
+        """Add (or replace) one active job. No-op until the index has been built."""
+        if not self.built:
+            return
+        with self._lock:
+            job_id = job["id"]
+            replacing = job_id in self.documents
+            self.documents[job_id] = (job.get("title"), job_document(job))
+            if self.hashing:
+                # Hashed rows never go stale: swap just this job's row.
+                if replacing:
+                    self._drop_row(job_id)
+                row = self._hash_rows([self.documents[job_id][1]])
+            else:
+                self.pending_changes += 1
+                if replacing or self.vectorizer is None or self.pending_changes >= self.REFIT_EVERY:
+                    self._refit()
+                    return
+                row = self.vectorizer.transform([self.documents[job_id][1]])
+            self.matrix = vstack([self.matrix, row]).tocsr()
+            self.row_of[job_id] = len(self.job_ids)
+            self.job_ids = self.job_ids + [job_id]
+            self.titles = self.titles + [job.get("title")]
+
+    def remove_job(self, job_id: int):
+        """Drop a job that was closed or deleted. No-op if it isn't indexed."""
+        if not self.built or job_id not in self.documents:
+            return
+        with self._lock:
+            del self.documents[job_id]
+            if not self.hashing:
+                self.pending_changes += 1
+                if self.pending_changes >= self.REFIT_EVERY or not self.documents or self.matrix is None:
+                    self._refit()
+                    return
+            self._drop_row(job_id)
+
+    def _drop_row(self, job_id: int):
+        row = self.row_of[job_id]
+        keep = np.ones(len(self.job_ids), dtype=bool)
+        keep[row] = False
+        self.matrix = self.matrix[keep]
+        self.job_ids = self.job_ids[:row] + self.job_ids[row + 1:]
+        self.titles = self.titles[:row] + self.titles[row + 1:]
+        self.row_of = {jid: r for r, jid in enumerate(self.job_ids)}
+
+    def analyze(self, text: str):
+        """
+        Tokenizes text with the index's analyzer (same tokenization/stop words as the job corpus).
+
+        Returns:
+            tuple: ({term_index: raw_count}, token_stats, version). Raw counts are additive,
+            so counts for resume + profile skills can be summed before scoring.
+        """
+        with self._lock:
+            analyzer, vectorizer, version = self.analyzer, self.vectorizer, self.version
+
+        if analyzer is None or not text:
+            return {}, {"token_count": 0, "unique_tokens": 0, "vocab_hits": 0}, version
+
+        tokens = analyzer(text)
+        if self.hashing:
+            # Every token lands in some hashed column (no out-of-vocabulary terms).
+            row = vectorizer.transform([text])
+            counts = {int(c): int(n) for c, n in zip(row.indices, row.data)}
+            token_stats = {
+                "token_count": len(tokens),
+                "unique_tokens": len(set(tokens)),
+                "vocab_hits": len(tokens),
+            }
+            return counts, token_stats, version
+
+        vocabulary = vectorizer.vocabulary_
+        counts = Counter(int(vocabulary[t]) for t in tokens if t in vocabulary)
+        token_stats = {
+            "token_count": len(tokens),
+            "unique_tokens": len(set(tokens)),
+            "vocab_hits": sum(counts.values()),
+        }
+        return dict(counts), token_stats, version
+
+    def projection(self):
+        """Consistent snapshot for project_hashes / project_rows: (term_hashes, term_columns, idf, version)."""
+        with self._lock:
+            return self.term_hashes, self.term_columns, self.idf, self.version
+
+    def project_counts(self, hashed_counts: dict):
+        """{token_hash: count} (stored resume features) -> {term_index: count} over the current columns."""
+        projection = self.projection()
+        if projection[2] is None or not hashed_counts:
+            return {}
+        hashes = np.fromiter(hashed_counts.keys(), dtype=np.int64, count=len(hashed_counts))
+        counts = np.fromiter(hashed_counts.values(), dtype=np.int64, count=len(hashed_counts))
+        columns, keep = project_hashes(hashes, projection)
+        projected = {}
+        for column, count in zip(columns.tolist(), counts[keep].tolist()):
+            projected[column] = projected.get(column, 0) + count
+        return projected
+
+    def search_counts(self, counts: dict, top_n: int = 3):
+        """
+        Scores raw term counts (from analyze) against every indexed job.
+
+        Returns:
+            list: [{"job_id", "title", "score"}] sorted by descending 0-100 match score,
+            same shape as recommend_jobs.
+        """
+        _, page = self.search_page(counts, limit=top_n)
+        return page
+
+    def search_page(self, counts: dict, limit: int = None, offset: int = 0, min_score: float = None):
+        """
+        Paginated scoring: only the requested page is sorted and materialized.
+
+        Args:
+            limit (int): Page size (None = everything from offset on).
+            min_score (float): Drop jobs scoring below this (0-100 scale).
+
+        Returns:
+            tuple: (number of jobs passing min_score, [{"job_id", "title", "score"}] for the page).
+        """
+        # Take a consistent snapshot so concurrent writes can't tear the matrix/id pairing.
+        with self._lock:
+            idf, matrix, ids, titles = self.idf, self.matrix, self.job_ids, self.titles
+
+        if matrix is None or matrix.shape[0] == 0:
+            return 0, []
+
+        query = counts_to_tfidf(counts, idf)
+        if query.nnz:
+            # Both sides are L2-normalized, so the dot product is the cosine similarity.
+            scores = (matrix @ query.T).toarray().ravel() * 100
+        else:
+            # No known terms: every job scores 0 (same as an all-zero TF-IDF row).
+            scores = np.zeros(matrix.shape[0])
+
+        # Ties keep index order, like the old stable sort.
+        total, rows = select_page(scores, np.arange(scores.size), limit=limit, offset=offset, min_score=min_score)
+        return total, [
+            {"job_id": ids[i], "title": titles[i], "score": round(float(scores[i]), 2)}
+            for i in rows
+        ]
+
+    def job_vector(self, job: dict):
+        """
+        L2-normalized TF-IDF row for one job. Active jobs reuse their stored row;
+        closed ones are transformed on the fly.
+
+        Returns:
+            tuple: (1 x n_terms CSR or None if the index is empty, index version).
+        """
+        with self._lock:
+            idf, matrix, row_of, version = self.idf, self.matrix, self.row_of, self.version
+            row = row_of.get(job["id"]) if matrix is not None else None
+            if row is not None:
+                return matrix[row], version
+        if idf is None:
+            return None, version
+        counts, _, version = self.analyze(job_document(job))
+        return counts_to_tfidf(counts, idf), version
+
+    def search(self, resume_text: str, top_n: int = 3):
+        """Scores free text against every indexed job (see search_counts)."""
+        counts, _, _ = self.analyze(resume_text)
+        return self.search_counts(counts, top_n)
+
+
+def select_page(scores, tie_keys, limit: int = None, offset: int = 0, min_score: float = None):
+    """
+    Partial top-K selection over a NumPy score array. np.argpartition finds the best
+    (offset + limit) rows in O(n); only those get sorted (score desc, then tie_keys asc).
+
+    Returns:
+        tuple: (number of rows passing min_score, row indices of the page in rank order).
+    """
+    if min_score is not None:
+        candidates = np.flatnonzero(scores >= min_score)
+    else:
+        candidates = np.arange(scores.size)
+    total = int(candidates.size)
+    end = total if limit is None else min(offset + limit, total)
+    if end <= offset:
+        return total, candidates[:0]
+
+    cand_scores = scores[candidates]
+    if end < total:
+        top = np.argpartition(-cand_scores, end - 1)[:end]
+    else:
+        top = np.arange(total)
+    top = top[np.lexsort((tie_keys[candidates[top]], -cand_scores[top]))]
+    return total, candidates[top[offset:end]]
+
+
+def counts_to_tfidf(counts: dict, idf):
+    """
+    Turns raw {term_index: count} into an L2-normalized TF-IDF row (1 x n_terms CSR),
+    exactly like TfidfVectorizer.transform: counts * idf, then L2 norm. Keeps idf's dtype
+    (float32 in hashing mode, so the mat-vec never upcasts the job matrix).
+    """
+    n_terms = idf.shape[0]
+    cols = np.fromiter((c for c in counts if c < n_terms), dtype=np.int64)
+    values = np.array([counts[c] for c in cols], dtype=idf.dtype) * idf[cols]
+    norm = np.linalg.norm(values)
+    if norm > 0:
+        values /= norm
+    return csr_matrix((values, (np.zeros_like(cols), cols)), shape=(1, n_terms))
+
+
+def get_job_index(db=None):
+    """Shared JobIndex, built lazily from the DB on first use and synced when the job corpus version moves."""
+    index = JobIndex()
+    if db is None:
+        return index
+    if not index.built:
+        index.build(db)
+    else:
+        from .result_cache import get_corpus_version
+        corpus_version = get_corpus_version(db)
+        if corpus_version != index.corpus_version:
+            index.sync(db, corpus_version)
+    return index
+
+# 💡 Optimization Note:
 # Cosine Similarity is chosen for its efficiency in high-dimensional space and its ability to capture context beyond simple keyword matching.
 # For high-scale deployments, consider integrating vector databases like PGVector or Faiss.
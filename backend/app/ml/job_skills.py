@@ -0,0 +1,65 @@
+from sqlalchemy import func
+
+from app.models import Job, JobSkill
+
+# 🧩 Job Skill Store
+# Purpose: Job.skills_required ek comma-separated string hai. Skill-gap ke liye har request pe saare active
+# jobs ki strings split karna O(total skills) Python work hai. Instead, skills are normalized once on job
+# create into the indexed 'job_skills' table, and frequency/gap questions become one grouped SQL query.
+
+
+def parse_job_skills(skills_required: str):
+    """Normalized skill set of a job: comma split, trimmed, lowercase, no empties."""
+    return sorted({s.strip().lower() for s in (skills_required or "").split(",") if s.strip()})
+
+
+def set_job_skills(db, job):
+    """Replaces the job's normalized skill rows (same transaction; caller commits)."""
+    db.query(JobSkill).filter(JobSkill.job_id == job.id).delete(synchronize_session=False)
+    db.add_all([JobSkill(job_id=job.id, skill=skill) for skill in parse_job_skills(job.skills_required)])
+
+
+def backfill_job_skills(db):
+    """Normalizes jobs created before the job_skills table existed (or inserted outside the API)."""
+    indexed = db.query(JobSkill.job_id).distinct()
+    jobs = db.query(Job).filter(~Job.id.in_(indexed), Job.skills_required != None, Job.skills_required != "").all()
+    added = 0
+    for job in jobs:
+        skills = parse_job_skills(job.skills_required)
+        db.add_all([JobSkill(job_id=job.id, skill=skill) for skill in skills])
+        added += 1 if skills else 0
+    if added:
+        db.commit()
+        print(f"Job Skills Backfill: {added} jobs normalized.")
+
+
+def active_skill_frequencies(db):
+    """
+    How many active jobs ask for each skill, in one grouped query.
+
+    Returns:
+        list: [(skill, job_count)] sorted by demand (most requested first), then name.
+    """
+    job_count = func.count(JobSkill.job_id)
+    return (
+        db.query(JobSkill.skill, job_count)
+        .join(Job, Job.id == JobSkill.job_id)
+        .filter(Job.is_active == True)
+        .group_by(JobSkill.skill)
+        .order_by(job_count.desc(), JobSkill.skill)
+        .all()
+    )
+
+
+def skill_gap(db, known_skills, limit: int = 8):
+    """
+    Skill gap of a student against the active job market.
+
+    Returns:
+        dict: {"demanded": number of distinct active skills, "matched": how many the student has,
+        "missing": up to `limit` unknown skills, most in-demand first}.
+    """
+    known = {s.lower() for s in known_skills}
+    demanded = [skill for skill, _ in active_skill_frequencies(db)]
+    missing = [s for s in demanded if s not in known and len(s) > 2][:limit]
+    return {"demanded": len(demanded), "matched": len(known.intersection(demanded)), "missing": missing}
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models import CorpusVersion
+
+# ⚡ ML Result Cache
+# Students dashboard baar baar kholte hain, lekin beech me resume/profile/jobs kuch change nahi hota.
+# So recommendation/analysis results are cached under (resume text + profile skills hash, job-corpus version).
+# Any job create/toggle/delete bumps the version, which makes every older entry unreachable.
+
+
+def get_corpus_version(db, name: str = "jobs") -> int:
+    """Current version of a corpus (0 if it was never bumped)."""
+    row = db.query(CorpusVersion).filter(CorpusVersion.name == name).first()
+    return row.version if row else 0
+
+
+def bump_corpus_version(db, name: str = "jobs"):
+    """
+    Increments the corpus version inside the caller's transaction (caller commits),
+    so the bump is visible exactly when the change itself is. Returns the new version.
+    """
+    updated = db.query(CorpusVersion).filter(CorpusVersion.name == name).update(
+        {CorpusVersion.version: CorpusVersion.version + 1}, synchronize_session=False
+    )
+    if not updated:
+        db.add(CorpusVersion(name=name, version=1))
+        return 1
+    # Column query, not the ORM row: a CorpusVersion loaded earlier in this session would still hold the old value
+    return db.query(CorpusVersion.version).filter(CorpusVersion.name == name).scalar()
+
+
+class ResultCache:
+    """In-process LRU + TTL cache with an optional shared Redis tier and hit/miss counters."""
+
+    def __init__(self, max_size: int, ttl_seconds: int, redis_url: str = ""):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # {key: (expires_at, value)}
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared = None
+        if redis_url:
+            try:
+                import redis
+                self.shared = redis.Redis.from_url(redis_url, socket_timeout=0.2)
+                self.shared.ping()
+                print("Result Cache: shared Redis tier connected.")
+            except Exception as e:
+                print(f"Result Cache Warning: Redis unavailable, using in-process cache only ({e})")
+                self.shared = None
+
+    def get(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.shared is not None:
+            try:
+                raw = self.shared.get(key)
+                if raw is not None:
+                    value = json.loads(raw)
+                    self._store_local(key, value, now)
+                    with self._lock:
+                        self.shared_hits += 1
+                    return value
+            except Exception as e:
+                print(f"Result Cache Warning: shared get failed ({e})")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value):
+        self._store_local(key, value, time.monotonic())
+        if self.shared is not None:
+            try:
+                self.shared.set(key, json.dumps(value, default=str), ex=self.ttl_seconds)
+            except Exception as e:
+                print(f"Result Cache Warning: shared set failed ({e})")
+
+    def _store_local(self, key, value, now):
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "backend": "memory+redis" if self.shared is not None else "memory",
+            }
+
+
+RESULT_CACHE = ResultCache(
+    max_size=settings.RESULT_CACHE_SIZE,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    redis_url=settings.RESULT_CACHE_REDIS_URL,
+)
+
+
+def make_cache_key(namespace: str, corpus_version: int, parts) -> str:
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8", "ignore")).hexdigest()
+    return f"mlcache:{namespace}:v{corpus_version}:{digest}"
+
+
+def cached_result(db, namespace: str, parts, compute):
+    """
+    Returns compute() for (namespace, parts) under the current job-corpus version, computing it
+    only on a miss. `parts` should hold everything the result depends on besides the job corpus
+    (resume text, profile skills, taxonomy version...).
+    """
+    key = make_cache_key(namespace, get_corpus_version(db), parts)
+    value = RESULT_CACHE.get(key)
+    if value is None:
+        value = compute()
+        RESULT_CACHE.set(key, value)
+    return value
+
+
+def _lookup(db, namespace: str, parts):
+    key = make_cache_key(namespace, get_corpus_version(db), parts)
+    return key, RESULT_CACHE.get(key)
+
+
+async def cached_result_async(db, namespace: str, parts, compute):
+    """
+    Async twin of cached_result: `compute` is a coroutine factory (e.g. a run_ml call).
+    The corpus-version query and the cache get/set (Redis is a blocking client) run in the threadpool;
+    only the compute future is awaited on the event loop.
+    """
+    key, value = await run_in_threadpool(_lookup, db, namespace, parts)
+    if value is None:
+        value = await compute()
+        await run_in_threadpool(RESULT_CACHE.set, key, value)
+    return value
@@ -0,0 +1,122 @@
+import datetime
+import json
+
+from app.models import ResumeFeatures
+from app.ml.job_recommender import TERM_HASH_VERSION, get_job_index, hashed_term_counts
+from app.utils.skill_library import TAXONOMY_VERSION
+from app.utils.skill_matcher import extract_skills_from_text
+
+# 🧾 Resume Feature Store
+# Purpose: Resume text sirf upload pe change hota hai, lekin analyze/recommend har dashboard load pe chalte hain.
+# So the derived artifacts (term counts, skill set, token stats) are computed once at upload and persisted
+# in 'resume_features'. Reads recompute a part lazily only when its version no longer matches.
+# Term counts are stored keyed by token hash (see job_recommender.hashed_term_counts), so they don't depend
+# on any process's fitted vocabulary: a job refit never makes them stale, and readers project them.
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) # Naive UTC, like the column default
+
+
+def resume_feature_values(resume, terms: bool = True, skills: bool = True) -> dict:
+    """Column values for one resume's ResumeFeatures row (only the requested parts)."""
+    text = resume.extracted_text or ""
+    values = {"resume_id": resume.id, "updated_at": _now()}
+
+    # 1️⃣ Hashed term counts + token stats: tied only to the tokenizer (TERM_HASH_VERSION).
+    if terms:
+        counts, token_stats = hashed_term_counts(text)
+        hashes = sorted(counts)
+        values["term_vector_json"] = json.dumps({"hashes": hashes, "counts": [counts[h] for h in hashes]})
+        values["token_stats_json"] = json.dumps(token_stats)
+        values["vectorizer_version"] = TERM_HASH_VERSION
+
+    # 2️⃣ Normalized skill set: tied to the skill taxonomy (TAXONOMY_VERSION).
+    if skills:
+        values["skills_json"] = json.dumps(sorted({s.lower() for s in extract_skills_from_text(text)}))
+        values["taxonomy_version"] = TAXONOMY_VERSION
+    return values
+
+
+def stale_parts(features):
+    """(terms_stale, skills_stale) for a stored row (None = nothing stored yet)."""
+    if features is None:
+        return True, True
+    terms = features.vectorizer_version != TERM_HASH_VERSION or features.term_vector_json is None
+    skills = features.taxonomy_version != TAXONOMY_VERSION or features.skills_json is None
+    return terms, skills
+
+
+def upsert_resume_features(db, rows: list):
+    """
+    Writes rows (dicts with the same keys, from resume_feature_values) with INSERT .. ON CONFLICT (resume_id)
+    DO UPDATE, so concurrent first reads of the same resume can't both insert. Caller commits.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        # No portable upsert: merge row by row (unique resume_id still guards duplicates)
+        for values in rows:
+            features = db.query(ResumeFeatures).filter(ResumeFeatures.resume_id == values["resume_id"]).first()
+            if features is None:
+                db.add(ResumeFeatures(**values))
+            else:
+                for column, value in values.items():
+                    setattr(features, column, value)
+        return
+    stmt = insert(ResumeFeatures).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResumeFeatures.resume_id],
+        set_={column: stmt.excluded[column] for column in rows[0] if column != "resume_id"},
+    )
+    db.execute(stmt)
+
+
+def refresh_resume_features(db, resume, force: bool = False):
+    """
+    Brings the stored features for a resume up to date and returns the ResumeFeatures row.
+
+    Args:
+        force (bool): Recompute everything (use after the resume text itself changed).
+    """
+    query = db.query(ResumeFeatures).filter(ResumeFeatures.resume_id == resume.id)
+    features = query.first()
+    terms, skills = (True, True) if force else stale_parts(features)
+    if not (terms or skills):
+        return features
+
+    upsert_resume_features(db, [resume_feature_values(resume, terms=terms, skills=skills)])
+    db.commit()
+    return query.populate_existing().first()
+
+
+def load_resume_features(db, resume):
+    """
+    Returns the resume's artifacts as plain Python objects:
+    {"skills": [...], "term_counts": {term_index: count}, "token_stats": {...}}.
+    term_counts are projected onto the current job index columns.
+    """
+    features = refresh_resume_features(db, resume)
+    vector = json.loads(features.term_vector_json)
+    term_counts = get_job_index(db).project_counts(dict(zip(vector["hashes"], vector["counts"])))
+    token_stats = json.loads(features.token_stats_json)
+    token_stats["vocab_hits"] = sum(term_counts.values()) # Depends on the current vocabulary, so not stored
+    return {
+        "skills": json.loads(features.skills_json),
+        "term_counts": term_counts,
+        "token_stats": token_stats,
+    }
+
+
+def merge_counts(*count_dicts):
+    """Sum raw term counts (e.g. stored resume counts + live profile-skill counts)."""
+    merged = {}
+    for counts in count_dicts:
+        for term, count in counts.items():
+            merged[term] = merged.get(term, 0) + count
+    return merged
@@ -0,0 +1,144 @@
+from app.database import SessionLocal
+from app.models import Resume, Job, StudentProfile
+from app.ml.job_recommender import get_job_index
+from app.ml.job_skills import skill_gap
+from app.ml.resume_features import load_resume_features, merge_counts
+from app.utils.skill_library import SKILL_COURSE_MAP
+from app.utils.skill_matcher import extract_skills_from_text
+
+# 🧮 Scoring Tasks
+# CPU-heavy ML work (resume analysis, job scoring) lives here, away from the routes, so it can run
+# inside the ML process pool (app/ml/executor.py). The *_task entrypoints are top-level and take only
+# plain ids/values: they get pickled to a worker process, which opens its own DB session and keeps
+# its own JobIndex (kept fresh through the shared job-corpus version).
+
+
+def build_resume_analysis(db, resume, profile_skills_raw: str):
+    """Skill gap + ML job matching + course suggestions for one resume (cached by analyze_resume)."""
+    resume_text = resume.extracted_text
+
+    # 2. Resume skills come precomputed from upload; only the (short) profile skills are parsed live
+    job_index = get_job_index(db)
+    features = load_resume_features(db, resume)
+    profile_counts, _, _ = job_index.analyze(profile_skills_raw)
+    resume_skills = sorted(set(features["skills"]) | set(extract_skills_from_text(profile_skills_raw)))
+
+    # 3. ML-based job matching using the shared TF-IDF job index (from job_recommender.py)
+    recommended = []
+    if job_index.job_ids and resume_text:
+        recommended = job_index.search_counts(merge_counts(features["term_counts"], profile_counts), top_n=5)
+
+    # 4. Skill gap from the normalized job_skills table (one grouped query, most in-demand skills first)
+    gap = skill_gap(db, resume_skills, limit=8)
+    missing_skills = gap["missing"]
+
+    # 5. Match percentage (based on skill overlap with all active jobs)
+    if gap["demanded"]:
+        match_pct = min(round((gap["matched"] / gap["demanded"]) * 100, 1), 100)
+    else:
+        match_pct = 0
+
+    # 6. Course suggestions based on missing skills (Internal skill→course map)
+    courses = []
+    seen_courses = set()
+    for skill in missing_skills[:6]:
+        skill_lower = skill.lower()
+        for key, course in SKILL_COURSE_MAP.items():
+            if key in skill_lower or skill_lower in key:
+                if course["name"] not in seen_courses:
+                    courses.append(course)
+                    seen_courses.add(course["name"])
+                break
+    # Fill with general courses if not enough
+    if len(courses) < 3:
+        for key in list(SKILL_COURSE_MAP.keys())[:5]:
+            if len(courses) >= 5:
+                break
+            c = SKILL_COURSE_MAP[key]
+            if c["name"] not in seen_courses:
+                courses.append(c)
+                seen_courses.add(c["name"])
+
+    return {
+        "has_resume": True,
+        "match_percentage": match_pct,
+        "resume_skills": resume_skills,
+        "missing_skills": missing_skills,
+        "recommended_jobs": recommended,  # ML-matched via Internal API
+        "courses": courses[:6],
+        "resume_stats": features["token_stats"],
+        "source": "Internal API (TF-IDF ML Engine)",
+    }
+
+
+def build_job_suggestions(db, resume, profile, limit=None, offset=0, min_score=None):
+    """One page of active jobs scored against resume + profile skills (cached by get_job_suggestions)."""
+    # Stored resume term counts + live profile-skill counts (raw counts add up like concatenated text)
+    job_index = get_job_index(db)
+    combined_counts = {}
+    has_text = False
+    if resume and resume.extracted_text:
+        combined_counts = load_resume_features(db, resume)["term_counts"]
+        has_text = True
+    if profile and profile.technical_skills:
+        profile_counts, _, _ = job_index.analyze(profile.technical_skills)
+        combined_counts = merge_counts(combined_counts, profile_counts)
+        has_text = True
+
+    def to_data(j):
+        return {"id": j.id, "title": j.title, "description": j.description,
+                "skills_required": j.skills_required, "job_type": j.job_type,
+                "location_type": j.location_type, "salary": j.salary}
+
+    if has_text and job_index.job_ids:
+        # Partial top-K over the score array; only the page's job rows are fetched from the DB.
+        total, scored = job_index.search_page(combined_counts, limit=limit, offset=offset, min_score=min_score)
+        page_ids = [s["job_id"] for s in scored]
+        jobs = db.query(Job).filter(Job.id.in_(page_ids), Job.is_active == True).all() if page_ids else []
+        job_map = {j.id: to_data(j) for j in jobs}
+        result = []
+        for s in scored:
+            # Skip ids another worker may have closed meanwhile
+            jd = job_map.get(s["job_id"])
+            if jd is None:
+                continue
+            result.append({**jd, "score": s["score"], "is_suggested": s["score"] > 10})
+        return {"source": "Internal API (TF-IDF ML Engine based on your resume)", "total": total,
+                "limit": limit, "offset": offset, "suggestions": result}
+
+    jobs = db.query(Job).filter(Job.is_active == True).all()
+    return {"source": "All Available Jobs", "suggestions": [to_data(j) for j in jobs]}
+
+
+def _student_inputs(db, student_id: int):
+    resume = db.query(Resume).filter(Resume.student_id == student_id).first()
+    profile = db.query(StudentProfile).filter(StudentProfile.user_id == student_id).first()
+    return resume, profile
+
+
+def analyze_resume_task(student_id: int):
+    db = SessionLocal()
+    try:
+        resume, profile = _student_inputs(db, student_id)
+        profile_skills_raw = profile.technical_skills if profile and profile.technical_skills else ""
+        return build_resume_analysis(db, resume, profile_skills_raw)
+    finally:
+        db.close()
+
+
+def job_suggestions_task(student_id: int, limit=None, offset: int = 0, min_score=None):
+    db = SessionLocal()
+    try:
+        resume, profile = _student_inputs(db, student_id)
+        return build_job_suggestions(db, resume, profile, limit=limit, offset=offset, min_score=min_score)
+    finally:
+        db.close()
+
+
+def recommend_jobs_task(student_id: int, top_n: int = 5):
+    db = SessionLocal()
+    try:
+        resume, _ = _student_inputs(db, student_id)
+        return get_job_index(db).search_counts(load_resume_features(db, resume)["term_counts"], top_n=top_n)
+    finally:
+        db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.orm import relationship
 import datetime
 from .database import Base
@@ -100,6 +100,22 @@ class Job(Base):
     # Relationships
     teacher = relationship("User", back_populates="jobs")
     applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
+    skills = relationship("JobSkill", cascade="all, delete-orphan")
+
+class JobSkill(Base):
+    """
+    Normalized (lowercase, trimmed) skills of a job, one row per skill.
+    Kept in step with Job.skills_required on create so skill-gap queries can GROUP BY skill.
+    """
+    __tablename__ = "job_skills"
+    __table_args__ = (
+        UniqueConstraint("job_id", "skill", name="uq_job_skills_job_skill"),
+        Index("ix_job_skills_skill_job", "skill", "job_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    skill = Column(String(300), nullable=False) # Same width as Job.skills_required
 
 class Application(Base):
     __tablename__ = "applications"
@@ -131,6 +147,37 @@ class Resume(Base):
     # Upon upload, the PDF content is extracted and persisted here for database-level search and ML matching.
     extracted_text = Column(Text, nullable=True)
 
+class ResumeFeatures(Base):
+    """
+    Derived ML artifacts for a resume, computed once at upload time.
+    Each part is tagged with the version it was computed under, so reads only recompute
+    what went stale (tokenizer or skill taxonomy change).
+    """
+    __tablename__ = "resume_features"
+
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), unique=True, index=True)
+
+    vectorizer_version = Column(String(40), nullable=True)   # job_recommender.TERM_HASH_VERSION used for term_vector_json
+    term_vector_json = Column(Text, nullable=True)           # {"hashes": [...], "counts": [...]} keyed by token hash (vocabulary-independent)
+    token_stats_json = Column(Text, nullable=True)           # {"token_count", "unique_tokens"} (vocab_hits is computed on read)
+
+    taxonomy_version = Column(String(40), nullable=True)     # skill_library.TAXONOMY_VERSION used for skills_json
+    skills_json = Column(Text, nullable=True)                # Normalized (lowercase, sorted) skill list
+
+    # Indexed so the applicant ranker can pick up rows written by other workers incrementally.
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
+
+class CorpusVersion(Base):
+    """
+    Monotonic change counter per corpus (e.g. 'jobs'), bumped in the same transaction as the change.
+    Shared by all workers: result cache keys and the in-memory JobIndex use it to detect staleness.
+    """
+    __tablename__ = "corpus_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
 # ===============================
 # 🤖 PHASE-10: VISION MODELS
 # ===============================
@@ -140,7 +187,8 @@ class FaceEmbedding(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), index=True)
-    embedding_json = Column(Text)  # JSON string of the face vector (embedding layer)
+    embedding = Column(LargeBinary, nullable=True)  # Header + raw float32 face vector (see vision/embedding_codec.py)
+    embedding_json = Column(Text, nullable=True)  # Legacy JSON string of the vector; migrated into 'embedding'
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
 class AttendanceLog(Base):
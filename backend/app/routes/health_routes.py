@@ -29,16 +29,22 @@ async def health_check(db: Session = Depends(get_db)):
     except Exception:
         smtp_status = "offline"
 
-    # 4. AI check - verify FaceService can be imported
+    # 4. AI check - verify FaceService can be imported, then background model warm-up state
     try:
         from ..vision.face_service import FaceService
         ai_status = "online"
     except Exception:
         ai_status = "offline"
 
+    from ..core.warmup import WARMUP
+    warmup = WARMUP.status()
+    if ai_status == "online" and warmup["status"] != "ready":
+        ai_status = warmup["status"] # "warming" / "degraded"
+
     return {
         "backend": backend_status,
         "db": db_status,
         "smtp": smtp_status,
         "ai": ai_status,
+        "models": warmup, # Per-model status + load_seconds
     }
@@ -6,6 +6,8 @@ from app.database import get_db
 from app.models import Job, User, StudentProfile
 from app.schemas import JobCreate, JobResponse
 from app.core.dependencies import teacher_only, get_current_user
+from app.ml.result_cache import bump_corpus_version
+from app.ml.job_skills import set_job_skills
 
 router = APIRouter()
 
@@ -28,6 +30,19 @@ def job_to_dict(job, app_count=None):
     }
 
 
+def sync_job_index(job_id, job=None):
+    """Keep the in-memory recommender index in step with the active job set (job=None means deleted)."""
+    try:
+        from app.ml.job_recommender import JobIndex
+        index = JobIndex()
+        if job is not None and job.is_active:
+            index.upsert_job({"id": job.id, "title": job.title, "description": job.description, "skills_required": job.skills_required})
+        else:
+            index.remove_job(job_id)
+    except Exception as e:
+        print(f"Job Index Sync Warning: {e}")
+
+
 # 1. CREATE JOB (Teacher only)
 @router.post("/")
 def create_job(job: dict, db: Session = Depends(get_db), current_user: User = Depends(teacher_only)):
@@ -44,8 +59,12 @@ def create_job(job: dict, db: Session = Depends(get_db), current_user: User = De
         is_active=True
     )
     db.add(new_job)
+    db.flush() # Assigns new_job.id for the skill rows
+    set_job_skills(db, new_job) # Normalized rows for skill-gap queries
+    bump_corpus_version(db, "jobs") # Invalidates cached recommendations in every worker
     db.commit()
     db.refresh(new_job)
+    sync_job_index(new_job.id, new_job)
     return job_to_dict(new_job, 0)
 
 
@@ -72,7 +91,9 @@ def toggle_job(job_id: int, db: Session = Depends(get_db), current_user: User =
     if job.teacher_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your job.")
     job.is_active = not job.is_active
+    bump_corpus_version(db, "jobs") # Invalidates cached recommendations in every worker
     db.commit()
+    sync_job_index(job_id, job)
     return {"message": f"Job {'activated' if job.is_active else 'closed'} successfully.", "is_active": job.is_active}
 
 
@@ -85,7 +106,9 @@ def delete_job(job_id: int, db: Session = Depends(get_db), current_user: User =
     if job.teacher_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your job.")
     db.delete(job)
+    bump_corpus_version(db, "jobs") # Invalidates cached recommendations in every worker
     db.commit()
+    sync_job_index(job_id)
     return {"message": "Job deleted successfully."}
 
 
@@ -249,3 +272,45 @@ def view_student_profile(student_id: int, db: Session = Depends(get_db), current
         "projects": json.loads(profile.projects) if profile and profile.projects else [],
         "internships": json.loads(profile.internships) if profile and profile.internships else [],
     }
+
+
+# 11. RANK CANDIDATES FOR A JOB (Teacher) - ML scored, paginated
+@router.get("/{job_id}/ranked-candidates")
+def rank_candidates(job_id: int, scope: str = "applicants", limit: int = 20, offset: int = 0, min_score: float = 0.0,
+                    db: Session = Depends(get_db), current_user: User = Depends(teacher_only)):
+    from app.models import Application
+    from app.ml.applicant_ranker import rank_students_for_job
+
+    if scope not in ("applicants", "all"):
+        raise HTTPException(status_code=400, detail="scope must be 'applicants' or 'all'.")
+    if limit < 1 or limit > 100 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-100 and offset >= 0.")
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job.teacher_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your job.")
+
+    apps = db.query(Application).filter(Application.job_id == job_id).all()
+    app_by_student = {a.student_id: a for a in apps}
+    student_ids = set(app_by_student) if scope == "applicants" else None
+
+    total, page = rank_students_for_job(db, job, student_ids=student_ids, limit=limit, offset=offset, min_score=min_score)
+
+    # Only the requested page is materialized: one IN query for the students on it.
+    page_ids = [sid for sid, _ in page]
+    students = {u.id: u for u in db.query(User).filter(User.id.in_(page_ids)).all()} if page_ids else {}
+    results = []
+    for sid, score in page:
+        student = students.get(sid)
+        app_obj = app_by_student.get(sid)
+        results.append({
+            "student_id": sid,
+            "student_name": student.full_name if student else None,
+            "student_email": student.email if student else None,
+            "score": score,
+            "application_id": app_obj.id if app_obj else None,
+            "status": app_obj.status if app_obj else None,
+            "resume_url": f"/resumes/download/{sid}",
+        })
+    return {"job_id": job_id, "scope": scope, "total": total, "limit": limit, "offset": offset, "results": results}
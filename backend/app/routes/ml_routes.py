@@ -2,3 +2,15 @@ from fastapi import APIRouter
 router = APIRouter()
 @router.get("/")
 def test_route(): return {"status": "ML route active"}
+
+@router.get("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the recommendation/analysis result cache (this worker)."""
+    from app.ml.result_cache import RESULT_CACHE
+    return RESULT_CACHE.stats()
+
+@router.get("/executor-stats")
+def executor_stats():
+    """Queue depth / timeout / rejection counters of the ML scoring pool (this worker)."""
+    from app.ml.executor import ML_EXECUTOR
+    return ML_EXECUTOR.stats()
@@ -1,15 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import cv2
 import numpy as np
 import json
 import base64
 import asyncio
+import os
+import threading
+import zipfile
+from typing import List
 
 from ..database import get_db
 from ..models import User, FaceEmbedding, AttendanceLog, VisionLog
-from ..core.dependencies import get_current_user
+from ..core.dependencies import get_current_user, teacher_only
+from ..config import settings
 from ..core.security import create_access_token
+from ..ml.result_cache import bump_corpus_version
+from ..vision.inference_executor import AsyncService, run_inference
+from ..vision.frame_scheduler import LatestFrameChannel, requested_fps
+from ..vision.frame_context import FrameContext
+from ..vision.object_batcher import OBJECT_BATCHER
+from ..vision.motion_gate import MotionGate
 
 router = APIRouter()
 
@@ -17,44 +29,73 @@ router = APIRouter()
 def get_face_service(db: Session = None):
     from ..vision.face_service import FaceService
     fs = FaceService()
-    # Auto-Warm cache if empty and DB is available
-    if not fs.cache and db:
-        print("Auto-warming FaceService Cache...")
-        fs.warm_cache(db)
+    # Auto-Warm cache on first use, then only catch up with changes (DB is available)
+    if db:
+        if not fs.warmed:
+            print("Auto-warming FaceService Cache...")
+        fs.sync(db)
     return fs
 
+async def get_face_service_async(db: Session):
+    """get_face_service for async routes: the cache sync (first warm-up + ANN build, periodic id diff) is DB/CPU work, so it runs in the threadpool."""
+    return await run_in_threadpool(get_face_service, db)
+
+# Service getters below are locked: a request arriving while the background warm-up is still
+# constructing a model waits for that instance instead of loading a second copy.
+
 # Service getter for EmotionService with lazy singleton
 _emotion_service = None
+_emotion_lock = threading.Lock()
 
 def get_emotion_service():
     global _emotion_service
     if _emotion_service is None:
-        from ..vision.emotion_service import EmotionService
-        _emotion_service = EmotionService()
+        with _emotion_lock:
+            if _emotion_service is None:
+                from ..vision.emotion_service import EmotionService
+                _emotion_service = EmotionService()
     return _emotion_service
 
 
 
 # Service getter for PoseService with lazy singleton
 _pose_service = None
+_pose_lock = threading.Lock()
 
 def get_pose_service():
     global _pose_service
     if _pose_service is None:
-        from ..vision.pose_service import PoseService
-        _pose_service = PoseService()
+        with _pose_lock:
+            if _pose_service is None:
+                from ..vision.pose_service import PoseService
+                _pose_service = PoseService()
     return _pose_service
 
 # Service getter for ObjectService with lazy singleton
 _object_service = None
+_object_lock = threading.Lock()
 
 def get_object_service():
     global _object_service
     if _object_service is None:
-        from ..vision.object_service import ObjectService
-        _object_service = ObjectService()
+        with _object_lock:
+            if _object_service is None:
+                from ..vision.object_service import ObjectService
+                _object_service = ObjectService()
     return _object_service
 
+# Model calls below go through the vision inference lanes (`await AsyncService(...)` / run_inference),
+# so a slow DeepFace/YOLO pass never blocks the event loop for other requests.
+# YOLO is the exception: frames from all sessions are micro-batched by OBJECT_BATCHER (one forward pass per batch).
+
+@router.get("/executor-stats")
+def vision_executor_stats():
+    """Queue depth / timeout / rejection counters of each vision inference lane and the YOLO batcher (this worker)."""
+    from ..vision.inference_executor import INFERENCE_EXECUTOR
+    stats = INFERENCE_EXECUTOR.stats()
+    stats["object_batcher"] = OBJECT_BATCHER.stats()
+    return stats
+
 # 🔹 1. FACE REGISTRATION (Generate and store biometric embeddings)
 @router.post("/register-face")
 async def register_face(
@@ -80,9 +121,9 @@ async def register_face(
     print(f"DEBUG: Image Decoded. Size: {img.shape}")
 
     # Use AI to get face vector
-    face_service = get_face_service(db)
+    face_service = await get_face_service_async(db)
     print("DEBUG: Requesting Face Embedding...")
-    vector = face_service.get_embedding(img)
+    vector = await AsyncService(face_service, "face").get_embedding(img)
     
     if not vector:
         print("DEBUG: No face detected in the captured image.")
@@ -90,19 +131,181 @@ async def register_face(
 
     print(f"DEBUG: Embedding Generated (Len: {len(vector)})")
 
-    # Store vector as a JSON string in the database
+    await run_in_threadpool(_store_face, db, face_service, current_user.id, vector)
+    return {"status": "success", "message": "Face registered successfully!"}
+
+
+def _store_face(db, face_service, user_id, vector):
+    """DB insert + commit + cache append for one enrollment (sync: register_face runs it in the threadpool)."""
+    # Store vector as compact float32 bytes (header carries dim + model) in the database
+    from ..vision.embedding_codec import pack_embedding
     db_face = FaceEmbedding(
-        user_id=current_user.id,
-        embedding_json=json.dumps(vector)
+        user_id=user_id,
+        embedding=pack_embedding(vector, face_service.model_name)
     )
     db.add(db_face)
+    db.flush()
+    row_id = db_face.id # Read before commit expires the object
+    version = bump_corpus_version(db, "faces") # Other workers pick the new row up on their next sync
     db.commit()
     print("DEBUG: Embedding saved to Database.")
 
-    # Refresh Cache (CRITICAL for \"Fast\" experience)
-    face_service.warm_cache(db)
+    # Update Cache (CRITICAL for \"Fast\" experience) - only this row, no full reload
+    face_service.add_embedding(row_id, user_id, vector, version=version)
+
+# 🔹 1b. BULK FACE ENROLLMENT (Teacher onboards a whole cohort in one request)
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+# Sync DB / cache steps below run in the threadpool (run_in_threadpool), the photos on the face lane.
+
+
+def _photo_owner(filename: str):
+    """'42.jpg' / '42_2.jpg' -> ('id', 42); 'asha@campus.edu.jpg' -> ('email', 'asha@campus.edu')."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    if "@" in stem:
+        return "email", stem.lower()
+    head = stem.split("_")[0]
+    return ("id", int(head)) if head.isdigit() else (None, None)
+
+
+def _owners_by_key(db, owners):
+    """{("id", id) / ("email", email): User} for the parsed photo owners, in one query."""
+    ids = {value for kind, value in owners if kind == "id"}
+    emails = {value for kind, value in owners if kind == "email"}
+    users = db.query(User).filter((User.id.in_(ids)) | (User.email.in_(emails))).all() if ids or emails else []
+    by_key = {("id", u.id): u for u in users}
+    by_key.update({("email", (u.email or "").lower()): u for u in users})
+    return by_key
+
+
+def _store_faces(db, face_service, user_ids, vectors):
+    """One bulk insert + one commit, then one cache append. Returns the new FaceEmbedding ids."""
+    from ..vision.embedding_codec import pack_embedding
+    rows = [
+        FaceEmbedding(user_id=user_id, embedding=pack_embedding(vector, face_service.model_name))
+        for user_id, vector in zip(user_ids, vectors)
+    ]
+    db.add_all(rows)
+    db.flush() # Single batched INSERT; ids come back for the cache
+    row_ids = [row.id for row in rows] # Before commit: afterwards every row would reload on access
+    version = bump_corpus_version(db, "faces")
+    db.commit()
+    face_service.add_embeddings(row_ids, list(user_ids), list(vectors), version=version)
+    return row_ids
 
-    return {"status": "success", "message": "Face registered successfully!"}
+
+def _embed_photos(face_service, blobs):
+    """Runs on the face lane: decode + detect per photo, then batched Facenet passes."""
+    images = [cv2.imdecode(np.frombuffer(blob, np.uint8), cv2.IMREAD_COLOR) for blob in blobs]
+    decoded = [i for i, img in enumerate(images) if img is not None]
+    embedded = face_service.get_embeddings_batch([images[i] for i in decoded])
+    results = [(None, {"path": "undecodable", "faces": 0, "timings_ms": {}})] * len(blobs)
+    for i, result in zip(decoded, embedded):
+        results[i] = result
+    return results
+
+
+@router.post("/bulk-register-faces")
+async def bulk_register_faces(
+    files: List[UploadFile] = File(default=[]),
+    archive: UploadFile = File(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(teacher_only)
+):
+    """
+    Enrolls many student photos at once (multipart `files` and/or one `archive` zip).
+    Each photo is named after its owner: `<user_id>.jpg`, `<user_id>_<n>.jpg` or `<email>.jpg`.
+    Faces go through Facenet in batches, rows are stored with one bulk insert + commit and the
+    face cache is updated once. Returns one result per photo; photos over FACE_BULK_MAX_IMAGE_BYTES
+    are reported as failed without being decompressed/read in full.
+    """
+    teacher_email = current_user.email # Read now: the commit in step 4 expires current_user
+    # 1. Collect photos: (name, loader, size) - zip members are read chunk by chunk, not all up front
+    max_bytes = settings.FACE_BULK_MAX_IMAGE_BYTES
+    photos = []
+    for upload in files:
+        # Bounded read: one byte past the limit is enough to tell an oversized upload apart
+        photos.append((upload.filename, lambda upload=upload: upload.read(max_bytes + 1), upload.size))
+    bundle = None
+    if archive is not None:
+        try:
+            # SpooledTemporaryFile: seekable, no full read into memory. Central directory + member reads are file IO -> threadpool
+            bundle = await run_in_threadpool(zipfile.ZipFile, archive.file)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Archive is not a valid zip file.")
+        for info in bundle.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX") or os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+            # info.file_size (uncompressed) is checked before the member is read; zipfile never inflates past it
+            photos.append((name, lambda info=info: run_in_threadpool(bundle.read, info), info.file_size))
+    if not photos:
+        raise HTTPException(status_code=400, detail="No images received.")
+    if len(photos) > settings.FACE_BULK_MAX_IMAGES:
+        raise HTTPException(status_code=413, detail=f"Too many images (max {settings.FACE_BULK_MAX_IMAGES} per request).")
+
+    # 2. Resolve owners with one query
+    owners = [_photo_owner(name) for name, _, _ in photos]
+    by_key = await run_in_threadpool(_owners_by_key, db, owners)
+
+    results = [{"file": name, "user_id": None, "status": "failed"} for name, _, _ in photos]
+    too_large = f"Image larger than {max_bytes} bytes"
+    todo = []
+    for i, owner in enumerate(owners):
+        user = by_key.get(owner)
+        size = photos[i][2]
+        if size is not None and size > max_bytes:
+            results[i]["detail"] = too_large
+        elif owner[0] is None:
+            results[i]["detail"] = "File name must be <user_id>.jpg or <email>.jpg"
+        elif user is None:
+            results[i]["detail"] = "No such user"
+        elif user.role != "student":
+            results[i]["detail"] = "Only student accounts can be bulk-enrolled"
+        else:
+            results[i]["user_id"] = user.id
+            todo.append(i)
+
+    # 3. Embed in chunks on the face lane (detection per photo, one Facenet pass per chunk)
+    face_service = await get_face_service_async(db)
+    enrolled = [] # (result index, vector)
+    chunk_size = max(1, settings.FACE_BULK_BATCH_SIZE)
+    try:
+        for start in range(0, len(todo), chunk_size):
+            chunk = todo[start:start + chunk_size]
+            loaded = []
+            for i in chunk:
+                data = photos[i][1]()
+                data = await data if asyncio.iscoroutine(data) else data
+                if len(data) > max_bytes: # Upload without a known size: caught by the bounded read
+                    results[i]["detail"] = too_large
+                else:
+                    loaded.append((i, data))
+            if not loaded:
+                continue
+            chunk = [i for i, _ in loaded]
+            embedded = await run_inference("face", _embed_photos, face_service, [data for _, data in loaded])
+            for i, (vector, report) in zip(chunk, embedded):
+                results[i].update(detector=report["path"], faces=report["faces"])
+                if vector:
+                    enrolled.append((i, vector))
+                else:
+                    results[i]["detail"] = "Image could not be decoded" if report["path"] == "undecodable" else "Face not detected"
+    finally:
+        if bundle is not None:
+            bundle.close()
+
+    # 4. One bulk insert + one commit, then one cache append
+    if enrolled:
+        row_ids = await run_in_threadpool(
+            _store_faces, db, face_service, [results[i]["user_id"] for i, _ in enrolled], [v for _, v in enrolled]
+        )
+        for (i, _), row_id in zip(enrolled, row_ids):
+            results[i].update(status="enrolled", embedding_id=row_id)
+            if results[i]["faces"] > 1:
+                results[i]["detail"] = f"{results[i]['faces']} faces found, the most confident one was used"
+
+    print(f"Bulk Enrollment by {teacher_email}: {len(enrolled)}/{len(photos)} photos enrolled.")
+    return {"enrolled": len(enrolled), "failed": len(photos) - len(enrolled), "results": results}
 
 from ..schemas import FaceLoginRequest, FaceLoginResponse
 
@@ -141,33 +344,28 @@ async def face_login(
         img = cv2.resize(img, (320, 240))
 
         # 2. Get AI Embedding
-        face_service = get_face_service(db)
-        current_vector = face_service.get_embedding(img)
+        face_service = await get_face_service_async(db)
+        current_vector = await AsyncService(face_service, "face").get_embedding(img)
         
         if not current_vector:
             print("AI Error: Face detected in UI but embedding failed on server.")
             return FaceLoginResponse(verified=False, message="AI could not map your face. Please look directly at the lens.")
 
-        # 3. Search Matching User in Cache (Fast NumPy)
-        match_user_id = face_service.find_best_match(current_vector)
+        # 3. Search Matching User in Cache (Fast NumPy) - BLAS pass under the cache lock -> threadpool
+        match_user_id = await run_in_threadpool(face_service.find_best_match, current_vector)
         
         if not match_user_id:
             print(f"Recognition Failed: Distance exceeded internal threshold.")
             return FaceLoginResponse(verified=False, message="Face not recognized. Tip: Remove spectacles or improve lighting.")
 
         # 4. Success Flow
-        found_user = db.query(User).filter(User.id == match_user_id).first()
+        found_user = await run_in_threadpool(_log_face_login, db, match_user_id)
         if not found_user:
             print(f"Database Error: User ID {match_user_id} matched but user record missing!")
             return FaceLoginResponse(verified=False, message="System out of sync. Contact support.")
 
         print(f"Fast Match: {found_user.full_name} ({found_user.role})")
 
-        # Log Attendance
-        attendance = AttendanceLog(user_id=found_user.id)
-        db.add(attendance)
-        db.commit()
-
         # Generate JWT Token
         token = create_access_token({
             "user_id": found_user.id,
@@ -182,11 +380,28 @@ async def face_login(
             access_token=token
         )
 
+    except HTTPException:
+        raise # Inference queue full / timed out -> 503 / 504, not a failed match
     except Exception as e:
         print(f"Backend Internal Error: {e}")
         return FaceLoginResponse(verified=False, message=f"Internal server error: {str(e)}")
 
 
+def _log_attendance(db, user_id):
+    attendance = AttendanceLog(user_id=user_id)
+    db.add(attendance)
+    db.commit()
+
+
+def _log_face_login(db, user_id):
+    """Matched user (None if the row is gone) with attendance logged. Sync: runs in the threadpool."""
+    found_user = db.query(User).filter(User.id == user_id).first()
+    if found_user:
+        _log_attendance(db, found_user.id)
+        db.refresh(found_user) # Commit expired it; reload here, not lazily on the event loop
+    return found_user
+
+
 # 🔹 3. UNIFIED FRAME ANALYSIS (Emotion, Security, Activity in one call)
 @router.post("/analyze-frame")
 async def analyze_frame(
@@ -202,15 +417,30 @@ async def analyze_frame(
     nparr = np.frombuffer(contents, np.uint8)
     img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
-    # AI: Run all services (Parallel processing manually or async recommended)
-    emotion_service = get_emotion_service()
-    pose_service = get_pose_service()
-    object_service = get_object_service()
-    
-    emotion = emotion_service.analyze_emotion(img)
-    pose_status, _ = pose_service.analyze_pose(img)
-    is_sleeping = pose_service.check_drowsiness(img)
-    objects, alerts = object_service.detect_and_track(img)
+    if img is None:
+        raise HTTPException(status_code=400, detail="Invalid Image")
+
+    # AI: Run all services in parallel, each on its own inference lane
+    emotion_service = AsyncService(get_emotion_service(), "emotion")
+    pose_service = AsyncService(get_pose_service(), "pose")
+
+    # One face detection per frame, shared by emotion + pose (YOLO doesn't need it, so it starts right away)
+    ctx = FrameContext(img)
+    objects_task = asyncio.ensure_future(OBJECT_BATCHER.detect(ctx.image)) # Batched with other sessions' frames
+    try:
+        await run_inference("pose", ctx.detect_faces)
+        emotion, (pose_status, _), is_sleeping = await asyncio.gather(
+            emotion_service.analyze_emotion(ctx),
+            pose_service.analyze_pose(ctx),
+            pose_service.check_drowsiness(ctx),
+        )
+        objects, alerts = await objects_task
+    finally:
+        # Success path: already awaited above. On an error above, THAT error propagates: the YOLO request is
+        # cancelled (skipped if still queued) and its own outcome - result or exception - is drained and dropped.
+        if not objects_task.done():
+            objects_task.cancel()
+        await asyncio.gather(objects_task, return_exceptions=True)
 
     # Save Vision Logs in DB
     # Emotion Log
@@ -245,36 +475,57 @@ async def vision_stream(websocket: WebSocket, db: Session = Depends(get_db)):
     WebSocket endpoint for high-frequency frame analysis and real-time behavioral insights (LOW LATENCY).
     """
     await websocket.accept()
+    fps = requested_fps(websocket, settings.VISION_STREAM_TARGET_FPS)
+    gate = MotionGate() # Unchanged frames reuse the previous emotion / pose result
     try:
-        while True:
-            # 1. Receive image in Base64 string format (Web standard)
-            data = await websocket.receive_text()
-            img_data = base64.b64decode(data.split(",")[1])
-            nparr = np.frombuffer(img_data, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            # 2. AI Processing (Selective: Fast only)
-            emotion_service = get_emotion_service()
-            pose_service = get_pose_service()
-            
-            emotion = emotion_service.analyze_emotion(frame)
-            pose_status, _ = pose_service.analyze_pose(frame)
-            gesture = pose_service.get_hand_gestures(frame)
-
-            # 3. Response JSON
-            response = {
-                "emotion": emotion,
-                "pose": pose_status,
-                "gesture": gesture,
-                "status": "Processing OK"
-            }
-            await websocket.send_text(json.dumps(response))
-            
-            # Rate control check (Prevents CPU overhead on 4GB machine)
-            await asyncio.sleep(0.1) # 10 FPS cap for stability
+        # Receiver task keeps only the newest frame; this loop analyzes it when free (see frame_scheduler)
+        async with LatestFrameChannel(websocket, fps) as channel:
+            while True:
+                # 1. Receive image: binary (header + JPEG/WebP, zero-copy decode) or legacy Base64 data-URL text
+                received = await channel.next()
+                frame = received.image
+                if frame is None:
+                    await websocket.send_text(json.dumps({"status": "Frame skipped: could not decode image", **received.meta()}))
+                    continue
+
+                # 2. AI Processing (Selective: Fast only) - off the event loop, emotion + pose in parallel
+                emotion_service = AsyncService(get_emotion_service(), "emotion")
+                pose_service = AsyncService(get_pose_service(), "pose")
+                ctx = FrameContext(frame) # Faces detected once, then read by both services
+
+                cached = gate.check(ctx)
+                reused = cached is not None
+                if reused:
+                    emotion, pose_status, gesture = cached
+                else:
+                    try:
+                        await run_inference("pose", ctx.detect_faces)
+                        emotion, (pose_status, _), gesture = await asyncio.gather(
+                            emotion_service.analyze_emotion(ctx),
+                            pose_service.analyze_pose(ctx),
+                            pose_service.get_hand_gestures(ctx),
+                        )
+                    except HTTPException as e:
+                        # Lane full / timed out: skip this frame instead of dropping the socket
+                        await websocket.send_text(json.dumps({"status": f"Frame skipped: {e.detail}", **received.meta()}))
+                        continue
+                    gate.remember((emotion, pose_status, gesture))
+
+                # 3. Response JSON
+                response = {
+                    "emotion": emotion,
+                    "pose": pose_status,
+                    "gesture": gesture,
+                    "status": "Processing OK",
+                    "frames": channel.stats(), # received / processed / dropped / target_fps
+                    "reused": reused, # True = frame unchanged, previous analysis returned
+                    "motion": gate.stats(), # analyzed / skipped / skip_ratio for this session
+                    **received.meta() # seq / ts echo for binary clients (latency + ordering)
+                }
+                await websocket.send_text(json.dumps(response))
 
     except WebSocketDisconnect:
-        print("Vision Stream Disconnected.")
+        print(f"Vision Stream Disconnected. Motion gate skip ratio: {gate.stats()['skip_ratio']}")
 
 # 🔹 5. AI PROCTORING STREAM (Module 8 - NTA Style Monitoring)
 @router.websocket("/proctor")
@@ -285,97 +536,108 @@ async def proctor_stream(websocket: WebSocket, db: Session = Depends(get_db)):
     await websocket.accept()
     print("AI Proctoring Started for Candidate.")
     
-    # lazy load services
-    face_service = get_face_service()
-    object_service = get_object_service()
-    
     warning_count = 0
     max_warnings = 3
+    gate = MotionGate() # Per candidate: reuse the last result while the camera image doesn't change
     
+    fps = requested_fps(websocket, settings.VISION_PROCTOR_TARGET_FPS)
     try:
-        while True:
-            data = await websocket.receive_text()
-            img_data = base64.b64decode(data.split(",")[1])
-            nparr = np.frombuffer(img_data, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            if frame is None:
-                continue
-
-            alerts = []
-            
-            # 📱 Object Detection (Stricter restricted list)
-            objects, _ = object_service.detect_and_track(frame)
-            restricted = ["cell phone", "mobile", "book", "laptop", "remote", "tablet", "backpack"]
-            for obj in objects:
-                # If person detected by YOLO, and face_count from deepface is > 1, then it's multiple people
-                if obj["name"].lower() in restricted:
-                    alerts.append(f"RESTRICTED OBJECT: {obj['name'].upper()}")
-
-            # 👥 Face Detection
-            try:
-                from deepface import DeepFace
-                faces = DeepFace.extract_faces(img_path=frame, detector_backend='opencv', enforce_detection=False)
-                # Filter by confidence
-                valid_faces = [f for f in faces if f.get('confidence', 0) > 0.4]
-                face_count = len(valid_faces)
-                
-                if face_count == 0:
-                    alerts.append("NO FACE DETECTED!")
-                elif face_count > 1:
-                    alerts.append(f"MULTIPLE PEOPLE ({face_count})!")
+        # Receiver task keeps only the newest frame; this loop analyzes it when free (see frame_scheduler)
+        async with LatestFrameChannel(websocket, fps) as channel:
+            while True:
+                received = await channel.next() # Binary or legacy Base64 text, see frame_protocol
+                frame = received.image
+
+                if frame is None:
+                    continue
+
+                ctx = FrameContext(frame)
+                cached = gate.check(ctx) # Static frame -> previous alerts, no YOLO / face pass
+                reused = cached is not None
+                if reused:
+                    alerts = list(cached)
                 else:
-                    # Detect looking away (stricter 15% threshold)
-                    face = valid_faces[0]
-                    region = face['facial_area']
-                    fx = region['x'] + region['w'] // 2
-                    cx = frame.shape[1] // 2
-                    # 15% of frame width is more realistic for proctoring
-                    if abs(fx - cx) > (frame.shape[1] * 0.15):
-                        alerts.append("LOOKING AWAY DETECTED!")
-            except Exception as e:
-                print(f"DeepFace Trace: {e}")
-                pass
-
-            # ⚠️ Warning Logic with Cooldown (Don't spam warnings every second)
-            current_time = asyncio.get_event_loop().time()
-            if not hasattr(websocket, 'last_warning_time'):
-                websocket.last_warning_time = 0
-
-            if alerts and (current_time - websocket.last_warning_time > 2.0):
-                warning_count += 1
-                websocket.last_warning_time = current_time
-                for msg in alerts:
-                    log = VisionLog(log_type='proctor_alert', content=msg)
-                    db.add(log)
-                db.commit()
-
-            # 🛑 Termination Logic
-            test_status = "SAFE"
-            if alerts:
-                test_status = "VIOLATION"
-            if warning_count >= max_warnings:
-                test_status = "REVOKED"
-
-            # 📊 Response JSON
-            response = {
-                "proctored": True,
-                "alerts": alerts,
-                "warning_count": warning_count,
-                "status": test_status,
-                "message": "COMMAND: DISCONNECT" if test_status == "REVOKED" else "CONTINUE"
-            }
-            await websocket.send_text(json.dumps(response))
+                    alerts = []
             
-            if test_status == "REVOKED":
-                print(f"Test Revoked after {warning_count} warnings.")
-                await asyncio.sleep(1) # Final pulse
-                break # Close socket
+                    # 📱 Object Detection (Stricter restricted list) + 👥 face boxes, concurrently on their own lanes
+                    try:
+                        (objects, _), faces = await asyncio.gather(
+                            OBJECT_BATCHER.detect(ctx.image), # One YOLO pass shared with concurrent candidates
+                            run_inference("pose", ctx.detect_proctor_faces), # DeepFace opencv backend parameters
+                        )
+                    except HTTPException as e:
+                        print(f"Proctor frame skipped: {e.detail}") # Busy lane is not the candidate's fault
+                        continue
+                    restricted = ["cell phone", "mobile", "book", "laptop", "remote", "tablet", "backpack"]
+                    for obj in objects:
+                        # If person detected by YOLO, and face_count from deepface is > 1, then it's multiple people
+                        if obj["name"].lower() in restricted:
+                            alerts.append(f"RESTRICTED OBJECT: {obj['name'].upper()}")
+
+                    # 👥 Face Detection (FrameContext.proctor_faces: same detector + confidence scale the rules were tuned on)
+                    try:
+                        # Filter by confidence
+                        valid_faces = [f for f in faces if f.get('confidence', 0) > 0.4]
+                        face_count = len(valid_faces)
+                
+                        if face_count == 0:
+                            alerts.append("NO FACE DETECTED!")
+                        elif face_count > 1:
+                            alerts.append(f"MULTIPLE PEOPLE ({face_count})!")
+                        else:
+                            # Detect looking away (stricter 15% threshold)
+                            region = valid_faces[0]
+                            fx = region['x'] + region['w'] // 2
+                            cx = frame.shape[1] // 2
+                            # 15% of frame width is more realistic for proctoring
+                            if abs(fx - cx) > (frame.shape[1] * 0.15):
+                                alerts.append("LOOKING AWAY DETECTED!")
+                    except Exception as e:
+                        print(f"Face Check Trace: {e}")
+                        pass
+                    gate.remember(list(alerts))
+
+                # ⚠️ Warning Logic with Cooldown (Don't spam warnings every second)
+                current_time = asyncio.get_event_loop().time()
+                if not hasattr(websocket, 'last_warning_time'):
+                    websocket.last_warning_time = 0
+
+                if alerts and (current_time - websocket.last_warning_time > 2.0):
+                    warning_count += 1
+                    websocket.last_warning_time = current_time
+                    for msg in alerts:
+                        log = VisionLog(log_type='proctor_alert', content=msg)
+                        db.add(log)
+                    db.commit()
+
+                # 🛑 Termination Logic
+                test_status = "SAFE"
+                if alerts:
+                    test_status = "VIOLATION"
+                if warning_count >= max_warnings:
+                    test_status = "REVOKED"
+
+                # 📊 Response JSON
+                response = {
+                    "proctored": True,
+                    "alerts": alerts,
+                    "warning_count": warning_count,
+                    "status": test_status,
+                    "message": "COMMAND: DISCONNECT" if test_status == "REVOKED" else "CONTINUE",
+                    "frames": channel.stats(),
+                    "reused": reused, # True = frame unchanged, alerts carried over from the last analysis
+                    "motion": gate.stats(), # analyzed / skipped / skip_ratio for this session
+                    **received.meta()
+                }
+                await websocket.send_text(json.dumps(response))
             
-            await asyncio.sleep(0.5)
+                if test_status == "REVOKED":
+                    print(f"Test Revoked after {warning_count} warnings.")
+                    await asyncio.sleep(1) # Final pulse
+                    break # Close socket
 
     except WebSocketDisconnect:
-        print("Proctoring Session Ended.")
+        print(f"Proctoring Session Ended. Motion gate skip ratio: {gate.stats()['skip_ratio']}")
 
 # 🔹 6. STUDENT FACELOCK (RBAC Protected)
 from ..core.dependencies import student_only, teacher_only
@@ -399,23 +661,21 @@ async def student_facelock(
     if img is None:
         raise HTTPException(status_code=400, detail="Invalid Image")
 
-    face_service = get_face_service(db)
-    current_vector = face_service.get_embedding(img)
+    face_service = await get_face_service_async(db)
+    current_vector = await AsyncService(face_service, "face").get_embedding(img)
     
     if not current_vector:
         raise HTTPException(status_code=400, detail="Face not detected")
 
-    # OPTIMIZED: Use memory-cache check for this specific user
-    is_match = face_service.match_user_face(current_user.id, current_vector)
+    # OPTIMIZED: Use memory-cache check for this specific user (cache lock -> threadpool, not the loop)
+    is_match = await run_in_threadpool(face_service.match_user_face, current_user.id, current_vector)
 
     if not is_match:
         print(f"Face Mismatch for Student: {current_user.full_name}")
         raise HTTPException(status_code=401, detail="Face Verification Failed - Identity Mismatch")
 
     # Log attendance
-    attendance = AttendanceLog(user_id=current_user.id)
-    db.add(attendance)
-    db.commit()
+    await run_in_threadpool(_log_attendance, db, current_user.id)
 
     return {"status": "success", "message": "Face verified! Attendance logged."}
 
@@ -438,14 +698,14 @@ async def teacher_facelock(
     if img is None:
         raise HTTPException(status_code=400, detail="Invalid Image")
 
-    face_service = get_face_service(db)
-    current_vector = face_service.get_embedding(img)
+    face_service = await get_face_service_async(db)
+    current_vector = await AsyncService(face_service, "face").get_embedding(img)
     
     if not current_vector:
         raise HTTPException(status_code=400, detail="Face not detected")
 
-    # OPTIMIZED: Use memory-cache check for this specific user
-    is_match = face_service.match_user_face(current_user.id, current_vector)
+    # OPTIMIZED: Use memory-cache check for this specific user (cache lock -> threadpool, not the loop)
+    is_match = await run_in_threadpool(face_service.match_user_face, current_user.id, current_vector)
     
     if not is_match:
         print(f"Teacher Face Mismatch: {current_user.full_name}")
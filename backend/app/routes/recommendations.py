@@ -1,18 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Resume, Job, User
 from app.core.dependencies import student_only
-from app.ml.job_recommender import recommend_jobs
+from app.ml.result_cache import cached_result_async
+from app.ml.executor import run_ml
+from app.ml.scoring_tasks import recommend_jobs_task
 
 # 🚀 Recommendation Router Setup
 # Iska kaam hai: Student ke Resume aur Job Descriptions ko ML logic ke pass bhejna.
 
 router = APIRouter()
 
+
+def _resume_and_jobs(db: Session, student_id: int):
+    """Sync DB reads for the async route below (run via run_in_threadpool so they never block the event loop)."""
+    # 1️⃣ Fetch Student's Resume
+    # Hmm check karenge ki kya is student ne resume upload kiya hai?
+    resume = db.query(Resume).filter(
+        Resume.student_id == student_id
+    ).first()
+
+    # 2️⃣ Check Active Jobs
+    # Job corpus ek baar fit hota hai (JobIndex) aur create/toggle/delete pe update hota hai,
+    # isliye yahan har request pe saare jobs fetch karke refit karne ki zarurat nahi. Bas ek cheap check.
+    has_jobs = db.query(Job.id).filter(Job.is_active == True).first() is not None
+    return resume, has_jobs
+
+
 @router.get("/jobs")
-def recommend_jobs_for_student(
+async def recommend_jobs_for_student(
     db: Session = Depends(get_db),
     current_user: User = Depends(student_only)
 ):
@@ -22,16 +41,12 @@ def recommend_jobs_for_student(
     Kaise kaam karta hai?
     1. Pehle current student ka uploaded Resume dhundta hai.
     2. Us resume se extracted_text nikalta hai.
-    3. Phir DB se saare available Jobs fetch karta hai.
-    4. Dono data ML model (TF-IDF + Cosine) ke pass bhejkar 'Similarity Score' calculate karwata hai.
+    3. Pehle se fit kiye gaye active Jobs ke TF-IDF index (JobIndex) ko use karta hai.
+    4. Resume ko ML model (TF-IDF + Cosine) se score karke 'Similarity Score' calculate karwata hai.
     5. Top jobs return karta hai.
     """
 
-    # 1️⃣ Fetch Student's Resume
-    # Hmm check karenge ki kya is student ne resume upload kiya hai?
-    resume = db.query(Resume).filter(
-        Resume.student_id == current_user.id
-    ).first()
+    resume, has_jobs = await run_in_threadpool(_resume_and_jobs, db, current_user.id)
 
     # Agar resume hi nahi hai toh recommendation kis basis par denge? Error handle kiya.
     if not resume or not resume.extracted_text:
@@ -40,35 +55,20 @@ def recommend_jobs_for_student(
             detail="Bhai, pehle apna resume upload karo! (Resume not found or empty)"
         )
 
-    # 2️⃣ Fetch All Jobs
-    # Match karne ke liye saare jobs fetch karte hain.
-    # Note: Kaafi jobs ho toh pagination ya limit (ex: limit 100) lagana chahiye productivity ke liye.
-    jobs = db.query(Job).all()
-
-    if not jobs:
+    if not has_jobs:
         return {"message": "Abhi koi jobs available nahi hain matching ke liye.", "recommended_jobs": []}
 
-    # 3️⃣ Format Data for ML Logic
-    # ML function ko list of dicts chahiye (Fast reading/processing ke liye dictionary best hai memory me)
-    job_data = [
-        {
-            "id": job.id,
-            "title": job.title,
-            "description": job.description,
-            "skills_required": job.skills_required
-        }
-        for job in jobs
-    ]
-
-    # 4️⃣ Call ML Recommendation Engine
-    # 🧠 Yahan real logic call ho raha hai!
-    recommendations = recommend_jobs(
-        resume_text=resume.extracted_text,
-        jobs=job_data,
-        top_n=5 # Top 5 jobs dikhate hain user ko standard UI ke liye
+    # 3️⃣ Call ML Recommendation Engine
+    # 🧠 Yahan real logic call ho raha hai! Sirf ek sparse mat-vec.
+    # Resume ke term counts upload pe hi store ho chuke hain (resume_features), dobara tokenize nahi karna padta.
+    # Result cache: same resume + same job corpus version => seedha cached answer.
+    # Miss hone pe scoring ML process pool me chalti hai (await), taaki baaki API block na ho.
+    recommendations = await cached_result_async(
+        db, "recommend", (resume.extracted_text,),
+        lambda: run_ml(recommend_jobs_task, current_user.id, top_n=5), # Top 5 jobs dikhate hain user ko standard UI ke liye
     )
 
-    # 5️⃣ Final Response
+    # 4️⃣ Final Response
     return {
         "student_id": current_user.id,
         "student_name": current_user.full_name,
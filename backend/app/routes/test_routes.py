@@ -7,9 +7,20 @@ import random
 from app.database import get_db
 from app.models import Test, TestResult, User, StudentProfile
 from app.core.dependencies import teacher_only, get_current_user
+from app.utils.skill_matcher import compile_skills
 
 router = APIRouter()
 
+# Keyword groups used to pick an assessment track from the student's skills.
+AIML_KEYWORDS = ["ml", "ai", "machine learning", "deep learning", "nlp", "computer vision"]
+WEB_KEYWORDS = ["web", "html", "css", "js", "react", "node", "frontend", "backend"]
+DATA_KEYWORDS = ["sql", "pandas", "data", "tableau", "bi", "analytics"]
+
+# One compiled automaton for all groups: a single pass over the skills string instead of one scan per keyword.
+# Substring semantics on purpose (same votes as the old `any(k in skills ...)`): "mysql"/"postgresql" count
+# as "sql" and "reactjs"/"nodejs" as "react"/"node".
+TRACK_MATCHER = compile_skills(tuple(AIML_KEYWORDS + WEB_KEYWORDS + DATA_KEYWORDS), whole_words=False)
+
 # ----------------- TEACHER ENDPOINTS -----------------
 
 @router.post("/teacher/generate-test/{student_id}")
@@ -20,13 +31,14 @@ def generate_test(student_id: int, db: Session = Depends(get_db), current_user:
     
     profile = db.query(StudentProfile).filter(StudentProfile.user_id == student_id).first()
     skills = profile.technical_skills.lower() if profile and profile.technical_skills else ""
+    skill_hits = TRACK_MATCHER.find(skills)
     
     # Logic to determine category based on skills
     title = "Technical Assessment"
     questions = []
     
     # Categories: AIML, Web Dev, Data Science
-    if any(k in skills for k in ["ml", "ai", "machine learning", "deep learning", "nlp", "computer vision"]):
+    if skill_hits.intersection(AIML_KEYWORDS):
         title = "AI/ML & Python Technical Assessment"
         questions = [
             {"q": "What is the primary difference between Supervised and Unsupervised Learning?", "options": ["Supervised uses labeled data", "Unsupervised is faster", "Supervised doesn't need data", "No difference"], "correct": 0},
@@ -35,7 +47,7 @@ def generate_test(student_id: int, db: Session = Depends(get_db), current_user:
             {"q": "What is an epoch in ML?", "options": ["One pass through the entire dataset", "One batch of data", "One single iteration", "The final accuracy score"], "correct": 0},
             {"q": "Which algorithm is used for classification?", "options": ["Linear Regression", "Logistic Regression", "K-Means", "PCA"], "correct": 1}
         ]
-    elif any(k in skills for k in ["web", "html", "css", "js", "react", "node", "frontend", "backend"]):
+    elif skill_hits.intersection(WEB_KEYWORDS):
         title = "Web Development (Full Stack) Assessment"
         questions = [
             {"q": "What does a 'closure' in JavaScript do?", "options": ["Closes the browser window", "Allows internal functions to access variables of parent scope", "Ends a loop", "Cleans the memory"], "correct": 1},
@@ -44,7 +56,7 @@ def generate_test(student_id: int, db: Session = Depends(get_db), current_user:
             {"q": "What does 'semantic HTML' mean?", "options": ["Using tags that describe their content", "Using only <div> and <span>", "HTML with CSS", "HTML with AI"], "correct": 0},
             {"q": "Which CSS property is used for layouts?", "options": ["margin", "flexbox", "padding", "border"], "correct": 1}
         ]
-    elif any(k in skills for k in ["sql", "pandas", "data", "tableau", "bi", "analytics"]):
+    elif skill_hits.intersection(DATA_KEYWORDS):
         title = "Data Science & SQL Analytics Assessment"
         questions = [
             {"q": "Which SQL keyword is used to sort results?", "options": ["SORT", "ORDER BY", "GROUP BY", "ASC"], "correct": 1},
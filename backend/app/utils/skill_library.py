@@ -1,3 +1,5 @@
+import hashlib
+
 # 📚 SKILL_RESOURCES: Ye ek choti dictionary hai jo skills ke resources (YouTube aur Courses link) ko store krti hai.
 # Agar kisi student ka skill missing hoga, to hum automatically ye links unko frontend par dikha denge.
 # Ise app manually easily badha sakte hain bina DB update kiye!
@@ -20,3 +22,49 @@ SKILL_RESOURCES = {
         "youtube": "https://www.youtube.com/watch?v=Gv9_4yMHFhI"
     }
 }
+
+# Skill→Course mapping (Internal, no external API calls for logic)
+SKILL_COURSE_MAP = {
+    "docker":       {"name": "Docker for Beginners",        "link": "https://www.udemy.com/course/docker-and-kubernetes-the-complete-guide/", "tag": "Udemy"},
+    "kubernetes":   {"name": "Kubernetes Mastery",          "link": "https://www.udemy.com/course/kubernetesmastery/",              "tag": "Udemy"},
+    "python":       {"name": "Python Bootcamp",             "link": "https://www.udemy.com/course/complete-python-bootcamp/",          "tag": "Udemy"},
+    "react":        {"name": "React - The Complete Guide",  "link": "https://www.udemy.com/course/react-the-complete-guide-incl-redux/", "tag": "Udemy"},
+    "javascript":   {"name": "JavaScript Full Course",      "link": "https://www.youtube.com/watch?v=PkZNo7MFNFg",                     "tag": "YouTube"},
+    "machine learning": {"name": "ML A-Z by Andrew Ng",    "link": "https://www.coursera.org/learn/machine-learning",                "tag": "Coursera"},
+    "ml":           {"name": "Machine Learning A-Z Udemy",  "link": "https://www.udemy.com/course/machinelearning/",                   "tag": "Udemy"},
+    "deep learning": {"name": "Deep Learning Specialization","link": "https://www.coursera.org/specializations/deep-learning",        "tag": "Coursera"},
+    "tensorflow":   {"name": "TensorFlow Tutorials",        "link": "https://www.tensorflow.org/tutorials",                           "tag": "Docs"},
+    "fastapi":      {"name": "FastAPI Full Course",          "link": "https://www.youtube.com/watch?v=7t2alSnE2-I",                    "tag": "YouTube"},
+    "sql":          {"name": "SQL & PostgreSQL Bootcamp",   "link": "https://www.udemy.com/course/sql-and-postgresql/",               "tag": "Udemy"},
+    "postgresql":   {"name": "PostgreSQL Tutorial",         "link": "https://www.youtube.com/watch?v=qw--VYLpxG4",                    "tag": "YouTube"},
+    "git":          {"name": "Git & GitHub Crash Course",   "link": "https://www.youtube.com/watch?v=RGOj5yH7evk",                    "tag": "YouTube"},
+    "aws":          {"name": "AWS Cloud Practitioner",      "link": "https://www.udemy.com/course/aws-certified-cloud-practitioner-new/", "tag": "Udemy"},
+    "java":         {"name": "Java Programming Masterclass", "link": "https://www.udemy.com/course/java-the-complete-java-developer-course/", "tag": "Udemy"},
+    "c++":          {"name": "C++ Complete Guide",          "link": "https://www.udemy.com/course/the-complete-cpp-masterclass/",     "tag": "Udemy"},
+    "nlp":          {"name": "NLP with Python",             "link": "https://www.udemy.com/course/nlp-natural-language-processing-with-python/", "tag": "Udemy"},
+    "opencv":       {"name": "OpenCV Python",               "link": "https://www.youtube.com/watch?v=kdLM6AOd2vc",                    "tag": "YouTube"},
+    "data science": {"name": "Data Science Bootcamp",       "link": "https://www.udemy.com/course/the-data-science-course-complete-data-science-bootcamp/", "tag": "Udemy"},
+    "flask":        {"name": "Flask Web Development",       "link": "https://www.udemy.com/course/python-and-flask-bootcamp-create-websites-using-flask/", "tag": "Udemy"},
+    "node":         {"name": "Node.js Complete Course",     "link": "https://www.udemy.com/course/the-complete-nodejs-developer-course-2/", "tag": "Udemy"},
+    "typescript":   {"name": "TypeScript Course",           "link": "https://www.udemy.com/course/understanding-typescript/",          "tag": "Udemy"},
+    "excel":        {"name": "Microsoft Excel Mastery",     "link": "https://www.udemy.com/course/microsoft-excel-2013-from-beginner-to-advanced-and-beyond/", "tag": "Udemy"},
+    "communication":{"name": "Communication Skills",        "link": "https://www.coursera.org/learn/communication-skills",            "tag": "Coursera"},
+    "leadership":   {"name": "Leadership & Management",     "link": "https://www.coursera.org/learn/leadership-healthcare",           "tag": "Coursera"},
+}
+
+# Skills we can detect in resumes but have no course link for yet.
+EXTRA_SKILLS = [
+    "django", "mongodb", "redis", "linux", "bash", "html", "css",
+    "vue", "angular", "scala", "spark", "hadoop", "tableau", "power bi",
+    "figma", "photoshop", "agile", "scrum", "ci/cd", "jenkins", "terraform",
+]
+
+# Every skill the platform recognises (course map + extras + resource library), de-duplicated in order.
+ALL_SKILLS = list(dict.fromkeys(list(SKILL_COURSE_MAP.keys()) + EXTRA_SKILLS + list(SKILL_RESOURCES.keys())))
+
+# Bump when the matching rules themselves change (e.g. substring -> word-boundary matching).
+MATCHER_REVISION = 2
+
+# 🏷️ TAXONOMY_VERSION: Skill list ka fingerprint. Stored resume features isi version ke saath save hote hain,
+# toh upar koi bhi skill add/remove karo, purane resumes ke skills agli read pe automatically recompute ho jayenge.
+TAXONOMY_VERSION = hashlib.sha1(f"{MATCHER_REVISION}|{'|'.join(sorted(ALL_SKILLS))}".encode()).hexdigest()[:12]
@@ -1,19 +1,130 @@
-from app.utils.skill_library import SKILL_RESOURCES
+from collections import deque
+from functools import lru_cache
 
-# 🧠 analyze_skills function: Ye function PDF se nikla text leta hai aur job me maange skills ko match krta hai (without heavy ML model, memory bachane k liye bas basic string match)
+from app.utils.skill_library import SKILL_RESOURCES, ALL_SKILLS
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase + collapse whitespace/newlines, so 'Machine\nLearning' still matches 'machine learning'."""
+    return " ".join(text.lower().split())
+
+
+# ⚙️ SkillAutomaton: Aho-Corasick automaton jo saare skills ek saath dhundhta hai - text pe sirf ek pass.
+# Pehle har skill ke liye alag `skill in text` chalta tha (O(skills x text)) aur "ml" ko "html" ke andar
+# bhi match kar deta tha. Ab match sirf word boundary pe accept hota hai
+# (whole_words=False keeps plain substring semantics, for callers that relied on `k in text`).
+class SkillAutomaton:
+    def __init__(self, patterns, whole_words: bool = True):
+        self.whole_words = whole_words
+        self.names = []       # Original spelling, returned to callers
+        self.lengths = []
+        self.left_word = []   # Does the pattern start/end with a word char? (only then a boundary is required)
+        self.right_word = []
+
+        goto = [{}]
+        out = [[]]
+        for name in patterns:
+            key = normalize_text(name)
+            if not key:
+                continue
+            pattern_id = len(self.names)
+            self.names.append(name)
+            self.lengths.append(len(key))
+            self.left_word.append(_is_word_char(key[0]))
+            self.right_word.append(_is_word_char(key[-1]))
+
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pattern_id)
+
+        # Failure links (BFS). Outputs are folded along the failure chain at build time,
+        # so matching only has to look at out[state].
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+
+    def find(self, text: str) -> set:
+        """Returns the set of patterns (original spelling) found in text (on word boundaries if whole_words)."""
+        if not text or not self.names:
+            return set()
+        text = normalize_text(text)
+        goto, fail, out = self.goto, self.fail, self.out
+        n = len(text)
+        hits = set()
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for pattern_id in out[state]:
+                if pattern_id in hits:
+                    continue
+                if not self.whole_words:
+                    hits.add(pattern_id)
+                    continue
+                start = i - self.lengths[pattern_id] + 1
+                if self.left_word[pattern_id] and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if self.right_word[pattern_id] and i + 1 < n and _is_word_char(text[i + 1]):
+                    continue
+                hits.add(pattern_id)
+        return {self.names[p] for p in hits}
+
+
+@lru_cache(maxsize=256)
+def compile_skills(patterns: tuple, whole_words: bool = True) -> SkillAutomaton:
+    """Compiled automaton per distinct skill list (job skill strings repeat a lot, so cache them)."""
+    return SkillAutomaton(patterns, whole_words)
+
+
+# Shared automaton for the whole platform taxonomy (course map + extras + resource library).
+SKILL_AUTOMATON = compile_skills(tuple(ALL_SKILLS))
+
+
+def extract_skills_from_text(text: str) -> list[str]:
+    """Extract known skills from text in a single pass of the shared skill automaton."""
+    return list(SKILL_AUTOMATON.find(text))
+
+
+# 🧠 analyze_skills function: Ye function PDF se nikla text leta hai aur job me maange skills ko match krta hai (without heavy ML model, memory bachane k liye bas automaton match)
 def analyze_skills(resume_text: str, job_skills: str):
-    # Dono strings ko lower() karte hain taki 'Python' aur 'python' match ho jaye easily.
-    resume_text = resume_text.lower()
-    
     # job_skills string (ex "Python, FastAPI") ko array me split krta hai comma se, aur spaces trim krdeta hai strip()
-    job_skill_list = [s.strip().lower() for s in job_skills.split(",")]
+    # Khaali entries (ex: trailing comma) skip, warna woh bhi "skill" gine jaate.
+    job_skill_list = [s.strip().lower() for s in job_skills.split(",") if s.strip()]
 
     matched = [] # Jo skills mil gye
     missing = [] # Jo skills resume mein nai mile
 
-    # Har required skill ko dhundhte hain Resume text ke andar manually
+    # Saare required skills ek hi pass me Resume text ke andar dhundhte hain (case-insensitive, word boundary)
+    found = compile_skills(tuple(job_skill_list)).find(resume_text)
     for skill in job_skill_list:
-        if skill in resume_text:
+        if skill in found:
             matched.append(skill)
         else:
             missing.append(skill)
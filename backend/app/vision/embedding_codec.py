@@ -0,0 +1,121 @@
+import json
+import struct
+
+import numpy as np
+
+# 🧬 Face Embedding Codec
+# Embeddings used to be stored as JSON text (~2.5 KB for 128 floats) and parsed row by row with json.loads.
+# Binary layout instead: a fixed 16-byte header + raw little-endian float32 values (128 dims = 528 bytes).
+#
+#   bytes 0-1   magic b"FE"
+#   byte  2     format version (1)
+#   byte  3     reserved (0)
+#   bytes 4-7   dim (uint32, little-endian)
+#   bytes 8-15  model name, ASCII, NUL padded (e.g. b"Facenet\0")
+#
+# The header is 16 bytes = 4 float32 slots, so a batch of same-shape blobs can be joined and read with
+# ONE np.frombuffer: reshape to (n, 4 + dim) and drop the first 4 columns.
+
+MAGIC = b"FE"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<2sBxI8s")
+HEADER_SIZE = HEADER.size # 16
+
+
+def _model_tag(model_name: str) -> bytes:
+    return model_name.encode("ascii", "ignore")[:8]
+
+
+def pack_embedding(vector, model_name: str) -> bytes:
+    """Vector (list / ndarray) -> header + float32 bytes."""
+    values = np.asarray(vector, dtype="<f4").ravel()
+    return HEADER.pack(MAGIC, FORMAT_VERSION, values.shape[0], _model_tag(model_name)) + values.tobytes()
+
+
+def read_header(blob: bytes):
+    """Returns (dim, model_name) or None if the blob isn't a valid embedding."""
+    if blob is None or len(blob) < HEADER_SIZE:
+        return None
+    magic, version, dim, tag = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != FORMAT_VERSION or len(blob) != HEADER_SIZE + 4 * dim:
+        return None
+    return dim, tag.rstrip(b"\0").decode("ascii", "ignore")
+
+
+def unpack_embedding(blob: bytes):
+    """Single blob -> float32 vector (read-only view, no copy), or None if invalid."""
+    header = read_header(blob)
+    if header is None:
+        return None
+    return np.frombuffer(blob, dtype="<f4", offset=HEADER_SIZE)
+
+
+def unpack_batch(blobs, model_name: str):
+    """
+    Decodes many blobs at once. Only blobs of `model_name` with the batch's dimension are kept
+    (dimension of the first valid blob).
+
+    Returns:
+        tuple: (indices into `blobs` that were decoded, float32 matrix (len(indices) x dim)).
+    """
+    expected_header = None
+    keep = []
+    for i, blob in enumerate(blobs):
+        if blob is None:
+            continue
+        blob = bytes(blob) # memoryview from some DB drivers
+        if expected_header is None:
+            header = read_header(blob)
+            if header is None or header[1] != _model_tag(model_name).decode("ascii"):
+                continue
+            expected_header, expected_len = blob[:HEADER_SIZE], len(blob)
+        if len(blob) == expected_len and blob[:HEADER_SIZE] == expected_header:
+            keep.append((i, blob))
+    if not keep:
+        return [], np.empty((0, 0), dtype=np.float32)
+
+    dim = (expected_len - HEADER_SIZE) // 4
+    joined = np.frombuffer(b"".join(blob for _, blob in keep), dtype="<f4")
+    matrix = joined.reshape(len(keep), 4 + dim)[:, 4:].astype(np.float32)
+    return [i for i, _ in keep], matrix
+
+
+def migrate_json_embeddings(engine, model_name: str = "Facenet", batch_size: int = 500) -> int:
+    """
+    Idempotent migration: adds face_embeddings.embedding (binary) if missing and converts rows that still
+    only have embedding_json. JSON text is cleared once a row is converted (that's the storage win);
+    rows whose JSON can't be parsed are reported and left as they are. Returns the number of converted rows.
+    """
+    from sqlalchemy import inspect, text
+    from sqlalchemy.types import LargeBinary
+
+    columns = {c["name"] for c in inspect(engine).get_columns("face_embeddings")}
+    if "embedding" not in columns:
+        binary_type = LargeBinary().compile(dialect=engine.dialect) # BYTEA on Postgres, BLOB on SQLite
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE face_embeddings ADD COLUMN embedding {binary_type}"))
+        print("Face Embeddings: binary 'embedding' column added.")
+
+    converted, after = 0, 0
+    while True:
+        with engine.begin() as conn:
+            # Keyset pagination on id: unreadable rows are skipped (and left untouched) instead of re-read forever.
+            rows = conn.execute(text(
+                "SELECT id, embedding_json FROM face_embeddings "
+                "WHERE id > :after AND embedding IS NULL AND embedding_json IS NOT NULL ORDER BY id LIMIT :n"
+            ), {"after": after, "n": batch_size}).fetchall()
+            if not rows:
+                break
+            for row_id, raw in rows:
+                after = row_id
+                try:
+                    blob = pack_embedding(json.loads(raw), model_name)
+                except Exception as e:
+                    print(f"Face Embeddings Migration Warning: row {row_id} skipped ({e})")
+                    continue
+                conn.execute(text("UPDATE face_embeddings SET embedding = :b, embedding_json = NULL WHERE id = :i"),
+                             {"b": blob, "i": row_id})
+                converted += 1
+    if converted:
+        print(f"Face Embeddings: {converted} JSON rows converted to float32 binary.")
+    return converted
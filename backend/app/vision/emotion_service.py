@@ -1,6 +1,8 @@
 # from deepface import DeepFace # Moved inside to prevent hang
 import cv2
 
+from .frame_context import as_context
+
 # 😊 Emotion Detection Service - Module 2
 # Purpose: Analyze facial expressions to identify emotions (e.g., Happy, Sad, Angry).
 # DeepFace provides a pre-built Emotion model which is ready-to-use.
@@ -11,15 +13,19 @@ class EmotionService:
         # It's better than manual loading via Keras (Memory optimized).
         self.actions = ['emotion']
 
-    def analyze_emotion(self, frame_bgr):
+    def analyze_emotion(self, frame):
         """
         AI-driven analysis of the input frame to determine the 'Dominant Emotion'.
+        `frame` is a FrameContext (or raw BGR frame): the largest cached face box is classified directly,
+        so DeepFace doesn't run a detector of its own.
         """
         try:
             from deepface import DeepFace
-            # Enforce detection = False: Analyze the entire frame for performance (Fast).
-            # Detector backend = 'opencv': Minimal resource footprint for 4GB RAM configurations.
-            results = DeepFace.analyze(img_path=frame_bgr, actions=self.actions, enforce_detection=False, detector_backend='opencv')
+            ctx = as_context(frame)
+            # No face box: analyze the entire frame, as before (enforce_detection=False behaviour).
+            img = ctx.face_crop(ctx.faces[0]) if ctx.faces else ctx.image
+            # Detector backend = 'skip': the box comes from FrameContext (one Haar pass shared by all services).
+            results = DeepFace.analyze(img_path=img, actions=self.actions, enforce_detection=False, detector_backend='skip')
             
             if results and len(results) > 0:
                 # Extract the primary emotion from results.
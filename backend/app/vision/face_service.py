@@ -2,22 +2,150 @@ import cv2
 import numpy as np
 # from deepface import DeepFace  # Moved inside methods to prevent hang
 import json
+import threading
+import time
+
+from ..config import settings
+from .shared_face_store import TOMBSTONE
 
 # Face Service - Face Recognition via DeepFace only
 # Removed mediapipe dependency since newer mediapipe removed .solutions API
 
 # Face Service - Optimized for Performance
 # Singleton pattern avoids multiple model loads.
+# Embedding cache: one contiguous, pre-normalized float32 matrix + parallel row_ids/user_ids arrays.
+# 1:N search is a single BLAS mat-vec over matrix[:size]; capacity grows by doubling, so appends are amortized O(1).
+# Enrollment patches only the affected rows (add/remove/replace); sync() reconciles with the DB by id diff
+# whenever the shared 'faces' corpus version moves (other workers) or every FACE_CACHE_RECONCILE_SECONDS.
+# With FACE_SHARED_STORE_DIR set, matrix/row_ids/user_ids are views of a SharedFaceStore mapping instead:
+# one copy for all workers, enrollments appended by any worker are visible to the others on their next search.
+# Past FACE_ANN_MIN_ROWS, 1:N search goes through an IVF index (IVFIndex) instead of scanning every row.
+
+class IVFIndex:
+    """
+    Inverted-file ANN index (IVF-Flat) over FaceService matrix positions, for 1:N search at 100k+ rows.
+    Coarse stage: spherical k-means centroids; every row is filed under its nearest centroid.
+    Search probes the `nprobe` closest lists and re-ranks their rows EXACTLY against the float32 matrix,
+    so a reported distance is the same number brute force computes - only recall is approximate.
+    Inserts are incremental (nearest centroid); removals/moves are O(1) via the slot array.
+    """
+
+    KMEANS_ITERS = 10
+    SAMPLE_PER_LIST = 64 # k-means trains on at most nlist * 64 rows
+
+    def __init__(self):
+        self.centroids = None # (nlist x dim) float32, L2-normalized
+        self.trained_size = 0 # Rows the centroids were trained on (retrain after 4x growth)
+        self.lists = [] # Per list: int64 positions, grown by doubling
+        self.counts = None # Used length of each list
+        self.assign = np.empty(0, dtype=np.int32) # List of each matrix position
+        self.slot = np.empty(0, dtype=np.int64) # Index of each position inside its list
+        self.size = 0 # Positions [0, size) are filed
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors, nlist: int, seed: int = 0, total: int = None):
+        """k-means on `vectors` (or a sample of them). `total`: rows they were sampled from (default: all of them)."""
+        n = vectors.shape[0]
+        nlist = max(1, min(nlist, n))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, min(n, nlist * self.SAMPLE_PER_LIST), replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+        for _ in range(self.KMEANS_ITERS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids[present] = sums / np.where(norms > 0, norms, 1) # Empty lists keep their old centroid
+        self.centroids = centroids.astype(np.float32)
+        self.trained_size = total or n
+        self.clear()
+
+    def clear(self):
+        """Forget every filed position (centroids are kept)."""
+        nlist = 0 if self.centroids is None else self.centroids.shape[0]
+        self.lists = [np.empty(16, dtype=np.int64) for _ in range(nlist)]
+        self.counts = np.zeros(nlist, dtype=np.int64)
+        self.size = 0
+
+    def add(self, positions, vectors):
+        """Files matrix positions (with their normalized vectors) under the nearest centroid."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.size == 0:
+            return
+        needed = int(positions.max()) + 1
+        if needed > self.assign.shape[0]:
+            capacity = max(needed, 2 * self.assign.shape[0])
+            self.assign = np.resize(self.assign, capacity)
+            self.slot = np.resize(self.slot, capacity)
+        labels = np.argmax(vectors @ self.centroids.T, axis=1)
+        order = np.argsort(labels, kind="stable")
+        present, starts = np.unique(labels[order], return_index=True)
+        for label, chunk in zip(present.tolist(), np.split(positions[order], starts[1:])):
+            count = int(self.counts[label])
+            lst = self.lists[label]
+            if count + chunk.size > lst.shape[0]:
+                lst = self.lists[label] = np.resize(lst, max(2 * lst.shape[0], count + chunk.size))
+            lst[count:count + chunk.size] = chunk
+            self.assign[chunk] = label
+            self.slot[chunk] = np.arange(count, count + chunk.size)
+            self.counts[label] = count + chunk.size
+
+    def remove(self, pos: int):
+        label, s = int(self.assign[pos]), int(self.slot[pos])
+        last = int(self.counts[label]) - 1
+        moved = int(self.lists[label][last])
+        self.lists[label][s] = moved
+        self.slot[moved] = s
+        self.counts[label] = last
+
+    def move(self, src: int, dst: int):
+        """Matrix row src was copied to dst (swap-remove): re-point its list entry."""
+        label, s = int(self.assign[src]), int(self.slot[src])
+        self.lists[label][s] = dst
+        self.assign[dst] = label
+        self.slot[dst] = s
+
+    def candidates(self, v_query, nprobe: int):
+        """Positions filed under the nprobe centroids closest to the query."""
+        nlist = self.centroids.shape[0]
+        nprobe = max(1, min(nprobe, nlist))
+        closeness = self.centroids @ v_query
+        probes = np.argpartition(-closeness, nprobe - 1)[:nprobe] if nprobe < nlist else range(nlist)
+        return np.concatenate([self.lists[p][:self.counts[p]] for p in probes])
+
 
 class FaceService:
     _instance = None
 
+    MIN_CAPACITY = 64
+    DETECTORS = ("opencv", "mtcnn") # Fastest first; mtcnn only when opencv sees nothing
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(FaceService, cls).__new__(cls)
             cls._instance.model_name = "Facenet"
             cls._instance.built = False
-            cls._instance.cache = {} # {id: {"user_id": uid, "embedding": np_array}}
+            cls._instance._lock = threading.Lock()
+            cls._instance._local = threading.local() # Per-thread score buffer (no allocation per search)
+            cls._instance.dim = None # Embedding length, fixed by the first vector (Facenet = 128)
+            cls._instance.size = 0 # Rows in use; rows >= size are free capacity
+            cls._instance.matrix = np.empty((0, 0), dtype=np.float32) # (capacity x dim), rows L2-normalized
+            cls._instance.row_ids = np.empty(0, dtype=np.int64) # FaceEmbedding.id per row
+            cls._instance.user_ids = np.empty(0, dtype=np.int64) # FaceEmbedding.user_id per row
+            cls._instance.pos_of = {} # {FaceEmbedding.id: row}
+            cls._instance.user_rows = {} # {user_id: {FaceEmbedding.id, ...}} -> 1:1 checks in O(user's enrollments)
+            cls._instance.warmed = False
+            cls._instance.synced_version = None # DB 'faces' CorpusVersion the cache reflects
+            cls._instance.synced_at = 0.0
+            cls._instance.store = None # SharedFaceStore, created on first use when FACE_SHARED_STORE_DIR is set
+            cls._instance.store_checked = False
+            cls._instance._store_seen = None # (generation, removals) the pos_of/user_rows index was built from
+            cls._instance.ann = IVFIndex() # Only trained/used when size >= FACE_ANN_MIN_ROWS
+            cls._instance._ann_training = False # A (re)train is running (warm_cache / sync / background thread)
         return cls._instance
 
     def build(self, db=None):
@@ -37,100 +165,572 @@ class FaceService:
     def warm_cache(self, db):
         """Pre-load all embeddings from DB into memory for INSTANT matching."""
         from ..models import FaceEmbedding
-        embeddings = db.query(FaceEmbedding).all()
-        self.cache = {}
-        for entry in embeddings:
+        from ..ml.result_cache import get_corpus_version
+        version = get_corpus_version(db, "faces") # Read first: a bump during the load triggers a later sync
+        store = self._shared_store()
+        if store is not None:
+            with self._lock, store.lock():
+                # Only the first worker (or one that finds the store behind the DB) decodes; the rest just map it.
+                if not store.attached or store.db_version != version:
+                    row_ids, user_ids, vectors = self._decode(db.query(*self._columns(FaceEmbedding)).all())
+                    self._reset()
+                    prepared = self._prepare_rows(row_ids, user_ids, vectors)
+                    row_ids, user_ids, block = prepared or ([], [], np.empty((0, self.dim or 0), dtype=np.float32))
+                    store.rebuild(self.dim or 0, row_ids, user_ids, block, version)
+                    print(f"Face Shared Store rebuilt from DB: {len(row_ids)} rows.")
+                self._refresh_from_store()
+        else:
+            row_ids, user_ids, vectors = self._decode(db.query(*self._columns(FaceEmbedding)).all())
+            with self._lock:
+                self._reset()
+                self._append_rows(row_ids, user_ids, vectors)
+        self.train_ann() # Train now (startup) rather than on the first login
+        self.warmed = True
+        self.synced_version = version
+        self.synced_at = time.monotonic()
+        print(f"Face Cache Pre-Normalized: {len(self.pos_of)} vectors/IDs mapped!")
+
+    def sync(self, db, force: bool = False):
+        """
+        Cheap catch-up with the face_embeddings table. Only when the 'faces' version moved (or the
+        reconcile interval passed) it diffs ids - no JSON decode - and decodes just the new rows.
+        """
+        if not self.warmed:
+            self.warm_cache(db)
+            return
+        from ..models import FaceEmbedding
+        from ..ml.result_cache import get_corpus_version
+        version = get_corpus_version(db, "faces")
+        now = time.monotonic()
+        store = self._shared_store()
+        synced_version = self.synced_version
+        if store is not None:
+            with self._lock:
+                self._refresh_from_store()
+                synced_version = store.db_version if store.attached else None # One worker reconciles for all
+        if not force and version == synced_version and now - self.synced_at < settings.FACE_CACHE_RECONCILE_SECONDS:
+            self._schedule_ann_training() # Shared store: other workers' appends may have made a (re)train due
+            return
+
+        db_ids = {rid for (rid,) in db.query(FaceEmbedding.id).all()}
+        if store is not None:
+            stale, missing = self._reconcile_store(db, store, db_ids, version)
+        else:
+            with self._lock:
+                cached_ids = set(self.pos_of)
+            stale, missing = cached_ids - db_ids, db_ids - cached_ids
+            if stale:
+                self.remove_rows(stale)
+            if missing:
+                row_ids, user_ids, vectors = self._decode(self._fetch(db, missing))
+                with self._lock:
+                    self._append_rows(row_ids, user_ids, vectors)
+        if stale or missing:
+            print(f"Face Cache Reconciled: +{len(missing)} / -{len(stale)} rows.")
+        self.synced_version = version
+        self.synced_at = now
+        self._schedule_ann_training() # Other workers' enrollments may have crossed FACE_ANN_MIN_ROWS / 4x growth
+
+    def _reconcile_store(self, db, store, db_ids, version):
+        """sync() for the shared store: id diff against its live rows, under the store's write lock."""
+        with self._lock, store.lock():
+            self._refresh_from_store()
+            cached_ids = set(self.pos_of)
+            stale, missing = cached_ids - db_ids, db_ids - cached_ids
+            if stale and store.attached:
+                store.remove(stale)
+            if missing:
+                self._store_append(store, *self._decode(self._fetch(db, missing)))
+            if store.attached:
+                store.db_version = version
+            self._refresh_from_store()
+        return stale, missing
+
+    def _fetch(self, db, row_ids):
+        from ..models import FaceEmbedding
+        return db.query(*self._columns(FaceEmbedding)).filter(FaceEmbedding.id.in_(row_ids)).all()
+
+    @staticmethod
+    def _columns(FaceEmbedding):
+        # Plain column tuples (no ORM objects); embedding_json only matters for rows not migrated yet
+        return FaceEmbedding.id, FaceEmbedding.user_id, FaceEmbedding.embedding, FaceEmbedding.embedding_json
+
+    def _decode(self, entries):
+        """Binary rows are decoded in one np.frombuffer; legacy JSON rows fall back to json.loads."""
+        from .embedding_codec import unpack_batch
+        decoded, matrix = unpack_batch([entry.embedding for entry in entries], self.model_name)
+        row_ids = [entries[i].id for i in decoded]
+        user_ids = [entries[i].user_id for i in decoded]
+        vectors = list(matrix)
+
+        done = set(decoded)
+        for i, entry in enumerate(entries):
+            if i in done or entry.embedding_json is None:
+                continue
             try:
-                vec = np.array(json.loads(entry.embedding_json))
-                # Pre-normalize for instant dot product usage later
-                norm = np.linalg.norm(vec)
-                if norm > 0:
-                    vec = vec / norm
-                self.cache[entry.id] = {"user_id": entry.user_id, "embedding": vec}
-            except:
-                pass
-        print(f"Face Cache Pre-Normalized: {len(self.cache)} vectors/IDs mapped!")
+                vectors.append(np.asarray(json.loads(entry.embedding_json), dtype=np.float32))
+                row_ids.append(entry.id)
+                user_ids.append(entry.user_id)
+            except (ValueError, TypeError, json.JSONDecodeError) as e:
+                print(f"Face Cache Warning: embedding {entry.id} has unreadable legacy JSON, skipped ({e}).")
+        return row_ids, user_ids, vectors
+
+    # Incremental cache edits: cost depends on the rows touched, not on the table size.
+
+    def add_embedding(self, row_id, user_id, vector, version: int = None):
+        """
+        Cache one freshly stored FaceEmbedding row (amortized O(1) append).
+        version: the 'faces' version bump_corpus_version returned for this commit (see _add_rows).
+        """
+        self._add_rows([row_id], [user_id], [np.asarray(vector, dtype=np.float32)], version)
+
+    def add_embeddings(self, row_ids, user_ids, vectors, version: int = None):
+        """Cache many freshly stored rows in one append (bulk enrollment)."""
+        self._add_rows(list(row_ids), list(user_ids), [np.asarray(v, dtype=np.float32) for v in vectors], version)
+
+    def _add_rows(self, row_ids, user_ids, vectors, version=None):
+        """
+        Appends rows this worker just committed. If their commit is the only change since the cache was last
+        in sync (version == synced + 1), the cache is in sync with `version` again: the next sync() skips the
+        id diff instead of scanning the table for a row it already has. Anything else waits for sync().
+        """
+        store = self._shared_store()
+        if store is None:
+            with self._lock:
+                self._append_rows(row_ids, user_ids, vectors)
+                if version is not None and self.synced_version == version - 1:
+                    self.synced_version = version
+        else:
+            with self._lock, store.lock():
+                self._store_append(store, row_ids, user_ids, vectors)
+                if version is not None and store.attached and store.db_version == version - 1:
+                    store.db_version = version # Shared: every worker's next sync() sees the store in sync
+                self._refresh_from_store()
+        self._schedule_ann_training()
+
+    def remove_rows(self, row_ids):
+        """Drop cached FaceEmbedding rows by id. Holes are filled with the last rows (O(rows removed))."""
+        store = self._shared_store()
+        if store is not None:
+            # Shared rows never move (other workers hold positions): zero + tombstone instead of swap-remove.
+            with self._lock, store.lock():
+                if store.attached:
+                    store.remove(row_ids)
+                self._refresh_from_store()
+            return
+        with self._lock:
+            self._ann_catch_up() # Every row filed -> swap-remove can patch the index in place
+            for row_id in row_ids:
+                pos = self.pos_of.pop(row_id, None)
+                if pos is None:
+                    continue
+                user_id = int(self.user_ids[pos])
+                owned = self.user_rows.get(user_id)
+                if owned is not None:
+                    owned.discard(row_id)
+                    if not owned:
+                        del self.user_rows[user_id]
+                last = self.size - 1
+                if self.ann.trained:
+                    self.ann.remove(pos)
+                    if pos != last:
+                        self.ann.move(last, pos)
+                    self.ann.size = last
+                if pos != last:
+                    self.matrix[pos] = self.matrix[last]
+                    self.row_ids[pos] = self.row_ids[last]
+                    self.user_ids[pos] = self.user_ids[last]
+                    self.pos_of[int(self.row_ids[pos])] = pos
+                self.size = last
+
+    def remove_user(self, user_id):
+        """Drop every cached embedding of one user."""
+        self._refresh_shared()
+        with self._lock:
+            row_ids = list(self.user_rows.get(user_id, ()))
+        self.remove_rows(row_ids)
+
+    def replace_user(self, user_id, entries):
+        """Swap a user's cached embeddings for the given [(row_id, vector)] (re-enrollment)."""
+        self.remove_user(user_id)
+        self._add_rows([rid for rid, _ in entries], [user_id] * len(entries),
+                       [np.asarray(v, dtype=np.float32) for _, v in entries])
+
+    def _reset(self):
+        self.dim = None
+        self.size = 0
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.row_ids = np.empty(0, dtype=np.int64)
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.pos_of = {}
+        self.user_rows = {}
+        self._store_seen = None
+        self.ann = IVFIndex()
+
+    def _ensure_capacity(self, needed):
+        """Doubles the backing arrays until `needed` rows fit (caller holds the lock)."""
+        capacity = self.matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(capacity, self.MIN_CAPACITY)
+        while new_capacity < needed:
+            new_capacity *= 2
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        row_ids = np.zeros(new_capacity, dtype=np.int64)
+        user_ids = np.zeros(new_capacity, dtype=np.int64)
+        if self.size:
+            matrix[:self.size] = self.matrix[:self.size]
+            row_ids[:self.size] = self.row_ids[:self.size]
+            user_ids[:self.size] = self.user_ids[:self.size]
+        self.matrix, self.row_ids, self.user_ids = matrix, row_ids, user_ids
+
+    def _prepare_rows(self, row_ids, user_ids, vectors):
+        """
+        Filters (wrong size / already cached) and L2-normalizes embeddings (caller holds the lock).
+        Returns (row_ids, user_ids, float32 block) of the rows to append, or None.
+        """
+        if self.dim is None and vectors:
+            self.dim = int(vectors[0].shape[0])
+        keep, seen = [], set()
+        for i, v in enumerate(vectors):
+            if v.ndim != 1 or v.shape[0] != self.dim:
+                continue
+            if row_ids[i] in self.pos_of or row_ids[i] in seen:
+                continue # Already cached (e.g. two requests reconciling at once)
+            seen.add(row_ids[i])
+            keep.append(i)
+        malformed = sum(1 for v in vectors if v.ndim != 1 or v.shape[0] != self.dim)
+        if malformed:
+            print(f"Face Cache Warning: {malformed} embeddings skipped (expected length {self.dim}).")
+        if not keep:
+            return None
+        block = np.stack([vectors[i] for i in keep]).astype(np.float32, copy=False)
+        # Pre-normalize for instant dot product usage later
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.where(norms > 0, norms, 1)
+        return [int(row_ids[i]) for i in keep], [int(user_ids[i]) for i in keep], block
+
+    def _append_rows(self, row_ids, user_ids, vectors):
+        """Normalizes and appends embeddings in place (caller holds the lock). Wrong-sized vectors are skipped."""
+        prepared = self._prepare_rows(row_ids, user_ids, vectors)
+        if prepared is None:
+            return
+        row_ids, user_ids, block = prepared
+        start, end = self.size, self.size + len(row_ids)
+        self._ensure_capacity(end)
+        self.matrix[start:end] = block
+        self.row_ids[start:end] = row_ids
+        self.user_ids[start:end] = user_ids
+        for offset, (row_id, user_id) in enumerate(zip(row_ids, user_ids)):
+            self.pos_of[row_id] = start + offset
+            self.user_rows.setdefault(user_id, set()).add(row_id)
+        self.size = end
+
+    # Shared store mode (FACE_SHARED_STORE_DIR)
+
+    def _shared_store(self):
+        """The SharedFaceStore this worker maps, or None when the per-process cache is used."""
+        if not self.store_checked:
+            self.store_checked = True
+            if settings.FACE_SHARED_STORE_DIR:
+                from .shared_face_store import SharedFaceStore, shared_store_supported
+                if shared_store_supported():
+                    self.store = SharedFaceStore(settings.FACE_SHARED_STORE_DIR)
+                else:
+                    print("Face Shared Store Warning: flock not available on this platform, using per-process cache.")
+        return self.store
+
+    def _refresh_shared(self):
+        """Shared store mode: pick up rows other workers published (no-op for the per-process cache)."""
+        if self._shared_store() is not None:
+            with self._lock:
+                self._refresh_from_store()
+
+    def _store_append(self, store, row_ids, user_ids, vectors):
+        """Appends to the shared store (caller holds self._lock and store.lock())."""
+        self._refresh_from_store() # pos_of must reflect every worker's rows for the duplicate check
+        prepared = self._prepare_rows(row_ids, user_ids, vectors)
+        if prepared is None:
+            return
+        row_ids, user_ids, block = prepared
+        if store.attached and store.dim == self.dim:
+            store.append(row_ids, user_ids, block)
+        else: # No store yet, or an empty one created before the first embedding fixed the dimension
+            store.rebuild(self.dim, row_ids, user_ids, block, store.db_version if store.attached else 0)
+
+    def _refresh_from_store(self):
+        """
+        Points matrix/row_ids/user_ids at the current mapping and indexes rows published since the last
+        call (caller holds the lock). A compaction or removal elsewhere means a full re-index.
+        """
+        store = self.store
+        state = store.refresh()
+        if state is None:
+            return
+        generation, removals, count = state
+        start = self.size
+        if self._store_seen != (generation, removals):
+            self.pos_of, self.user_rows, start = {}, {}, 0
+        if self._store_seen is None or self._store_seen[0] != generation:
+            self.ann.clear() # New file layout = new positions (removals alone keep positions; zero rows never match)
+        self.matrix, self.row_ids, self.user_ids = store.matrix, store.row_ids, store.user_ids
+        self.dim = store.dim or None
+        row_ids, user_ids = store.row_ids[start:count].tolist(), store.user_ids[start:count].tolist()
+        for offset, (row_id, user_id) in enumerate(zip(row_ids, user_ids)):
+            if user_id == TOMBSTONE:
+                continue
+            self.pos_of[row_id] = start + offset
+            self.user_rows.setdefault(user_id, set()).add(row_id)
+        self.size = count
+        self._store_seen = (generation, removals)
+
+    def _ann_train_due(self) -> bool:
+        """Cache crossed FACE_ANN_MIN_ROWS without an index, or grew 4x since the last training."""
+        min_rows = settings.FACE_ANN_MIN_ROWS
+        if not min_rows or self.size < min_rows or self._ann_training:
+            return False
+        return not self.ann.trained or self.size > 4 * self.ann.trained_size
+
+    def _schedule_ann_training(self):
+        """Starts train_ann in a background thread when due: requests never wait for k-means."""
+        if self._ann_train_due():
+            threading.Thread(target=self.train_ann, name="face-ann-train", daemon=True).start()
+
+    def train_ann(self):
+        """
+        (Re)trains the IVF index when due. Runs inline in warm_cache (startup) and in a background thread
+        after sync/enrollments noticed growth - never from a search. Only the k-means sample is copied under the lock; the fit itself
+        runs outside it, so searches go on (old index or brute force) until the new index is swapped in.
+        """
+        with self._lock:
+            if not self._ann_train_due():
+                return
+            self._ann_training = True
+            live = np.flatnonzero(self.user_ids[:self.size] != TOMBSTONE)
+            nlist = max(1, min(settings.FACE_ANN_NLIST or int(np.sqrt(live.size)), live.size))
+            rng = np.random.default_rng(0)
+            sample = self.matrix[rng.choice(live, min(live.size, nlist * IVFIndex.SAMPLE_PER_LIST), replace=False)]
+            dim = self.dim
+        try:
+            ann = IVFIndex()
+            started = time.perf_counter()
+            ann.train(sample, nlist, total=live.size)
+            with self._lock:
+                if self.dim == dim: # Cache not reset to another model meanwhile
+                    self.ann = ann
+                    self._ann_catch_up() # Files every current position (rows may have moved during the fit)
+            print(f"Face ANN Index trained: {ann.centroids.shape[0]} lists over {live.size} rows "
+                  f"in {time.perf_counter() - started:.2f}s")
+        finally:
+            self._ann_training = False
+
+    def _ann_search_index(self):
+        """The trained IVF index, caught up with appended rows (caller holds the lock), or None -> brute force."""
+        min_rows = settings.FACE_ANN_MIN_ROWS
+        if not min_rows or self.size < min_rows or not self.ann.trained:
+            return None
+        self._ann_catch_up()
+        return self.ann
+
+    def _ann_catch_up(self):
+        """Files rows appended since the index last looked (caller holds the lock)."""
+        ann = self.ann
+        if ann.trained and ann.size < self.size:
+            positions = np.arange(ann.size, self.size)
+            positions = positions[self.user_ids[ann.size:self.size] != TOMBSTONE]
+            ann.add(positions, self.matrix[positions])
+            ann.size = self.size
+
+    def _query_vector(self, current_vector):
+        v_query = np.asarray(current_vector, dtype=np.float32)
+        norm = np.linalg.norm(v_query)
+        if v_query.ndim != 1 or v_query.shape[0] != self.dim or norm == 0:
+            return None
+        return v_query / norm
 
     def get_embedding(self, image_bgr):
         """
         Get face embedding vector from BGR image.
         Returns list (embedding) or None if no face found.
         """
+        vector, report = self.get_embedding_with_report(image_bgr)
+        timings = " ".join(f"{stage}={ms}ms" for stage, ms in report["timings_ms"].items())
+        print(f"AI: Face embedding path={report['path']} faces={report['faces']} {timings}")
+        return vector
+
+    def get_embedding_with_report(self, image_bgr):
+        """
+        Single-pass pipeline: detect once -> pick the best box -> aligned crop -> ONE Facenet pass.
+        mtcnn only runs when opencv finds no face; the whole frame is embedded only when both fail.
+        (Old cascade called DeepFace.represent per detector, so a hard frame paid up to 3 full passes.)
+
+        Returns:
+            tuple: (embedding list or None, {"path", "faces", "timings_ms": {stage: ms}})
+        """
+        report = {"path": "failed", "faces": 0, "timings_ms": {}}
         try:
             from deepface import DeepFace
-            # Try multiple detectors for robustness if the fast one fails
-            # Sequence: opencv (fastest) -> mtcnn (accurate) -> skip (enforce_detection=False)
-            detectors = ['opencv', 'mtcnn']
-            
-            for detector in detectors:
-                try:
-                    print(f"AI: Processing with detector: {detector}...")
-                    results = DeepFace.represent(
-                        img_path=image_bgr,
-                        model_name=self.model_name,
-                        enforce_detection=True,
-                        detector_backend=detector
-                    )
-                    
-                    if results and len(results) > 0:
-                        print(f"AI: Face detected using {detector}!")
-                        if len(results) > 1:
-                            print(f"Warning: {len(results)} faces detected. Using the primary one.")
-                        return results[0]["embedding"]
-                except ValueError:
-                    print(f"Warning: AI: {detector} failed to detect face. Trying next...")
-                    continue
-                except Exception as e:
-                    print(f"Error: AI: Error with {detector}: {e}")
-                    continue
+        except Exception as e:
+            print(f"DeepFace Critical Error: {e}")
+            return None, report
+
+        face = self._find_face(DeepFace, image_bgr, report)
+        if face is None:
+            # FINAL FALLBACK: no detector found a face -> embed the whole frame as-is
+            report["path"] = "full_frame"
+            face = image_bgr
 
-            # FINAL FALLBACK: No strict detection, just try to represent the whole image center
-            print("AI: Final fallback - attempting representation without strict detection.")
+        started = time.perf_counter()
+        try:
             results = DeepFace.represent(
-                img_path=image_bgr,
+                img_path=face,
                 model_name=self.model_name,
                 enforce_detection=False,
-                detector_backend='opencv'
+                detector_backend="skip" # Already detected + aligned (or deliberately the whole frame)
             )
-            if results and len(results) > 0:
-                print("AI: Embedding generated in fallback mode.")
-                return results[0]["embedding"]
-                
         except Exception as e:
             print(f"DeepFace Critical Error: {e}")
+            results = None
+        report["timings_ms"]["embed"] = round((time.perf_counter() - started) * 1000, 1)
+        if not results:
+            report["path"] = "failed"
+            return None, report
+        return results[0]["embedding"], report
+
+    def get_embeddings_batch(self, images_bgr):
+        """
+        Bulk enrollment: detection per image (same single-pass pipeline), then the aligned crops go through
+        Facenet in batches of FACE_BULK_BATCH_SIZE instead of one model call per photo.
+        Images without a detectable face get None (no whole-frame fallback - that would enroll garbage).
+
+        Returns:
+            list: [(embedding list or None, report)] in input order.
+        """
+        reports = [{"path": "failed", "faces": 0, "timings_ms": {}} for _ in images_bgr]
+        try:
+            from deepface import DeepFace
+        except Exception as e:
+            print(f"DeepFace Critical Error: {e}")
+            return [(None, report) for report in reports]
+
+        crops = [self._find_face(DeepFace, image, report) for image, report in zip(images_bgr, reports)]
+        found = [i for i, crop in enumerate(crops) if crop is not None]
+        vectors = [None] * len(images_bgr)
+        batch_size = max(1, settings.FACE_BULK_BATCH_SIZE)
+        for start in range(0, len(found), batch_size):
+            chunk = found[start:start + batch_size]
+            started = time.perf_counter()
+            embeddings = self._embed_batch(DeepFace, [crops[i] for i in chunk])
+            per_image = round((time.perf_counter() - started) * 1000 / len(chunk), 1)
+            for i, embedding in zip(chunk, embeddings):
+                vectors[i] = embedding
+                reports[i]["timings_ms"]["embed"] = per_image # Batch time split evenly
+                if embedding is None:
+                    reports[i]["path"] = "failed"
+        return list(zip(vectors, reports))
+
+    def _embed_batch(self, DeepFace, faces):
+        """
+        Facenet over a list of aligned BGR crops. The whole list goes through ONE DeepFace.represent call
+        (DeepFace >= 0.0.94 takes a list and runs a single forward pass), so every crop gets exactly the
+        preprocessing the single-image path (get_embedding -> represent, detector_backend="skip") applies.
+        """
+        if len(faces) > 1:
+            try:
+                results = DeepFace.represent(img_path=list(faces), model_name=self.model_name,
+                                             enforce_detection=False, detector_backend="skip")
+                if len(results) == len(faces):
+                    return [objs[0]["embedding"] if objs else None for objs in results]
+                print(f"Face Batch Warning: represent returned {len(results)} results for {len(faces)} crops.")
+            except Exception as e:
+                # Older DeepFace: represent takes one image only -> one call per crop (still no re-detection)
+                print(f"Face Batch Warning: batched represent unavailable ({e}), embedding one by one.")
+        embeddings = []
+        for face in faces:
+            try:
+                results = DeepFace.represent(img_path=face, model_name=self.model_name,
+                                             enforce_detection=False, detector_backend="skip")
+                embeddings.append(results[0]["embedding"] if results else None)
+            except Exception as e:
+                print(f"DeepFace Critical Error: {e}")
+                embeddings.append(None)
+        return embeddings
+
+    def _find_face(self, DeepFace, image_bgr, report):
+        """opencv, then mtcnn only if needed. Returns the best aligned crop (BGR uint8) or None."""
+        for detector in self.DETECTORS:
+            faces = self._detect(DeepFace, image_bgr, detector, report)
+            if faces:
+                report["path"], report["faces"] = detector, len(faces)
+                return self._best_face(faces)
         return None
 
+    @staticmethod
+    def _detect(DeepFace, image_bgr, detector, report):
+        """Detection + alignment only (no embedding). Returns DeepFace face dicts, [] if none found."""
+        started = time.perf_counter()
+        try:
+            return DeepFace.extract_faces(
+                img_path=image_bgr, detector_backend=detector, enforce_detection=True, align=True
+            )
+        except ValueError:
+            return [] # "Face could not be detected"
+        except Exception as e:
+            print(f"Error: AI: Error with {detector}: {e}")
+            return []
+        finally:
+            report["timings_ms"][f"detect_{detector}"] = round((time.perf_counter() - started) * 1000, 1)
+
+    @staticmethod
+    def _best_face(faces):
+        """Highest detector confidence wins, larger box breaks ties. Returns the aligned crop as BGR uint8."""
+        def rank(f):
+            area = f["facial_area"]
+            return round(float(f.get("confidence") or 0), 2), area.get("w", 0) * area.get("h", 0)
+        crop = max(faces, key=rank)["face"] # RGB float in [0, 1]
+        return (np.clip(crop, 0, 1)[:, :, ::-1] * 255).astype(np.uint8)
+
     def find_best_match(self, current_vector, threshold=0.65):
         """
-        Calculates cosine distance against ALL cached embeddings.
+        Calculates cosine distance against ALL cached embeddings (or, past FACE_ANN_MIN_ROWS, against
+        the rows of the closest IVF lists - same distance and threshold, approximate recall).
         Returns user_id of strongest match or None.
         FAST: Does all math in numpy instead of python loops.
         """
-        if not self.cache:
-            return None
-
         # 1. Prepare query vector (Normalize it)
-        v_query = np.array(current_vector)
-        v_query = v_query / np.linalg.norm(v_query)
+        self._refresh_shared()
+        v_query = self._query_vector(current_vector)
+        if v_query is None:
+            return None
 
-        # 2. Collect all embeddings into a matrix
-        ids = list(self.cache.keys())
-        embeddings = np.array([self.cache[cid]["embedding"] for cid in ids])
+        # 2. Matrix multiplication (Cosine Similarity = Dot Product), one BLAS call over the cache
+        # matrix (already normalized), written into this thread's reusable buffer instead of a fresh (n,) array.
+        # Held under the lock: removals move rows in place.
+        with self._lock:
+            n = self.size
+            if n == 0:
+                return None
+            ann = self._ann_search_index()
+            if ann is not None:
+                # 100k+ rows: only the rows of the nprobe closest IVF lists are scored (exactly).
+                positions = ann.candidates(v_query, settings.FACE_ANN_NPROBE)
+                if positions.size == 0:
+                    return None
+                similarities = self.matrix[positions] @ v_query
+                best = int(np.argmax(similarities))
+                best_idx = int(positions[best])
+            else:
+                scores = getattr(self._local, "scores", None)
+                if scores is None or scores.shape[0] < n:
+                    scores = self._local.scores = np.empty(max(n, self.MIN_CAPACITY) * 2, dtype=np.float32)
+                similarities = np.dot(self.matrix[:n], v_query, out=scores[:n])
+                best = best_idx = int(np.argmax(similarities))
 
-        # 3. Embeddings are already normalized in warm_cache
-        # 4. Matrix multiplication (Cosine Similarity = Dot Product)
-        # Result is (len(ids),) vector of similarities
-        similarities = np.dot(embeddings, v_query)
-        
-        # 5. Distance = 1 - Similarity
-        distances = 1 - similarities
-        
-        # 6. Find the best match
-        best_idx = np.argmin(distances)
-        min_dist = distances[best_idx]
+            # 3. Best match: Distance = 1 - Similarity
+            min_dist = 1 - float(similarities[best])
+            best_uid = int(self.user_ids[best_idx])
 
-        if min_dist < threshold:
-            best_uid = self.cache[ids[best_idx]]["user_id"]
+        if min_dist < threshold and best_uid != TOMBSTONE:
             print(f"Fast Vector Match: UID {best_uid} - Dist {min_dist:.4f}")
             return best_uid
         
@@ -146,25 +746,20 @@ class FaceService:
     def match_user_face(self, user_id, current_vector, threshold=0.65):
         """
         Check if the current vector matches a SPECIFIC user's cached embedding.
-        Fast: Direct cache lookup by user_id.
+        Fast: user_rows index -> only this user's enrollments are scored (closest one wins),
+        independent of how many faces are enrolled in total.
         """
-        if not self.cache:
-            return False
-
-        # Find the vector for the given user_id in cache (First match)
-        user_vector = None
-        for data in self.cache.values():
-            if data["user_id"] == user_id:
-                user_vector = data["embedding"]
-                break
-        
-        if user_vector is None:
+        self._refresh_shared()
+        v_query = self._query_vector(current_vector)
+        if v_query is None:
             return False
 
-        v_query = np.array(current_vector) / np.linalg.norm(current_vector)
-        v_db = user_vector / np.linalg.norm(user_vector)
-        
-        dist = 1 - np.dot(v_query, v_db)
+        with self._lock:
+            owned = self.user_rows.get(user_id)
+            if not owned:
+                return False
+            rows = [self.pos_of[row_id] for row_id in owned]
+            dist = 1 - float(np.max(self.matrix[rows] @ v_query))
         print(f"Individual Match: User {user_id} - Dist {dist:.4f} (Thr {threshold})")
         
         return bool(dist < threshold)
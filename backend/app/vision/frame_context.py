@@ -0,0 +1,128 @@
+import threading
+
+import cv2
+import numpy as np
+
+from ..config import settings
+
+# 🖼️ Frame Context
+# One frame used to be searched for faces 2-3 times: DeepFace emotion ran its own opencv detector,
+# PoseService ran the Haar cascade again, and the proctor loop called DeepFace.extract_faces on top.
+# FrameContext wraps a decoded frame and computes everything shared exactly once, lazily:
+#   gray / small (downscaled to VISION_ANALYSIS_WIDTH) / small_gray / faces (one Haar pass on small_gray).
+# Face boxes are returned in ORIGINAL frame coordinates, so every consumer (emotion crop, pose) reads the
+# same cached list. The proctor's NO FACE / MULTIPLE PEOPLE rules were tuned on DeepFace's opencv backend,
+# so they read `proctor_faces` instead: same parameters as that backend (full resolution, minNeighbors=10)
+# and the same confidence scale, (100 - Haar level weight) / 100.
+
+# profile -> (run on the downscaled frame?, minNeighbors)
+DETECTION_PROFILES = {
+    "shared": (True, 5), # Fast: emotion crop + pose only need the rough box
+    "proctor": (False, 10), # = DeepFace opencv backend: detectMultiScale3(img, 1.1, 10) on the full frame
+}
+
+_local = threading.local() # CascadeClassifier isn't documented as thread-safe -> one per thread
+
+
+def _face_cascade():
+    cascade = getattr(_local, "face_cascade", None)
+    if cascade is None:
+        cascade = _local.face_cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+    return cascade
+
+
+class FrameContext:
+    def __init__(self, image_bgr: np.ndarray):
+        self.image = image_bgr
+        self._lock = threading.Lock() # Lanes may ask for faces at the same time; detect only once
+        self._gray = None
+        self._small = None
+        self._small_gray = None
+        self.scale = 1.0 # small = image * scale
+        self._faces = {} # profile -> cached boxes
+
+    @property
+    def gray(self):
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def small(self):
+        """Frame downscaled to VISION_ANALYSIS_WIDTH (the frame itself if already narrower)."""
+        if self._small is None:
+            width = self.image.shape[1]
+            target = settings.VISION_ANALYSIS_WIDTH
+            if target and width > target:
+                self.scale = target / width
+                self._small = cv2.resize(self.image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+            else:
+                self._small = self.image
+        return self._small
+
+    @property
+    def small_gray(self):
+        if self._small_gray is None:
+            self._small_gray = self.gray if self.small is self.image else cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY)
+        return self._small_gray
+
+    @property
+    def faces(self) -> list:
+        """[{"x", "y", "w", "h", "confidence"}] sorted by area (largest first), original coordinates."""
+        return self._cached_faces("shared")
+
+    @property
+    def proctor_faces(self) -> list:
+        """Same shape as `faces`, detected with the DeepFace opencv backend's parameters (see DETECTION_PROFILES)."""
+        return self._cached_faces("proctor")
+
+    def detect_faces(self) -> list:
+        """Explicit trigger (e.g. on an inference lane before the per-model fan-out)."""
+        return self.faces
+
+    def detect_proctor_faces(self) -> list:
+        return self.proctor_faces
+
+    def _cached_faces(self, profile: str) -> list:
+        faces = self._faces.get(profile)
+        if faces is None:
+            with self._lock:
+                faces = self._faces.get(profile)
+                if faces is None:
+                    faces = self._faces[profile] = self._detect_faces(*DETECTION_PROFILES[profile])
+        return faces
+
+    def _detect_faces(self, downscaled: bool, min_neighbors: int):
+        gray, scale = (self.small_gray, self.scale) if downscaled else (self.gray, 1.0)
+        try:
+            boxes, _, weights = _face_cascade().detectMultiScale3(
+                gray, scaleFactor=1.1, minNeighbors=min_neighbors, outputRejectLevels=True
+            )
+        except cv2.error as e:
+            print(f"FrameContext face detection error: {e}")
+            return []
+        inverse = 1.0 / scale
+        faces = [
+            {
+                "x": int(x * inverse), "y": int(y * inverse), "w": int(w * inverse), "h": int(h * inverse),
+                "confidence": round((100 - float(weight)) / 100, 2), # DeepFace opencv backend's scale
+            }
+            for (x, y, w, h), weight in zip(np.asarray(boxes).reshape(-1, 4), np.asarray(weights).ravel())
+        ]
+        faces.sort(key=lambda f: f["w"] * f["h"], reverse=True)
+        return faces
+
+    def face_crop(self, face: dict, margin: float = 0.1) -> np.ndarray:
+        """BGR crop of one cached box (with a small margin), from the full-resolution frame."""
+        height, width = self.image.shape[:2]
+        dx, dy = int(face["w"] * margin), int(face["h"] * margin)
+        x0, y0 = max(0, face["x"] - dx), max(0, face["y"] - dy)
+        x1, y1 = min(width, face["x"] + face["w"] + dx), min(height, face["y"] + face["h"] + dy)
+        return self.image[y0:y1, x0:x1]
+
+
+def as_context(frame) -> FrameContext:
+    """Services accept a FrameContext or a raw BGR frame (wrapped on the fly)."""
+    return frame if isinstance(frame, FrameContext) else FrameContext(frame)
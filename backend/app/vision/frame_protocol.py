@@ -0,0 +1,90 @@
+import base64
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+from fastapi import WebSocketDisconnect
+
+from ..config import settings
+
+# 📦 WebSocket Frame Protocol (/vision/stream, /vision/proctor)
+# Text mode (legacy): base64 data-URL per message -> ~33% bigger on the wire, plus a split + b64decode copy.
+# Binary mode: one 20-byte header + the raw JPEG/WebP bytes, decoded straight from the message buffer
+# (np.frombuffer, no copy) by cv2.imdecode.
+#
+#   bytes 0-1    magic b"VF"
+#   byte  2      protocol version (1)
+#   byte  3      flags (reserved, 0)
+#   bytes 4-7    sequence number (uint32) - echoed back as "seq" in the response
+#   bytes 8-15   client timestamp, ms since epoch (float64) - echoed back as "ts"
+#   bytes 16-17  encoded width  (uint16, 0 = unknown)   resolution hint: frames much larger than
+#   bytes 18-19  encoded height (uint16, 0 = unknown)   VISION_STREAM_MAX_WIDTH are decoded at 1/2 .. 1/8 scale
+#
+# All fields little-endian. Both modes can be mixed on one socket; the server answers in JSON text either way.
+
+MAGIC = b"VF"
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct("<2sBBIdHH")
+HEADER_SIZE = HEADER.size # 20
+
+# Reduced-size JPEG decode: libjpeg scales while decoding, much cheaper than decode + resize.
+_REDUCED_FLAGS = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+
+
+@dataclass
+class Frame:
+    image: Optional[np.ndarray] # BGR, None if the payload couldn't be decoded
+    binary: bool
+    seq: Optional[int] = None
+    timestamp: Optional[float] = None
+
+    def meta(self) -> dict:
+        """Fields echoed back to binary-mode clients (empty for text mode, so old clients see no change)."""
+        return {"seq": self.seq, "ts": self.timestamp} if self.binary else {}
+
+
+def pack_frame(encoded: bytes, seq: int, timestamp: float, width: int = 0, height: int = 0) -> bytes:
+    """Client-side helper (tests / Python clients): header + encoded image bytes."""
+    return HEADER.pack(MAGIC, PROTOCOL_VERSION, 0, seq & 0xFFFFFFFF, timestamp, width, height) + encoded
+
+
+def _decode_flag(width: int) -> int:
+    max_width = settings.VISION_STREAM_MAX_WIDTH
+    if width and max_width:
+        for factor, flag in _REDUCED_FLAGS:
+            if width >= factor * max_width:
+                return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_binary(data: bytes) -> Frame:
+    if len(data) <= HEADER_SIZE:
+        return Frame(image=None, binary=True)
+    magic, version, _flags, seq, timestamp, width, _height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != PROTOCOL_VERSION:
+        return Frame(image=None, binary=True)
+    payload = np.frombuffer(data, dtype=np.uint8, offset=HEADER_SIZE) # View into the message, no copy
+    image = cv2.imdecode(payload, _decode_flag(width))
+    return Frame(image=image, binary=True, seq=seq, timestamp=timestamp)
+
+
+def decode_text(data: str) -> Frame:
+    """Legacy base64 data-URL (or bare base64) frame."""
+    try:
+        encoded = data.split(",", 1)[1] if "," in data else data
+        image = cv2.imdecode(np.frombuffer(base64.b64decode(encoded), np.uint8), cv2.IMREAD_COLOR)
+    except Exception:
+        image = None
+    return Frame(image=image, binary=False)
+
+
+async def receive_frame(websocket) -> Frame:
+    """Next frame from the socket in whichever mode the client sent it. Raises WebSocketDisconnect."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return decode_binary(message["bytes"])
+    return decode_text(message.get("text") or "")
@@ -0,0 +1,90 @@
+import asyncio
+
+from fastapi import WebSocketDisconnect
+
+from .frame_protocol import receive_frame
+
+# ⏱️ Latest-Frame-Wins Scheduler
+# The websocket loops used to receive -> infer -> sleep(0.1 / 0.5) no matter how long inference took.
+# A client sending faster than that filled the socket buffer, so every result described an older frame
+# and latency grew without bound. Here a receiver task drains the socket continuously and keeps ONLY the
+# newest frame; the inference loop takes whatever is newest when it gets free, then waits just the
+# remainder of its 1/target_fps slot. Overwritten frames are counted as dropped and reported to the client.
+
+
+class LatestFrameChannel:
+    def __init__(self, websocket, target_fps: float):
+        self.websocket = websocket
+        self.target_fps = target_fps
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0 # Replaced by a newer frame before inference got to them
+        self._latest = None
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._receiver = None
+        self._last_start = None
+
+    async def __aenter__(self):
+        self._receiver = asyncio.create_task(self._receive_loop())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except (asyncio.CancelledError, Exception):
+            pass
+        return False
+
+    async def _receive_loop(self):
+        try:
+            while True:
+                frame = await receive_frame(self.websocket)
+                self.received += 1
+                if self._latest is not None:
+                    self.dropped += 1
+                self._latest = frame
+                self._ready.set()
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: receive after the socket was closed from our side
+            self._closed = True
+            self._ready.set()
+
+    async def next(self):
+        """Newest frame, no sooner than 1/target_fps after the previous one started. Raises WebSocketDisconnect."""
+        loop = asyncio.get_running_loop()
+        if self._last_start is not None and self.target_fps > 0:
+            remaining = self._last_start + 1.0 / self.target_fps - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining) # Frames arriving meanwhile overwrite each other
+        if self._latest is None and self._closed: # Disconnected and nothing left to process
+            raise WebSocketDisconnect(1000)
+        await self._ready.wait()
+        if self._latest is None: # Woken by the disconnect, nothing left to process
+            raise WebSocketDisconnect(1000)
+        frame, self._latest = self._latest, None
+        if not self._closed: # Once closed, stay set: the next call must see the disconnect, not wait forever
+            self._ready.clear()
+        self.processed += 1
+        self._last_start = loop.time()
+        return frame
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "target_fps": self.target_fps,
+        }
+
+
+def requested_fps(websocket, maximum: float) -> float:
+    """?fps=N lets a client ask for fewer frames; capped at the server setting (0 = unpaced)."""
+    try:
+        requested = float(websocket.query_params.get("fps", maximum))
+    except ValueError:
+        requested = maximum
+    if maximum <= 0:
+        return max(requested, 0.0)
+    return min(max(requested, 0.1), maximum)
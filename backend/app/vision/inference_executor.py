@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import settings
+from ..ml.executor import MLExecutor
+
+# 🎥 Vision Inference Executor
+# Vision routes are `async def`, but DeepFace / YOLO / Haar cascades are blocking calls: run inline they freeze
+# the event loop, so one slow frame stalls every other request on that worker. Each model gets its own lane
+# (thread pool + bounded queue): `await run_inference("emotion", ...)`, and an emotion backlog can't delay logins.
+# YOLO has its own cross-session batching thread instead of a lane (see object_batcher.py).
+# Threads, not processes: the models are big, already loaded once per worker, and TF / torch / OpenCV
+# release the GIL while they compute.
+
+LANES = ("face", "emotion", "pose")
+
+
+class InferenceLane(MLExecutor):
+    """One model's thread pool with the same bounded-queue / timeout / stats behaviour as the ML pool."""
+
+    busy_detail = "Vision engine busy, please retry in a moment."
+    timeout_detail = "Vision inference timed out, please retry."
+
+    def __init__(self, name: str, workers: int, max_pending: int, timeout: float):
+        super().__init__(max(1, workers), max_pending, timeout)
+        self.name = name
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"vision-{self.name}")
+        return self._pool
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["mode"] = "thread"
+        return stats
+
+
+class InferenceExecutor:
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.lanes = {name: InferenceLane(name, workers, max_pending, timeout) for name in LANES}
+
+    async def run(self, lane: str, fn, *args, timeout: float = None, **kwargs):
+        """Runs fn(*args, **kwargs) on the lane's threads. 503 when its queue is full, 504 on timeout."""
+        return await self.lanes[lane].run(fn, *args, timeout=timeout, **kwargs)
+
+    def stats(self) -> dict:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+    def shutdown(self):
+        for lane in self.lanes.values():
+            lane.shutdown()
+
+
+INFERENCE_EXECUTOR = InferenceExecutor(
+    workers=settings.VISION_LANE_WORKERS,
+    max_pending=settings.VISION_LANE_MAX_PENDING,
+    timeout=settings.VISION_TASK_TIMEOUT_SECONDS,
+)
+
+
+async def run_inference(lane: str, fn, *args, timeout: float = None, **kwargs):
+    """Shortcut for INFERENCE_EXECUTOR.run (routes await this)."""
+    return await INFERENCE_EXECUTOR.run(lane, fn, *args, timeout=timeout, **kwargs)
+
+
+class AsyncService:
+    """
+    Awaitable view of a vision service: every method call is run on the service's lane.
+        faces = AsyncService(get_face_service(db), "face")
+        vector = await faces.get_embedding(img)
+    """
+
+    def __init__(self, service, lane: str):
+        self._service = service
+        self._lane = lane
+
+    def __getattr__(self, name):
+        attr = getattr(self._service, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, timeout: float = None, **kwargs):
+            return await run_inference(self._lane, attr, *args, timeout=timeout, **kwargs)
+        return call
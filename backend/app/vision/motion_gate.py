@@ -0,0 +1,77 @@
+import time
+
+import cv2
+import numpy as np
+
+from ..config import settings
+
+# 🎚️ Motion Gate
+# In a proctored exam the camera image barely changes for minutes, yet every frame went through YOLO + face
+# detection (+ DeepFace emotion on the stream). MotionGate sits in front of those pipelines, one per session:
+# each frame is shrunk to a 64px-wide grayscale thumbnail (from FrameContext.small_gray, so it's nearly free)
+# and compared with the thumbnail of the last frame that was REALLY analyzed. If fewer than
+# VISION_MOTION_CHANGE_RATIO of its pixels moved by more than VISION_MOTION_PIXEL_DELTA, the previous analysis
+# is reused. Comparing against the last analyzed frame (not the previous one) means slow drift still adds up
+# to a re-analysis, and VISION_MOTION_REFRESH_SECONDS forces one anyway.
+
+THUMB_WIDTH = 64
+
+
+class MotionGate:
+    def __init__(self, change_ratio: float = None, pixel_delta: int = None, refresh_seconds: float = None):
+        self.change_ratio = settings.VISION_MOTION_CHANGE_RATIO if change_ratio is None else change_ratio
+        self.pixel_delta = settings.VISION_MOTION_PIXEL_DELTA if pixel_delta is None else pixel_delta
+        self.refresh_seconds = settings.VISION_MOTION_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self.analyzed = 0
+        self.skipped = 0
+        self._reference = None # Thumbnail of the last analyzed frame
+        self._result = None
+        self._analyzed_at = None
+        self._candidate = None # Thumbnail of the frame currently being analyzed
+
+    def _thumbnail(self, ctx):
+        gray = ctx.small_gray
+        height, width = gray.shape[:2]
+        size = (THUMB_WIDTH, max(1, round(height * THUMB_WIDTH / width)))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    def changed_fraction(self, thumbnail) -> float:
+        """Share of thumbnail pixels that differ from the reference by more than pixel_delta (1.0 = no reference)."""
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            return 1.0
+        return float(np.count_nonzero(cv2.absdiff(thumbnail, self._reference) > self.pixel_delta)) / thumbnail.size
+
+    def check(self, ctx):
+        """
+        Previous analysis if this frame is essentially unchanged (counted as skipped), else None:
+        the caller analyzes the frame and hands the result to remember().
+        """
+        if self.change_ratio <= 0: # Gate disabled
+            return None
+        thumbnail = self._thumbnail(ctx)
+        stale = self._analyzed_at is None or time.monotonic() - self._analyzed_at >= self.refresh_seconds
+        if not stale and self._result is not None and self.changed_fraction(thumbnail) < self.change_ratio:
+            self.skipped += 1
+            return self._result
+        self._candidate = thumbnail
+        return None
+
+    def remember(self, result):
+        """
+        Stores a fresh analysis; its frame becomes the new reference. (Not called when analysis failed, so
+        only completed analyses count as analyzed and a failing pipeline doesn't deflate skip_ratio.)
+        """
+        self.analyzed += 1
+        self._result = result
+        self._analyzed_at = time.monotonic()
+        if self._candidate is not None:
+            self._reference, self._candidate = self._candidate, None
+
+    def stats(self) -> dict:
+        total = self.analyzed + self.skipped
+        return {
+            "analyzed": self.analyzed,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / total, 3) if total else 0.0,
+            "refresh_seconds": self.refresh_seconds,
+        }
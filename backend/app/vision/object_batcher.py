@@ -0,0 +1,155 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from fastapi import HTTPException
+
+from ..config import settings
+
+# 📦 Cross-Session YOLO Micro-Batching
+# Every proctor socket (and /analyze-frame) used to run its own single-image YOLO pass at imgsz=640:
+# 50 candidates in one exam = 50 separate forward passes fighting over the CPU. ObjectBatcher is a tiny
+# in-process inference server instead: callers `await OBJECT_BATCHER.detect(frame)`, one batching thread
+# collects frames from all sessions for up to OBJECT_BATCH_MAX_WAIT_MS (or until OBJECT_BATCH_SIZE frames),
+# runs ONE model.predict on the whole list and hands each session its own result back.
+# The batching thread is the only place YOLO runs, so the model is never used from two threads at once.
+# Full queue -> 503, caller timeout -> 504 (same contract as the inference lanes).
+
+_STOP = object()
+
+
+def _object_service():
+    from ..routes.opencv_routes import get_object_service
+    return get_object_service()
+
+
+class ObjectBatcher:
+    busy_detail = "Object detection busy, please retry in a moment."
+    timeout_detail = "Object detection timed out, please retry."
+
+    def __init__(self, service_getter, max_batch: int, max_wait_ms: float, max_pending: int, timeout: float):
+        self._service_getter = service_getter
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=max_pending) # (frame, Future)
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.frames = 0
+        self.largest_batch = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._stopping.clear()
+                    self._thread = threading.Thread(target=self._serve, name="vision-object-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, frame_bgr) -> Future:
+        """Queues one frame; the Future resolves to (detections, alerts). Raises 503 when the queue is full."""
+        self._ensure_thread()
+        future = Future()
+        try:
+            self._queue.put_nowait((frame_bgr, future))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            raise HTTPException(status_code=503, detail=self.busy_detail)
+        return future
+
+    async def detect(self, frame_bgr, timeout: float = None):
+        """Awaitable detect_and_track: (detections, alerts) for this frame, computed inside a shared batch."""
+        future = self.submit(frame_bgr)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel() # Still queued -> skipped when its batch is built
+            with self._stats_lock:
+                self.timeouts += 1
+            raise HTTPException(status_code=504, detail=self.timeout_detail)
+
+    def _collect(self, first):
+        """First item plus whatever else arrives within max_wait, up to max_batch."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP: # Serve what we have; _serve stops after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _serve(self):
+        while not self._stopping.is_set():
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            # Callers that already timed out / went away are dropped before the forward pass
+            batch = [(frame, future) for frame, future in self._collect(first) if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self._service_getter().detect_batch([frame for frame, _ in batch])
+            except Exception as e:
+                print(f"Object Batcher Warning: batch of {len(batch)} failed: {e}")
+                with self._stats_lock:
+                    self.failed += len(batch)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            with self._stats_lock:
+                self.batches += 1
+                self.frames += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "mode": "batch",
+                "queued": self._queue.qsize(),
+                "max_pending": self.max_pending,
+                "max_batch": self.max_batch,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "batches": self.batches,
+                "frames": self.frames,
+                "avg_batch": round(self.frames / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "timeout_seconds": self.timeout,
+            }
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._stopping.set()
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                pass # Daemon thread; it dies with the process anyway
+            self._thread = None
+
+
+OBJECT_BATCHER = ObjectBatcher(
+    _object_service,
+    max_batch=settings.OBJECT_BATCH_SIZE,
+    max_wait_ms=settings.OBJECT_BATCH_MAX_WAIT_MS,
+    max_pending=settings.OBJECT_BATCH_MAX_PENDING,
+    timeout=settings.VISION_TASK_TIMEOUT_SECONDS,
+)
@@ -21,29 +21,37 @@ class ObjectService:
         AI scan for objects and return results.
         Tracking enabled for trajectory.
         """
+        return self.detect_batch([frame_bgr])[0]
+
+    def detect_batch(self, frames_bgr):
+        """
+        Same scan for several frames in ONE forward pass (used by the cross-session ObjectBatcher).
+        Returns [(detections, alerts)] in input order.
+        """
         # conf=0.10: Extreme sensitivity for mobile phones
         # imgsz=640: Standard high-res for YOLO to detect small objects clearly
-        results = self.model.predict(source=frame_bgr, conf=0.10, imgsz=640, verbose=False)
-        
+        results = self.model.predict(source=list(frames_bgr), conf=0.10, imgsz=640, verbose=False)
+        return [self._parse(result) for result in results]
+
+    def _parse(self, result):
         detections = []
         alerts = []
-        
-        for result in results:
-            for box in result.boxes:
-                # Class name string
-                cls_name = self.model.names[int(box.cls)]
-                conf = float(box.conf)
-                
-                # Flag if it's restricted (AI Security Case)
-                if cls_name in self.flagged_objects:
-                    alerts.append(f"Security Alert: {cls_name} detected!")
-
-                detections.append({
-                    "name": cls_name,
-                    "confidence": round(conf * 100, 2),
-                    "box": box.xyxy[0].tolist() # [x1, y1, x2, y2]
-                })
-        
+
+        for box in result.boxes:
+            # Class name string
+            cls_name = self.model.names[int(box.cls)]
+            conf = float(box.conf)
+
+            # Flag if it's restricted (AI Security Case)
+            if cls_name in self.flagged_objects:
+                alerts.append(f"Security Alert: {cls_name} detected!")
+
+            detections.append({
+                "name": cls_name,
+                "confidence": round(conf * 100, 2),
+                "box": box.xyxy[0].tolist() # [x1, y1, x2, y2]
+            })
+
         if detections:
             print(f"DEBUG: YOLO Detect: {[d['name'] for d in detections if d['confidence'] > 10]}")
 
@@ -1,22 +1,25 @@
 import cv2
 import numpy as np
 
+from .frame_context import as_context
+
 # Pose Service - Fallback implementation (no mediapipe dependency)
 # Using OpenCV-based heuristics instead since mediapipe API changed in newer versions
 
 class PoseService:
     def __init__(self):
-        # No heavy init needed - we use cv2 only
+        # No heavy init needed - we use cv2 only. Detection itself runs once per frame in FrameContext;
+        # this copy only lets warm-up verify the cascade file loads.
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
 
-    def analyze_pose(self, frame_bgr):
+    def analyze_pose(self, frame):
         """
         Simplified pose analysis using face detection.
+        `frame` is a FrameContext (or raw BGR frame); its cached face boxes are reused, no extra Haar pass.
         Returns (status, None) for compatibility.
         """
         try:
-            gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(gray, 1.1, 5)
+            faces = as_context(frame).faces
             if len(faces) > 0:
                 return "Standing/Sitting", None
             else:
@@ -25,13 +28,14 @@ class PoseService:
             print(f"PoseService.analyze_pose error: {e}")
             return "Unknown", None
 
-    def check_drowsiness(self, frame_bgr):
+    def check_drowsiness(self, frame):
         """
         Simplified drowsiness check (returns False always in lite mode).
         Full implementation requires dlib or mediapipe which has breaking changes.
+        Takes the same FrameContext as analyze_pose, so a real check can read its face boxes.
         """
         return False
 
-    def get_hand_gestures(self, frame_bgr):
+    def get_hand_gestures(self, frame):
         """Simplified hand gesture detection - returns None in lite mode."""
         return "None"
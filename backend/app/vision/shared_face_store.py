@@ -0,0 +1,189 @@
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+try:
+    import fcntl # POSIX only; on Windows the FaceService keeps its per-process cache
+except ImportError:
+    fcntl = None
+
+# 🗂️ Shared Face Store
+# Har uvicorn worker apna FaceService singleton rakhta hai -> N workers = N copies of every embedding, and a
+# worker only learns about another worker's enrollment on its next DB sync. This store keeps ONE copy in a
+# memory-mapped file (put the directory on /dev/shm for a pure RAM mapping) that every worker maps:
+#
+#   * Writers (enrollment / reconcile) serialize on an flock and only ever append rows, then publish them by
+#     bumping `count` in the header. Removal zeroes the row (similarity 0 -> never a match) and tombstones it.
+#   * Readers take no lock: they re-read the header (a few int64s in mapped memory) before each search and
+#     index only the rows appended since their last look.
+#   * When capacity runs out the writer compacts live rows into a new, twice-as-large generation file,
+#     points CURRENT at it and marks the old file superseded; readers remap on their next refresh.
+#
+# File layout (little-endian): header int64[8] | row_ids int64[cap] | user_ids int64[cap] | matrix float32[cap x dim]
+
+MAGIC = int.from_bytes(b"FACESHM1", "little")
+H_MAGIC, H_DIM, H_CAPACITY, H_COUNT, H_REMOVALS, H_SUPERSEDED, H_DB_VERSION, H_GENERATION = range(8)
+HEADER_BYTES = 8 * 8
+TOMBSTONE = -1 # user_ids value of a removed row
+
+
+def shared_store_supported() -> bool:
+    return fcntl is not None
+
+
+class SharedFaceStore:
+    MIN_CAPACITY = 1024
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.lock_path = os.path.join(directory, "faces.lock")
+        self.current_path = os.path.join(directory, "CURRENT")
+        self._thread_lock = threading.Lock() # flock is per open file, so threads of one worker need this too
+        self._mm = None
+        self.header = None
+        self.row_ids = None
+        self.user_ids = None
+        self.matrix = None
+        self.path = None
+
+    # 1️⃣ Mapping
+
+    @property
+    def attached(self) -> bool:
+        return self._mm is not None
+
+    def _generation_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"faces-{generation}.bin")
+
+    def _map(self, path: str):
+        mm = np.memmap(path, dtype=np.uint8, mode="r+")
+        header = np.ndarray((8,), dtype="<i8", buffer=mm, offset=0)
+        if int(header[H_MAGIC]) != MAGIC:
+            raise ValueError(f"{path} is not a face store file")
+        dim, capacity = int(header[H_DIM]), int(header[H_CAPACITY])
+        offset = HEADER_BYTES
+        self.row_ids = np.ndarray((capacity,), dtype="<i8", buffer=mm, offset=offset)
+        offset += 8 * capacity
+        self.user_ids = np.ndarray((capacity,), dtype="<i8", buffer=mm, offset=offset)
+        offset += 8 * capacity
+        self.matrix = np.ndarray((capacity, dim), dtype="<f4", buffer=mm, offset=offset)
+        self._mm, self.header, self.path = mm, header, path
+
+    def refresh(self):
+        """Follows CURRENT to the newest generation if needed. Returns (generation, removals, count)."""
+        if self._mm is None or self.header[H_SUPERSEDED]:
+            try:
+                with open(self.current_path) as f:
+                    path = self._generation_path(int(f.read().strip()))
+                if path != self.path:
+                    self._map(path)
+            except (FileNotFoundError, ValueError):
+                if self._mm is None:
+                    return None
+        return self.generation, self.removals, self.count
+
+    @property
+    def dim(self) -> int:
+        return int(self.header[H_DIM])
+
+    @property
+    def count(self) -> int:
+        return int(self.header[H_COUNT])
+
+    @property
+    def removals(self) -> int:
+        return int(self.header[H_REMOVALS])
+
+    @property
+    def generation(self) -> int:
+        return int(self.header[H_GENERATION])
+
+    @property
+    def db_version(self) -> int:
+        return int(self.header[H_DB_VERSION])
+
+    @db_version.setter
+    def db_version(self, value: int):
+        self.header[H_DB_VERSION] = value
+
+    # 2️⃣ Writing (callers hold `with store.lock():`)
+
+    @contextlib.contextmanager
+    def lock(self):
+        with self._thread_lock:
+            with open(self.lock_path, "a+") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    self.refresh() # Another worker may have published a new generation meanwhile
+                    yield self
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def live_row_ids(self):
+        n = self.count
+        return set(self.row_ids[:n][self.user_ids[:n] != TOMBSTONE].tolist())
+
+    def rebuild(self, dim: int, row_ids, user_ids, block, db_version: int, capacity: int = None):
+        """Writes a fresh generation holding exactly these rows and makes it CURRENT."""
+        n = len(row_ids)
+        capacity = max(capacity or 0, self.MIN_CAPACITY, 2 * n)
+        generation = self.generation + 1 if self.attached else 1
+        path = self._generation_path(generation)
+        size = HEADER_BYTES + 16 * capacity + 4 * capacity * dim
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.truncate(size)
+        mm = np.memmap(tmp, dtype=np.uint8, mode="r+")
+        header = np.ndarray((8,), dtype="<i8", buffer=mm, offset=0)
+        header[:] = [MAGIC, dim, capacity, n, 0, 0, db_version, generation]
+        np.ndarray((capacity,), dtype="<i8", buffer=mm, offset=HEADER_BYTES)[:n] = row_ids
+        np.ndarray((capacity,), dtype="<i8", buffer=mm, offset=HEADER_BYTES + 8 * capacity)[:n] = user_ids
+        if n:
+            np.ndarray((capacity, dim), dtype="<f4", buffer=mm, offset=HEADER_BYTES + 16 * capacity)[:n] = block
+        mm.flush()
+        del mm
+        os.replace(tmp, path)
+
+        with open(self.current_path + ".tmp", "w") as f:
+            f.write(str(generation))
+        os.replace(self.current_path + ".tmp", self.current_path)
+
+        old_path = self.path
+        if self.attached:
+            self.header[H_SUPERSEDED] = 1 # Readers still on the old mapping move over on their next refresh
+        self._map(path)
+        if old_path and old_path != path:
+            with contextlib.suppress(OSError):
+                os.remove(old_path) # Existing mappings stay valid until those workers remap
+
+    def append(self, row_ids, user_ids, block):
+        """Appends normalized rows and publishes them (count is bumped last)."""
+        n = len(row_ids)
+        if n == 0:
+            return
+        start = self.count
+        if start + n > self.matrix.shape[0]:
+            # Compact live rows into a bigger generation, then append there.
+            live = self.user_ids[:start] != TOMBSTONE
+            self.rebuild(
+                self.dim, self.row_ids[:start][live], self.user_ids[:start][live], self.matrix[:start][live],
+                self.db_version, capacity=2 * (int(live.sum()) + n),
+            )
+            start = self.count
+        self.matrix[start:start + n] = block
+        self.row_ids[start:start + n] = row_ids
+        self.user_ids[start:start + n] = user_ids
+        self.header[H_COUNT] = start + n
+
+    def remove(self, row_ids) -> int:
+        n = self.count
+        rows = np.flatnonzero(np.isin(self.row_ids[:n], np.fromiter(row_ids, dtype=np.int64)) & (self.user_ids[:n] != TOMBSTONE))
+        if rows.size:
+            self.matrix[rows] = 0 # Similarity 0 -> distance 1, never under the match threshold
+            self.user_ids[rows] = TOMBSTONE
+            self.header[H_REMOVALS] += rows.size
+        return int(rows.size)
@@ -0,0 +1,246 @@
+"""
+Recommender benchmark suite.
+
+Measures the recommendation and skill-matching paths on synthetic corpora (1k / 10k / 100k rows):
+latency percentiles, throughput and peak Python/NumPy memory per path. Results can be saved as a named
+baseline and later runs compared against it, so a regression shows up between commits.
+
+Run from backend/:
+    python -m benchmarks.recommender_bench                          # all sizes, print only
+    python -m benchmarks.recommender_bench --sizes 1000,10000 --save main
+    python -m benchmarks.recommender_bench --sizes 1000,10000 --compare main
+
+No database is needed: everything runs on in-memory synthetic rows. The ranker path still imports
+app.models, which builds the SQLAlchemy engine at import time, so DATABASE_URL defaults to an in-memory
+SQLite URL here (sqlite://) instead of the Postgres one; no connection is ever opened. Set it explicitly
+(e.g. DATABASE_URL=sqlite:///./bench.db) to override.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", "sqlite://") # Before any app import (see module docstring)
+
+from app.config import settings
+from app.ml.job_recommender import TERM_HASH_VERSION, JobIndex, hashed_term_counts, recommend_jobs
+from app.utils.skill_matcher import analyze_skills, extract_skills_from_text
+from benchmarks.synthetic import make_jobs, make_resumes
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+QUERY_POOL = 200 # Distinct resumes rotated through the per-query paths
+
+
+# 1️⃣ Measurement helpers
+
+def measure(fn, budget: float, min_iters: int, max_iters: int, warmup: bool = True) -> list:
+    """Calls fn repeatedly until the time budget is spent (at least min_iters times). Returns seconds per call."""
+    if warmup:
+        fn()
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_iters and (len(latencies) < min_iters or time.perf_counter() - started < budget):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def peak_memory_mb(fn) -> float:
+    """Peak traced allocation (Python objects + NumPy buffers) of a single call, in MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def summarize(latencies: list, peak_mb: float, ops_per_call: int = 1) -> dict:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "iterations": len(latencies),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "throughput_per_s": round(ops_per_call * len(ms) / (ms.sum() / 1000), 2) if ms.sum() else 0.0,
+        "peak_mem_mb": peak_mb,
+    }
+
+
+def quiet(fn):
+    """Wraps fn so index/matrix 'Ready' prints don't flood the report."""
+    def wrapped():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapped
+
+
+def fresh_job_index(mode: str) -> JobIndex:
+    settings.JOB_VECTORIZER_MODE = mode
+    JobIndex._instance = None
+    return JobIndex()
+
+
+def build_resume_matrix(index: JobIndex, resumes: list):
+    """Fills a fresh ResumeMatrix from raw resume texts (same _hashed_rows / _add / _project path as the DB sync)."""
+    from app.ml.applicant_ranker import ResumeMatrix
+    from app.ml.job_recommender import HASH_SPACE
+    from scipy.sparse import csr_matrix
+
+    ResumeMatrix._instance = None
+    matrix = ResumeMatrix()
+    matrix.raw = csr_matrix((0, HASH_SPACE), dtype=np.float32)
+    rows = []
+    for student_id, text in enumerate(resumes, start=1):
+        counts, _ = hashed_term_counts(text)
+        hashes = sorted(counts)
+        features = SimpleNamespace(
+            vectorizer_version=TERM_HASH_VERSION,
+            term_vector_json=json.dumps({"hashes": hashes, "counts": [counts[h] for h in hashes]}),
+            taxonomy_version=None, skills_json=None, # Ranking only reads the term vector
+        )
+        rows.append((SimpleNamespace(student_id=student_id), features))
+    matrix._add(*matrix._hashed_rows(None, rows))
+    matrix._project(index)
+    return matrix
+
+
+# 2️⃣ Benchmark paths (each returns {path_name: summary})
+
+def bench_size(size: int, args) -> dict:
+    jobs = make_jobs(size)
+    queries = make_resumes(QUERY_POOL, seed=size)
+    next_query = itertools.cycle(queries).__next__
+    run = lambda fn, warmup=True, ops=1: summarize(
+        measure(fn, args.budget, args.min_iters, args.max_iters, warmup), peak_memory_mb(fn), ops
+    )
+    results = {}
+
+    # Original path: throwaway TF-IDF fit over resume + whole corpus on every call.
+    settings.JOB_VECTORIZER_MODE = "tfidf"
+    results["recommend_jobs"] = run(lambda: recommend_jobs(next_query(), jobs, top_n=5))
+
+    for mode in ("tfidf", "hashing"):
+        index = fresh_job_index(mode)
+        results[f"job_index.fit[{mode}]"] = run(quiet(lambda: index.fit(jobs)), warmup=False)
+        results[f"job_index.search[{mode}]"] = run(lambda: index.search(next_query(), top_n=5))
+        results[f"job_index.search_page[{mode}]"] = run(
+            lambda: index.search_page(index.analyze(next_query())[0], limit=20, offset=20)
+        )
+
+        if not args.skip_ranker:
+            # Teacher side: one job scored against `size` stored resumes.
+            resume_matrix = quiet(lambda: build_resume_matrix(index, make_resumes(size, seed=size + 1)))()
+            job_vector, _ = index.job_vector(jobs[0])
+            results[f"rank_candidates[{mode}]"] = run(lambda: resume_matrix.rank(job_vector, limit=20))
+
+    # Skill matching: per-resume extraction, and one resume against every job's skill list.
+    results["extract_skills_from_text"] = run(lambda: extract_skills_from_text(next_query()))
+
+    def skill_gap_sweep():
+        resume = next_query()
+        for job in jobs:
+            analyze_skills(resume, job["skills_required"])
+    results["analyze_skills[all jobs]"] = run(skill_gap_sweep, ops=size)
+    return results
+
+
+# 3️⃣ Reporting + baselines
+
+def print_results(size: int, results: dict):
+    print(f"\n=== {size:,} rows ===")
+    print(f"{'path':34} {'iters':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>12} {'peak MB':>9}")
+    for path, r in results.items():
+        print(f"{path:34} {r['iterations']:>6} {r['p50_ms']:>10} {r['p95_ms']:>10} {r['p99_ms']:>10} "
+              f"{r['throughput_per_s']:>12} {r['peak_mem_mb']:>9}")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    """Prints p50/p95/throughput deltas vs the baseline; returns the number of regressions."""
+    regressions = 0
+    print(f"\n=== Compared with baseline '{baseline['meta'].get('name')}' ({baseline['meta'].get('commit')}) ===")
+    for size, paths in current["results"].items():
+        base_paths = baseline["results"].get(size, {})
+        for path, r in paths.items():
+            b = base_paths.get(path)
+            if not b:
+                continue
+            p50 = (r["p50_ms"] / b["p50_ms"] - 1) if b["p50_ms"] else 0.0
+            p95 = (r["p95_ms"] / b["p95_ms"] - 1) if b["p95_ms"] else 0.0
+            tput = (r["throughput_per_s"] / b["throughput_per_s"] - 1) if b["throughput_per_s"] else 0.0
+            regressed = p50 > threshold or p95 > threshold
+            regressions += regressed
+            flag = "REGRESSION" if regressed else ("faster" if p50 < -threshold else "ok")
+            print(f"{size:>7} {path:34} p50 {p50:+7.1%}  p95 {p95:+7.1%}  ops/s {tput:+7.1%}  {flag}")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark recommendation and skill-matching paths.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated corpus sizes.")
+    parser.add_argument("--budget", type=float, default=3.0, help="Seconds spent timing each path.")
+    parser.add_argument("--min-iters", type=int, default=3)
+    parser.add_argument("--max-iters", type=int, default=500)
+    parser.add_argument("--skip-ranker", action="store_true", help="Skip the teacher-side candidate ranking path.")
+    parser.add_argument("--save", metavar="NAME", help="Store results as baselines/NAME.json.")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with baselines/NAME.json (exit 1 on regression).")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50/p95 slowdown before flagging (0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "name": args.save,
+            "commit": git_commit(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "machine": platform.machine(),
+        },
+        "results": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        results = bench_size(size, args)
+        report["results"][str(size)] = results
+        print_results(size, results)
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps(report, indent=2))
+        print(f"\nBaseline saved: {path}")
+
+    if args.compare:
+        path = BASELINE_DIR / f"{args.compare}.json"
+        if not path.exists():
+            print(f"\nBaseline not found: {path}")
+            return 2
+        if compare(report, json.loads(path.read_text()), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import random
+
+from app.utils.skill_library import ALL_SKILLS
+
+# 🎲 Synthetic Corpora
+# Deterministic (seeded) fake jobs and resumes for benchmarks: same seed + size = same corpus on every
+# machine and commit, so timings stay comparable. Text mixes real taxonomy skills with generic filler.
+
+ROLES = [
+    "Backend Developer", "Frontend Developer", "Full Stack Engineer", "Data Scientist", "ML Engineer",
+    "Data Analyst", "DevOps Engineer", "Cloud Engineer", "Mobile Developer", "QA Engineer",
+    "Software Engineer Intern", "AI Research Intern", "Security Analyst", "Platform Engineer",
+]
+
+FILLER = (
+    "team build design develop maintain scalable services product users data pipeline api platform "
+    "experience strong knowledge communication problem solving ownership collaborate agile sprint "
+    "deliver features quality testing review code documentation performance reliability production "
+    "customers startup fast paced growth learning mentor deploy monitor optimize improve systems "
+    "requirements stakeholders analytics dashboard reports models training research prototype "
+    "internship project college university degree graduate fresher remote hybrid office bonus"
+).split()
+
+TEMPLATES = [
+    "We are hiring a {role} to {verb} our {noun}.",
+    "The {role} will work with {skill} and {skill2} every day.",
+    "Hands-on experience with {skill} is a must, {skill2} is a plus.",
+    "You will {verb} {noun} using {skill}.",
+]
+
+RESUME_TEMPLATES = [
+    "Built a {noun} with {skill} and {skill2} during my {role} internship.",
+    "Skills: {skill}, {skill2}, {skill3}.",
+    "Worked on {noun} {verb} using {skill}.",
+    "Certified in {skill}; comfortable with {skill2}.",
+]
+
+VERBS = ["build", "scale", "design", "maintain", "optimize", "ship", "monitor", "refactor"]
+NOUNS = ["payment service", "recommendation engine", "analytics dashboard", "mobile app", "data pipeline",
+         "auth module", "search api", "ml model", "web portal", "chat bot"]
+
+
+def _sentence(rng, templates, skills):
+    return rng.choice(templates).format(
+        role=rng.choice(ROLES), verb=rng.choice(VERBS), noun=rng.choice(NOUNS),
+        skill=rng.choice(skills), skill2=rng.choice(skills), skill3=rng.choice(skills),
+    )
+
+
+def make_jobs(n: int, seed: int = 42):
+    """n job dicts shaped like the API's ({"id", "title", "description", "skills_required"})."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        skills = rng.sample(ALL_SKILLS, rng.randint(3, 8))
+        sentences = [_sentence(rng, TEMPLATES, skills) for _ in range(rng.randint(3, 6))]
+        filler = " ".join(rng.choices(FILLER, k=rng.randint(20, 50)))
+        jobs.append({
+            "id": i + 1,
+            "title": rng.choice(ROLES),
+            "description": " ".join(sentences) + " " + filler,
+            "skills_required": ", ".join(skills),
+        })
+    return jobs
+
+
+def make_resumes(n: int, seed: int = 7):
+    """n plain-text resumes (roughly what the PDF parser extracts)."""
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(n):
+        skills = rng.sample(ALL_SKILLS, rng.randint(5, 15))
+        sentences = [_sentence(rng, RESUME_TEMPLATES, skills) for _ in range(rng.randint(6, 12))]
+        filler = " ".join(rng.choices(FILLER, k=rng.randint(40, 100)))
+        resumes.append(" ".join(sentences) + " " + filler)
+    return resumes
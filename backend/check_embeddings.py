@@ -1,5 +1,6 @@
 from app.database import SessionLocal
 from app.models import FaceEmbedding, User
+from app.vision.embedding_codec import read_header
 import json
 
 def check_embeddings():
@@ -11,7 +12,17 @@ def check_embeddings():
     for e in embeddings:
         user = db.query(User).filter(User.id == e.user_id).first()
         name = user.full_name if user else "Unknown"
-        print(f"User ID: {e.user_id} ({name}), Embedding size: {len(json.loads(e.embedding_json))}")
+        header = read_header(e.embedding) if e.embedding is not None else None
+        if header:
+            size, fmt = header[0], f"binary/{header[1]}"
+        elif e.embedding_json:
+            try:
+                size, fmt = len(json.loads(e.embedding_json)), "json (run migrate_face_embeddings.py)"
+            except ValueError:
+                size, fmt = 0, "invalid json"
+        else:
+            size, fmt = 0, "invalid"
+        print(f"User ID: {e.user_id} ({name}), Embedding size: {size} [{fmt}]")
     
     db.close()
 
@@ -1,10 +1,12 @@
 from app.database import SessionLocal
 from app.models import FaceEmbedding
+from app.ml.result_cache import bump_corpus_version
 
 def clear_embeddings():
     db = SessionLocal()
     try:
         count = db.query(FaceEmbedding).delete()
+        bump_corpus_version(db, "faces") # Running servers drop the cached vectors on their next sync
         db.commit()
         print(f"Successfully deleted {count} face embeddings. DB is now fresh for re-registration.")
     except Exception as e:
@@ -0,0 +1,11 @@
+import sys
+sys.path.insert(0, '.')
+from app.database import engine
+from app.vision.embedding_codec import migrate_json_embeddings
+
+# Converts face_embeddings.embedding_json (JSON text) into the binary float32 'embedding' column.
+# Safe to re-run: already converted rows are skipped. The server also runs this on startup.
+
+print("Starting face embedding migration...")
+count = migrate_json_embeddings(engine)
+print(f"MIGRATION COMPLETE! ({count} rows converted)")
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+from app.vision.embedding_codec import (
+    HEADER, HEADER_SIZE, migrate_json_embeddings, pack_embedding, read_header, unpack_batch, unpack_embedding,
+)
+
+# 🧪 Face embedding codec + JSON -> binary migration test
+# Run: python test_embedding_codec.py (or pytest)
+# The binary header (magic, version, dim, model) is what every cached vector is decoded from, and
+# migrate_json_embeddings rewrites legacy rows at startup: both must round-trip exactly.
+
+VECTOR = [0.5, -1.25, 3.0, 1e-3]
+
+
+def test_pack_unpack_round_trip():
+    blob = pack_embedding(VECTOR, "Facenet")
+    assert len(blob) == HEADER_SIZE + 4 * len(VECTOR)
+    assert read_header(blob) == (len(VECTOR), "Facenet")
+    assert np.array_equal(unpack_embedding(blob), np.asarray(VECTOR, dtype=np.float32))
+    assert read_header(pack_embedding(VECTOR, "Facenet512")) == (len(VECTOR), "Facenet5") # 8-byte model tag
+
+
+def test_bad_header_rejected():
+    blob = pack_embedding(VECTOR, "Facenet")
+    body = blob[HEADER_SIZE:]
+    bad = [
+        None,
+        blob[:HEADER_SIZE - 1], # Truncated header
+        blob[:-4], # Length doesn't match dim
+        b"XX" + blob[2:], # Wrong magic
+        HEADER.pack(b"FE", 2, len(VECTOR), b"Facenet") + body, # Unknown format version
+        json.dumps(VECTOR).encode(), # Legacy JSON text in the binary column
+    ]
+    for blob_ in bad:
+        assert read_header(blob_) is None, blob_
+        assert unpack_embedding(blob_) is None
+
+
+def test_unpack_batch_keeps_matching_model_and_dim():
+    blobs = [
+        pack_embedding(VECTOR, "Facenet"),
+        pack_embedding(VECTOR, "ArcFace"), # Other model
+        None,
+        pack_embedding(VECTOR[:3], "Facenet"), # Other dim
+        b"garbage",
+        pack_embedding([v * 2 for v in VECTOR], "Facenet"),
+    ]
+    indices, matrix = unpack_batch(blobs, "Facenet")
+    assert indices == [0, 5]
+    assert np.array_equal(matrix, np.asarray([VECTOR, [v * 2 for v in VECTOR]], dtype=np.float32))
+
+
+def test_migrate_legacy_json_rows():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'faces.db')}")
+        with engine.begin() as conn: # Pre-migration table: JSON column only
+            conn.execute(text("CREATE TABLE face_embeddings (id INTEGER PRIMARY KEY, user_id INTEGER, embedding_json TEXT)"))
+            conn.execute(text("INSERT INTO face_embeddings (id, user_id, embedding_json) VALUES (1, 7, :j), (2, 8, '{bad')"),
+                         {"j": json.dumps(VECTOR)})
+
+        assert migrate_json_embeddings(engine) == 1
+        with engine.connect() as conn:
+            rows = {row.id: row for row in conn.execute(text("SELECT id, embedding, embedding_json FROM face_embeddings"))}
+        assert rows[1].embedding_json is None # JSON cleared once converted
+        assert read_header(bytes(rows[1].embedding)) == (len(VECTOR), "Facenet")
+        assert np.array_equal(unpack_embedding(bytes(rows[1].embedding)), np.asarray(VECTOR, dtype=np.float32))
+        assert rows[2].embedding is None and rows[2].embedding_json == "{bad" # Unreadable row left as is
+
+        assert migrate_json_embeddings(engine) == 0 # Idempotent
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    test_pack_unpack_round_trip()
+    test_bad_header_rejected()
+    test_unpack_batch_keeps_matching_model_and_dim()
+    test_migrate_legacy_json_rows()
+    print("Embedding codec tests passed.")
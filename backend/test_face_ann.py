@@ -0,0 +1,133 @@
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.config import settings
+from app.vision.face_service import FaceService
+
+# 🧪 FaceService IVF (ANN) index test
+# Run: python test_face_ann.py (or pytest)
+# Synthetic faces: every user is a random identity direction, every photo that direction plus noise.
+# Checks recall against brute force at the default FACE_ANN_NPROBE, that removed rows are never returned,
+# that rows enrolled after training are found, and that a search never trains the index itself.
+
+DIM = 128
+NOISE = 0.6 # Per-photo noise relative to the identity (cosine distance to the identity ~0.15)
+
+
+@contextmanager
+def _service(**overrides):
+    """Fresh per-process FaceService (the singleton is swapped out for the test) with settings overrides."""
+    overrides = {"FACE_SHARED_STORE_DIR": "", "FACE_ANN_MIN_ROWS": 1000, **overrides}
+    saved = {name: getattr(settings, name) for name in overrides}
+    saved_instance = FaceService._instance
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    FaceService._instance = None
+    try:
+        yield FaceService()
+    finally:
+        _wait_training()
+        FaceService._instance = saved_instance
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def _wait_training():
+    for thread in threading.enumerate():
+        if thread.name == "face-ann-train":
+            thread.join()
+
+
+def _identities(rng, users):
+    return rng.normal(size=(users, DIM)).astype(np.float32)
+
+
+def _photos(rng, identities):
+    return identities + NOISE * rng.normal(size=identities.shape).astype(np.float32)
+
+
+def _enroll(service, rng, identities, first_user, first_row, per_user=2):
+    users = np.arange(first_user, first_user + identities.shape[0])
+    vectors = np.concatenate([_photos(rng, identities) for _ in range(per_user)])
+    user_ids = np.tile(users, per_user)
+    row_ids = np.arange(first_row, first_row + user_ids.size)
+    service.add_embeddings(row_ids.tolist(), user_ids.tolist(), list(vectors))
+    return users
+
+
+def _trained(service):
+    _wait_training()
+    service.train_ann() # No-op when the background thread already trained it
+    assert service.ann.trained
+    return service
+
+
+def _brute_force(service, query):
+    saved = settings.FACE_ANN_MIN_ROWS
+    settings.FACE_ANN_MIN_ROWS = 0 # Same service, full scan
+    try:
+        return service.find_best_match(query)
+    finally:
+        settings.FACE_ANN_MIN_ROWS = saved
+
+
+def test_recall_matches_brute_force():
+    rng = np.random.default_rng(1)
+    with _service() as service:
+        identities = _identities(rng, 2000)
+        users = _enroll(service, rng, identities, first_user=1, first_row=1)
+        _trained(service)
+        picked = rng.choice(users.size, 300, replace=False)
+        queries = _photos(rng, identities[picked])
+        agree = sum(service.find_best_match(q) == _brute_force(service, q) for q in queries)
+        assert agree / len(queries) >= 0.95, f"recall {agree / len(queries):.3f} at nprobe={settings.FACE_ANN_NPROBE}"
+
+
+def test_removed_rows_never_returned():
+    rng = np.random.default_rng(2)
+    with _service() as service:
+        identities = _identities(rng, 1000)
+        users = _enroll(service, rng, identities, first_user=1, first_row=1)
+        _trained(service)
+        removed = set(users[:100].tolist())
+        for user_id in removed:
+            service.remove_user(user_id)
+        for q in _photos(rng, identities[:100]):
+            assert service.find_best_match(q) not in removed
+        # Swap-remove moved rows inside the index: the users that stayed are still found
+        kept = _photos(rng, identities[100:200])
+        assert sum(service.find_best_match(q) == uid for q, uid in zip(kept, users[100:200])) >= 95
+
+
+def test_rows_added_after_training_are_found():
+    rng = np.random.default_rng(3)
+    with _service() as service:
+        _enroll(service, rng, _identities(rng, 1000), first_user=1, first_row=1)
+        trained_size = _trained(service).ann.trained_size
+        late = _identities(rng, 100)
+        late_users = _enroll(service, rng, late, first_user=5001, first_row=50001)
+        _wait_training()
+        assert service.ann.trained_size == trained_size # Filed incrementally, no retrain
+        found = sum(service.find_best_match(q) == uid for q, uid in zip(_photos(rng, late), late_users))
+        assert found >= 95
+
+
+def test_search_never_trains():
+    rng = np.random.default_rng(4)
+    with _service(FACE_ANN_MIN_ROWS=100000) as service: # Enroll below the threshold: nothing scheduled
+        identities = _identities(rng, 1000)
+        users = _enroll(service, rng, identities, first_user=1, first_row=1)
+        settings.FACE_ANN_MIN_ROWS = 1000
+        assert service.find_best_match(_photos(rng, identities[:1])[0]) == users[0] # Brute force meanwhile
+        _wait_training()
+        assert not service.ann.trained
+
+
+if __name__ == "__main__":
+    test_recall_matches_brute_force()
+    test_removed_rows_never_returned()
+    test_rows_added_after_training_are_found()
+    test_search_never_trains()
+    print("Face ANN tests passed.")
@@ -0,0 +1,42 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from app.vision.face_service import FaceService
+
+# 🧪 Bulk vs single face embedding test
+# Run: python test_face_embedding.py (or pytest). Needs DeepFace + Facenet weights (skipped without DeepFace).
+# /bulk-register-faces stores get_embeddings_batch vectors, /face-login and FaceLock compare against
+# get_embedding vectors: both paths must give the same vector for the same photo.
+
+ONE_FACE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data", "one_face.jpg")
+
+
+def _frames():
+    frame = cv2.imread(ONE_FACE)
+    assert frame is not None, f"missing fixture {ONE_FACE}"
+    return [frame, cv2.flip(frame, 1)] # Two different crops -> the batched forward pass really runs
+
+
+def test_batch_matches_single():
+    DeepFace = pytest.importorskip("deepface.DeepFace")
+    service = FaceService()
+    try:
+        DeepFace.build_model(service.model_name)
+    except Exception as e: # No weights and no network to fetch them
+        pytest.skip(f"{service.model_name} unavailable: {e}")
+    frames = _frames()
+    single = [service.get_embedding(frame) for frame in frames]
+    for batch in ([frames[0]], frames):
+        embedded = service.get_embeddings_batch(batch)
+        for (vector, report), expected in zip(embedded, single):
+            assert report["path"] != "failed", report
+            assert vector is not None and expected is not None
+            assert np.allclose(vector, expected, rtol=1e-4, atol=1e-4), float(np.max(np.abs(np.subtract(vector, expected))))
+
+
+if __name__ == "__main__":
+    test_batch_matches_single()
+    print("Face embedding tests passed.")
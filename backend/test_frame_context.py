@@ -0,0 +1,38 @@
+import os
+
+import cv2
+import numpy as np
+
+from app.vision.frame_context import FrameContext
+
+# 🧪 FrameContext proctor detection regression test
+# Run: python test_frame_context.py (or pytest)
+# test_data/one_face.jpg: 640x480 webcam-style frame with exactly one face (NASA astronaut portrait,
+# public domain). The proctor rules (confidence > 0.4, NO FACE / MULTIPLE PEOPLE / LOOKING AWAY) were tuned
+# on DeepFace's opencv backend; proctor_faces must keep reporting one centred, confident face here.
+
+ONE_FACE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data", "one_face.jpg")
+
+
+def _valid(faces):
+    return [f for f in faces if f["confidence"] > 0.4] # Same filter as /vision/proctor
+
+
+def test_one_face_frame():
+    frame = cv2.imread(ONE_FACE)
+    assert frame is not None, f"missing fixture {ONE_FACE}"
+    faces = _valid(FrameContext(frame).proctor_faces)
+    assert len(faces) == 1, faces # No false MULTIPLE PEOPLE / NO FACE
+    face = faces[0]
+    assert face["confidence"] <= 1.0 # DeepFace's (100 - weight) / 100 scale, not a raw Haar weight
+    assert abs(face["x"] + face["w"] // 2 - frame.shape[1] // 2) <= frame.shape[1] * 0.15 # Not "looking away"
+
+
+def test_blank_frame():
+    assert _valid(FrameContext(np.zeros((480, 640, 3), dtype=np.uint8)).proctor_faces) == []
+
+
+if __name__ == "__main__":
+    test_one_face_frame()
+    test_blank_frame()
+    print("✅ FrameContext proctor detection tests passed!")
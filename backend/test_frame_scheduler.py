@@ -0,0 +1,48 @@
+import asyncio
+
+from fastapi import WebSocketDisconnect
+
+from app.vision.frame_protocol import pack_frame
+from app.vision.frame_scheduler import LatestFrameChannel
+
+# 🧪 LatestFrameChannel disconnect test
+# Run: python test_frame_scheduler.py (or pytest)
+# A client that disconnects while a frame is still queued must get that frame served,
+# then WebSocketDisconnect on the next call - never a next() that waits forever.
+
+
+class FakeWebSocket:
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def receive(self):
+        if self.messages:
+            return self.messages.pop(0)
+        return {"type": "websocket.disconnect", "code": 1000}
+
+
+def _frame_message(seq):
+    return {"type": "websocket.receive", "bytes": pack_frame(b"not-a-jpeg", seq, 0.0)}
+
+
+async def _drain_after_disconnect():
+    channel = LatestFrameChannel(FakeWebSocket([_frame_message(1)]), target_fps=0)
+    async with channel:
+        await asyncio.sleep(0.05) # Receiver queues the frame, then sees the disconnect
+        served = await asyncio.wait_for(channel.next(), timeout=1)
+        assert served.seq == 1
+        for _ in range(3): # Every later call fails fast
+            try:
+                await asyncio.wait_for(channel.next(), timeout=1)
+            except WebSocketDisconnect:
+                continue
+            raise AssertionError("next() returned a frame after the disconnect")
+
+
+def test_disconnect_with_pending_frame():
+    asyncio.run(_drain_after_disconnect())
+
+
+if __name__ == "__main__":
+    test_disconnect_with_pending_frame()
+    print("✅ LatestFrameChannel disconnect test passed!")
@@ -0,0 +1,89 @@
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.vision.face_service import FaceService
+from app.vision.shared_face_store import SharedFaceStore, shared_store_supported
+
+# 🧪 Shared Face Store test
+# Run: python test_shared_face_store.py (or pytest). POSIX only (flock).
+# Two FaceService instances mapped onto one store directory stand in for two uvicorn workers:
+# appends, removals and a compaction into a new generation by one must be visible to the other.
+
+DIM = 128
+
+
+@contextmanager
+def _workers(count=2):
+    """`count` independent FaceService "workers" sharing one store directory (singleton swapped out meanwhile)."""
+    if not shared_store_supported():
+        pytest.skip("flock not available on this platform")
+    saved = settings.FACE_SHARED_STORE_DIR, settings.FACE_ANN_MIN_ROWS
+    saved_instance = FaceService._instance
+    with tempfile.TemporaryDirectory() as directory:
+        settings.FACE_SHARED_STORE_DIR, settings.FACE_ANN_MIN_ROWS = directory, 0
+        try:
+            workers = []
+            for _ in range(count):
+                FaceService._instance = None
+                workers.append(FaceService())
+            yield workers
+        finally:
+            FaceService._instance = saved_instance
+            settings.FACE_SHARED_STORE_DIR, settings.FACE_ANN_MIN_ROWS = saved
+
+
+def _vectors(rng, n):
+    return list(rng.normal(size=(n, DIM)).astype(np.float32))
+
+
+def test_append_and_remove_visible_to_other_worker():
+    rng = np.random.default_rng(0)
+    with _workers() as (a, b):
+        vectors = _vectors(rng, 20)
+        a.add_embeddings(range(1, 21), [100 + i for i in range(20)], vectors)
+        assert b.find_best_match(vectors[4]) == 104 # b never touched the DB or appended anything
+        assert b.match_user_face(107, vectors[7])
+
+        more = _vectors(rng, 5) # b appends, a sees it
+        b.add_embeddings(range(21, 26), [200 + i for i in range(5)], more)
+        assert a.find_best_match(more[2]) == 202
+        assert len(a.pos_of) == len(b.pos_of) == 25
+
+        a.remove_user(103)
+        assert b.find_best_match(vectors[3]) != 103
+        assert not b.match_user_face(103, vectors[3])
+        assert 103 not in b.user_rows and 4 not in b.pos_of
+        assert b.find_best_match(vectors[5]) == 105 # Removal zeroes in place: other rows keep their positions
+
+
+def test_compaction_visible_to_other_worker():
+    rng = np.random.default_rng(1)
+    with _workers() as (a, b):
+        vectors = _vectors(rng, 10)
+        a.add_embeddings(range(1, 11), list(range(1, 11)), vectors)
+        assert b.find_best_match(vectors[0]) == 1
+        a.remove_user(2) # Tombstone, dropped by the compaction below
+        generation = a.store.generation
+
+        # Past capacity -> b rebuilds live rows into a bigger generation file and appends there
+        extra = _vectors(rng, SharedFaceStore.MIN_CAPACITY)
+        first_row = 11
+        b.add_embeddings(range(first_row, first_row + len(extra)), list(range(1000, 1000 + len(extra))), extra)
+        assert b.store.generation > generation
+
+        assert a.find_best_match(extra[-1]) == 1000 + len(extra) - 1 # a remaps onto the new generation
+        assert a.find_best_match(vectors[9]) == 10
+        assert a.find_best_match(vectors[1]) != 2
+        assert a.store.generation == b.store.generation
+        assert a.store.count == 9 + len(extra) # Tombstoned row not carried over
+        assert len(a.pos_of) == len(b.pos_of) == 9 + len(extra)
+
+
+if __name__ == "__main__":
+    test_append_and_remove_visible_to_other_worker()
+    test_compaction_visible_to_other_worker()
+    print("Shared face store tests passed.")
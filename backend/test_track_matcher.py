@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://") # Route module imports app.database; no Postgres needed here
+
+from app.routes.test_routes import AIML_KEYWORDS, WEB_KEYWORDS, DATA_KEYWORDS, TRACK_MATCHER
+
+# 🧪 Assessment track vote test
+# Run: python test_track_matcher.py (or pytest)
+# generate-test picks the track from TRACK_MATCHER hits; it must vote exactly like the old
+# `any(k in skills for k in KEYWORDS)` scan, so compound skill names still count.
+
+GROUPS = {"aiml": AIML_KEYWORDS, "web": WEB_KEYWORDS, "data": DATA_KEYWORDS}
+
+
+def _track(hits):
+    for track, keywords in GROUPS.items():
+        if hits.intersection(keywords):
+            return track
+    return "general"
+
+
+def _old_track(skills):
+    for track, keywords in GROUPS.items():
+        if any(k in skills for k in keywords):
+            return track
+    return "general"
+
+
+def test_compound_skill_names():
+    assert _track(TRACK_MATCHER.find("mysql, excel")) == "data"
+    assert _track(TRACK_MATCHER.find("postgresql")) == "data"
+    assert _track(TRACK_MATCHER.find("reactjs, git")) == "web"
+    assert _track(TRACK_MATCHER.find("nodejs")) == "web"
+
+
+def test_same_vote_as_substring_scan():
+    samples = [
+        "", "git, docker", "python, ml", "html, css", "mysql", "postgresql, excel", "reactjs", "nodejs, express",
+        "database design", "tensorflow, deep learning", "power bi", "email marketing", "kotlin", "c++, java",
+    ]
+    for skills in samples:
+        assert _track(TRACK_MATCHER.find(skills)) == _old_track(skills), skills
+
+
+if __name__ == "__main__":
+    test_compound_skill_names()
+    test_same_vote_as_substring_scan()
+    print("Track matcher tests passed.")